@@ -0,0 +1,74 @@
+"""
+异步日志基准测试
+将控制台输出替换为带写入延迟的慢速流，比较同步日志与各溢出策略下异步日志时的注册表处理耗时
+
+用法:
+    python scripts/bench_async_logging.py [--values 20000] [--write-latency 0.0001]
+"""
+import argparse
+import time
+
+from bench_utils import CODM_ROOT_KEY, CODM_SUB_KEY, populate_backend, timed
+
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend
+from src.core.registry.memory_backend import MemoryRegistryBackend
+from src.core.utils.logger import LoggerManager, OverflowPolicy
+from src.modules.reg_unlock_fps import RegUnlockFPSService
+from src.modules.zero_sensitivity import ZeroSensitivityService
+from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.modules.registry_sweep import RegistrySweepService, RegistryOperation
+
+LOGGER_NAMES = ("RegUnlockFPS", "ZeroSensitivity", "RegUnlockFOV", "RegistrySweep")
+
+
+class SlowStream:
+    """模拟慢速控制台: 每次写入固定延迟"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.writes = 0
+        self.chars = 0
+
+    def write(self, text):
+        time.sleep(self.latency)
+        self.writes += 1
+        self.chars += len(text)
+
+    def flush(self):
+        pass
+
+
+def run(label, values, latency, overflow=None):
+    stream = SlowStream(latency)
+    for name in LOGGER_NAMES:
+        LoggerManager.get_logger(name, show_time=False).handlers[0].setStream(stream)
+    if overflow is not None:
+        LoggerManager.enable_async(maxsize=1000, overflow=overflow)
+
+    backend = populate_backend(MemoryRegistryBackend(), values)
+    DependencyProvider.register_instance(RegistryBackend, backend)
+    sweep_service = RegistrySweepService(backend)
+    report, elapsed = timed(sweep_service.sweep, CODM_ROOT_KEY, CODM_SUB_KEY, set(RegistryOperation))
+    _, drain = timed(LoggerManager.shutdown)
+    print(f"{label:<18} 处理耗时 {elapsed * 1000:8.1f} ms, 写出剩余日志 {drain * 1000:8.1f} ms, "
+          f"写入次数 {stream.writes:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="异步日志基准测试")
+    parser.add_argument("--values", type=int, default=20_000, help="合成键值数量")
+    parser.add_argument("--write-latency", type=float, default=0.0001, help="每次控制台写入的模拟延迟 (秒)")
+    args = parser.parse_args()
+
+    DependencyProvider.register(RegUnlockFPSService, RegUnlockFPSService)
+    DependencyProvider.register(ZeroSensitivityService, ZeroSensitivityService)
+    DependencyProvider.register(RegUnlockFOVService, RegUnlockFOVService)
+
+    run("同步", args.values, args.write_latency)
+    for policy in OverflowPolicy:
+        run(f"异步 {policy.value}", args.values, args.write_latency, policy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+二进制值写入基准测试
+以 ctypes.memmove (与 RegSetValueEx 的数据参数同为 c_void_p) 模拟注册表API的数据拷贝，
+比较原实现 (逐字节构造 ctypes 数组) 与直接传递缓冲区的写入耗时；
+并比较策略生成新值的两种方式: bytes 切片拼接 与 bytearray 原地修改 (写入时 from_buffer 共享内存)
+
+用法:
+    python scripts/bench_buffers.py [--values 50000] [--size 12]
+"""
+import argparse
+import ctypes
+
+from bench_utils import timed
+
+from src.core.utils.registry_utils import _data_pointer
+
+
+def make_values(count, size):
+    """模拟快照中的数据: 偶数项首字节为0 (需要修改)"""
+    return [bytes([i % 2]) + bytes((i + j) % 256 for j in range(size - 1)) for i in range(count)]
+
+
+def modify_concat(values):
+    return [bytes([0x01]) + raw[1:] for raw in values if raw[0] != 0x01]
+
+
+def modify_in_place(values):
+    modified = []
+    for raw in values:
+        if raw[0] != 0x01:
+            data = bytearray(raw)
+            data[0] = 0x01
+            modified.append(data)
+    return modified
+
+
+def write_original(modified, sink):
+    """对照组: 原实现 (c_ubyte * n)(*data)，为每个字节创建整数参数"""
+    for data in modified:
+        data_size = len(data)
+        data_buffer = (ctypes.c_ubyte * data_size)(*data)
+        ctypes.memmove(sink, data_buffer, data_size)
+
+
+def write_direct(modified, sink):
+    for data in modified:
+        ctypes.memmove(sink, _data_pointer(data), len(data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="二进制值写入基准测试")
+    parser.add_argument("--values", type=int, default=50_000, help="值数量")
+    parser.add_argument("--size", type=int, default=12, help="每个值的字节数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数 (取最小值)")
+    args = parser.parse_args()
+
+    values = make_values(args.values, args.size)
+    sink = (ctypes.c_ubyte * args.size)()
+
+    def best(func, *func_args):
+        runs = [timed(func, *func_args) for _ in range(args.repeat)]
+        return runs[0][0], min(elapsed for _, elapsed in runs)
+
+    concat, modify_bytes = best(modify_concat, values)
+    patched, modify_patch = best(modify_in_place, values)
+    assert concat == patched
+
+    _, write_old = best(write_original, concat, sink)
+    _, write_new = best(write_direct, concat, sink)
+    _, write_shared = best(write_direct, patched, sink)
+
+    print(f"写入 {len(concat)} 项 ({args.size} 字节): 逐字节构造数组 {write_old * 1000:8.1f} ms, "
+          f"直接传递 bytes {write_new * 1000:8.1f} ms, 加速比 {write_old / write_new:.2f}x")
+    print(f"修改+写入: bytes 拼接 {(modify_bytes + write_new) * 1000:8.1f} ms, "
+          f"bytearray 原地修改 {(modify_patch + write_shared) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+键值名称分类基准测试
+对比逐个模式顺序匹配与合并分类器 (冷/热缓存) 的耗时，并校验两者结果一致
+
+用法:
+    python scripts/bench_classifier.py [--names 100000]
+"""
+import argparse
+
+from bench_utils import synthetic_values, timed
+
+from src.modules.registry_sweep.classifier import classify, parse, clear_cache
+from src.modules.registry_sweep.operations import RegistryOperation, OPERATION_PATTERNS
+
+
+def classify_sequential(names):
+    """原有方式: 依次尝试每个模式"""
+    results = []
+    for name in names:
+        for operation, pattern in OPERATION_PATTERNS.items():
+            if pattern.match(name):
+                results.append(operation)
+                break
+        else:
+            results.append(None)
+    return results
+
+
+def classify_combined(names):
+    """合并分类器"""
+    return [classify(name) for name in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="键值名称分类基准测试")
+    parser.add_argument("--names", type=int, default=100_000, help="合成键值名称数量")
+    args = parser.parse_args()
+
+    names = [name for name, _, _ in synthetic_values(args.names)]
+
+    sequential, sequential_elapsed = timed(classify_sequential, names)
+    clear_cache()
+    combined, cold_elapsed = timed(classify_combined, names)
+    _, warm_elapsed = timed(classify_combined, names)
+    _, parse_elapsed = timed(lambda: [parse(name) for name in names])
+
+    if sequential != combined:
+        mismatches = sum(1 for a, b in zip(sequential, combined) if a != b)
+        raise SystemExit(f"分类结果不一致: {mismatches} 项")
+
+    matched = {operation: combined.count(operation) for operation in RegistryOperation}
+    print(f"名称数量: {len(names)}  " + "  ".join(f"{op.name}={count}" for op, count in matched.items()))
+    print(f"顺序匹配:       {sequential_elapsed * 1000:8.1f} ms")
+    print(f"合并分类(冷):   {cold_elapsed * 1000:8.1f} ms  ({sequential_elapsed / cold_elapsed:.2f}x)")
+    print(f"合并分类(热):   {warm_elapsed * 1000:8.1f} ms  ({sequential_elapsed / warm_elapsed:.2f}x)")
+    print(f"字段解析(冷):   {parse_elapsed * 1000:8.1f} ms")
+    print(f"示例: {parse(next(name for name in names if classify(name) is RegistryOperation.SENSITIVITY))}")
+
+
+if __name__ == "__main__":
+    main()
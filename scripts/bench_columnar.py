@@ -0,0 +1,77 @@
+"""
+列式快照基准测试
+在合成的 Call-of-Duty 数据上比较灵敏度与FOV修改计划的两种计算方式:
+策略逐项判断并修改 与 列式快照向量化修改，并校验两者的计划完全一致 (需要 numpy)
+
+用法:
+    python scripts/bench_columnar.py [--values 100000]
+"""
+import argparse
+import logging
+
+from bench_utils import CODM_ROOT_KEY, CODM_SUB_KEY, populate_backend, timed
+
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend
+from src.core.registry.memory_backend import MemoryRegistryBackend
+from src.core.utils.logger import LoggerManager
+from src.modules.zero_sensitivity import ZeroSensitivityService
+from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.modules.registry_sweep import RegistrySweepService, RegistryOperation
+from src.modules.registry_sweep.classifier import classify
+from src.modules.registry_sweep.columnar import columnar_available
+
+
+def plan_with(service, classified, operations):
+    handlers = service._build_handlers(CODM_ROOT_KEY, CODM_SUB_KEY, operations, 0xFF)
+    report = service._new_report("bench", handlers, True, 1)
+    return service.plan(classified, handlers, report), report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列式快照基准测试")
+    parser.add_argument("--values", type=int, default=100_000, help="合成键值数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数 (取最小值)")
+    args = parser.parse_args()
+
+    if not columnar_available():
+        print("未安装 numpy, 无法使用列式快照")
+        return
+
+    for name in ("ZeroSensitivity", "RegUnlockFOV", "RegistrySweep"):
+        LoggerManager.get_logger(name).setLevel(logging.CRITICAL)
+
+    backend = populate_backend(MemoryRegistryBackend(), args.values)
+    DependencyProvider.register_instance(RegistryBackend, backend)
+    DependencyProvider.register(ZeroSensitivityService, ZeroSensitivityService)
+    DependencyProvider.register(RegUnlockFOVService, RegUnlockFOVService)
+
+    operations = {RegistryOperation.SENSITIVITY, RegistryOperation.FOV_UNLOCK}
+    classified = [
+        (operation, value)
+        for value in backend.snapshot_values(CODM_ROOT_KEY, CODM_SUB_KEY)
+        for operation in (classify(value.name),)
+        if operation in operations
+    ]
+
+    results = {}
+    for label, columnar in (("逐项计算", False), ("列式快照", True)):
+        service = RegistrySweepService(backend, columnar=columnar)
+        runs = [timed(plan_with, service, classified, operations) for _ in range(args.repeat)]
+        (plan, report), elapsed = runs[0][0], min(elapsed for _, elapsed in runs)
+        results[label] = plan
+        planned = sum(stats['planned'] for stats in report['operations'].values())
+        # 判断与修改本身的耗时 (不含遍历分类结果、组装计划列表)
+        decide = sum(stats['elapsed'] for stats in report['operations'].values())
+        print(f"{label}: {len(classified)} 项, 需要修改 {planned} 项, "
+              f"计算修改 {decide * 1000:8.1f} ms, 生成计划合计 {elapsed * 1000:8.1f} ms")
+
+    # 两种方式的计划 (值名称与结果字典) 完全一致
+    expected = [(name, result) for _, _, _, name, result, _ in results["逐项计算"]]
+    actual = [(name, result) for _, _, _, name, result, _ in results["列式快照"]]
+    assert actual == expected
+    print("校验通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+依赖注入基准测试
+比较 DependencyProvider.get 在单例 (按类型 / 延迟注册的字符串键)、瞬态和作用域依赖下的单次耗时，
+以字典直接查找为基线；并验证多线程并发首次解析时单例只构造一次
+
+用法:
+    python scripts/bench_di.py [--calls 1000000] [--threads 32]
+"""
+import argparse
+import threading
+import time
+
+from bench_utils import timed
+
+from src.bootstrap import initialize_app
+from src.core.di.container import DependencyContainer
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend
+from src.core.registry.memory_backend import MemoryRegistryBackend
+from src.modules.zero_sensitivity.service import ZeroSensitivityService
+from src.modules.zero_sensitivity.strategy import BaseZeroSensitivityStrategy
+
+
+class Transient:
+    pass
+
+
+class Scoped:
+    pass
+
+
+class SlowSingleton:
+    """构造耗时较长的单例，放大并发首次解析的竞争窗口"""
+    created = 0
+
+    def __init__(self):
+        time.sleep(0.01)
+        SlowSingleton.created += 1
+
+
+def resolve_loop(interface, count):
+    get = DependencyProvider.get
+    for _ in range(count):
+        get(interface)
+
+
+def dict_loop(mapping, interface, count):
+    for _ in range(count):
+        mapping[interface]
+
+
+def scoped_loop(interface, count):
+    with DependencyProvider.scope():
+        resolve_loop(interface, count)
+
+
+def concurrent_first_resolve(threads):
+    """多个线程同时首次解析同一单例，返回构造次数"""
+    DependencyProvider.register(SlowSingleton, SlowSingleton)
+    SlowSingleton.created = 0
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(DependencyProvider.get(SlowSingleton))
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    assert len({id(instance) for instance in results}) == 1
+    return SlowSingleton.created
+
+
+def main():
+    parser = argparse.ArgumentParser(description="依赖注入基准测试")
+    parser.add_argument("--calls", type=int, default=1_000_000, help="每种依赖的解析次数")
+    parser.add_argument("--threads", type=int, default=32, help="并发首次解析的线程数")
+    args = parser.parse_args()
+
+    initialize_app(reg_file=None, use_index=False)
+    backend = MemoryRegistryBackend()
+    DependencyProvider.register_instance(RegistryBackend, backend)
+    DependencyProvider.register(Transient, Transient, singleton=False)
+    DependencyProvider.register_scoped(Scoped, Scoped)
+
+    # 构造函数注入: 服务获得策略，策略获得注册表后端
+    service = DependencyProvider.get(ZeroSensitivityService)
+    assert isinstance(service.strategy, BaseZeroSensitivityStrategy)
+    assert service.strategy.backend is backend
+
+    with DependencyProvider.scope():
+        first = DependencyProvider.get(Scoped)
+        assert DependencyProvider.get(Scoped) is first
+    with DependencyProvider.scope():
+        assert DependencyProvider.get(Scoped) is not first
+
+    mapping = {RegistryBackend: backend}
+    _, baseline = timed(dict_loop, mapping, RegistryBackend, args.calls)
+    cases = [
+        ("单例 (类型)", resolve_loop, RegistryBackend),
+        ("单例 (延迟注册)", resolve_loop, ZeroSensitivityService),
+        ("瞬态", resolve_loop, Transient),
+        ("作用域", scoped_loop, Scoped),
+    ]
+    print(f"{'字典查找':<14} {baseline / args.calls * 1e9:8.1f} ns/次")
+    for label, loop, interface in cases:
+        _, elapsed = timed(loop, interface, args.calls)
+        print(f"{label:<14} {elapsed / args.calls * 1e9:8.1f} ns/次 ({elapsed / baseline:.1f}x 字典查找)")
+
+    created = concurrent_first_resolve(args.threads)
+    print(f"并发首次解析: {args.threads} 个线程, 构造 {created} 次")
+    DependencyContainer.reset()
+
+
+if __name__ == "__main__":
+    main()
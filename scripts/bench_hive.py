@@ -0,0 +1,235 @@
+"""
+离线配置单元基准测试
+生成包含合成 Call-of-Duty 路径和大量填充数据的 regf 配置单元 (模拟 NTUSER.DAT)，
+通过配置单元后端执行一次完整处理，校验修改结果与校验和，并统计处理期间的内存峰值
+(峰值只与 Call-of-Duty 路径下的值数量有关，与文件大小无关)
+
+用法:
+    python scripts/bench_hive.py [--values 20000] [--size-mb 256] [--path NTUSER.DAT]
+"""
+import argparse
+import logging
+import os
+import struct
+import tempfile
+import tracemalloc
+
+from bench_utils import CODM_ROOT_KEY, CODM_SUB_KEY, synthetic_values, timed
+
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend, REG_BINARY, REG_DWORD
+from src.core.registry.hive import BASE_BLOCK_SIZE, BIG_DATA_SEGMENT, base_block_checksum, filetime_now, name_hash
+from src.core.registry.hive_backend import HiveRegistryBackend
+from src.core.utils.logger import LoggerManager
+from src.modules.reg_unlock_fps import RegUnlockFPSService
+from src.modules.zero_sensitivity import ZeroSensitivityService
+from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.modules.registry_sweep import RegistrySweepService, RegistryOperation
+
+HBIN_SIZE = 4096
+HBIN_HEADER = 32
+# 填充键中每个值的数据长度
+FILLER_DATA = 4000
+FILLER_VALUES_PER_KEY = 64
+# 超过一个大数据分段的测试值
+BLOB_NAME = "CODM_1000_iMSDK_CN_ReplayCache_h1"
+BLOB_SIZE = BIG_DATA_SEGMENT * 2 + 1000
+
+
+class SyntheticHiveWriter:
+    """按 hbin 顺序流式写出配置单元 (子单元先于父单元分配，父键偏移在最后回填)"""
+
+    def __init__(self, path):
+        self.file = open(path, "w+b")
+        self.file.write(bytes(BASE_BLOCK_SIZE))
+        # 当前 hbin 的相对偏移与内容
+        self.hbin_offset = 0
+        self.hbin = bytearray()
+        self.hbin_size = 0
+
+    def _flush_hbin(self):
+        if self.hbin:
+            # 剩余空间作为空闲单元
+            free = self.hbin_size - len(self.hbin)
+            if free:
+                self.hbin += struct.pack("<i", free) + bytes(free - 4)
+            self.file.write(self.hbin)
+            self.hbin_offset += self.hbin_size
+            self.hbin = bytearray()
+
+    def _new_hbin(self, size):
+        self._flush_hbin()
+        self.hbin_size = size
+        self.hbin = bytearray(struct.pack("<4sIIQQI", b"hbin", self.hbin_offset, size, 0, filetime_now(), 0)
+                              .ljust(HBIN_HEADER, b"\0"))
+
+    def alloc(self, data):
+        """分配单元并写入数据，返回单元的相对偏移"""
+        size = (len(data) + 4 + 7) & ~7
+        if not self.hbin or len(self.hbin) + size > self.hbin_size:
+            self._new_hbin(max(HBIN_SIZE, (size + HBIN_HEADER + HBIN_SIZE - 1) // HBIN_SIZE * HBIN_SIZE))
+        offset = self.hbin_offset + len(self.hbin)
+        self.hbin += struct.pack("<i", -size) + data + bytes(size - 4 - len(data))
+        return offset
+
+    def patch(self, offset, fmt, *values):
+        """回填已分配单元中的字段 (offset 为相对单元数据的偏移)"""
+        packed = struct.pack(fmt, *values)
+        if offset >= self.hbin_offset:
+            start = offset - self.hbin_offset
+            self.hbin[start:start + len(packed)] = packed
+        else:
+            self.file.seek(BASE_BLOCK_SIZE + offset)
+            self.file.write(packed)
+            self.file.seek(0, os.SEEK_END)
+
+    def value(self, name, value_type, data):
+        """分配值 (vk 单元及数据单元)"""
+        if len(data) <= 4:
+            size, data_offset = len(data) | 0x80000000, int.from_bytes(data.ljust(4, b"\0"), "little")
+        elif len(data) > BIG_DATA_SEGMENT:
+            segments = [self.alloc(data[start:start + BIG_DATA_SEGMENT])
+                        for start in range(0, len(data), BIG_DATA_SEGMENT)]
+            segment_list = self.alloc(struct.pack(f"<{len(segments)}I", *segments))
+            size, data_offset = len(data), self.alloc(struct.pack("<2sHI", b"db", len(segments), segment_list))
+        else:
+            size, data_offset = len(data), self.alloc(data)
+        raw_name = name.encode("latin-1")
+        return self.alloc(struct.pack("<2sHIIIHH", b"vk", len(raw_name), size, data_offset, value_type, 1, 0) + raw_name)
+
+    def reserve_key(self, name):
+        """预留 nk 单元 (根键须为第一个 hbin 的第一个单元)"""
+        return self.alloc(bytes(76 + len(name)))
+
+    def key(self, name, values=(), subkeys=(), flags=0x20, reserved=None):
+        """
+        分配键 (nk 单元、值列表与 lh 子键列表)
+
+        参数:
+            values: 已分配的 vk 单元偏移
+            subkeys: 已分配的子键 (偏移, 名称)
+            reserved: 预留的 nk 单元偏移
+        """
+        value_list = self.alloc(struct.pack(f"<{len(values)}I", *values)) if values else 0xFFFFFFFF
+        subkey_list = 0xFFFFFFFF
+        if subkeys:
+            entries = [item for offset, sub_name in subkeys for item in (offset, name_hash(sub_name))]
+            subkey_list = self.alloc(struct.pack(f"<2sH{len(entries)}I", b"lh", len(subkeys), *entries))
+        raw_name = name.encode("latin-1")
+        nk = struct.pack(
+            "<2sHQ15IHH", b"nk", flags, filetime_now(), 0, 0, len(subkeys), 0, subkey_list, 0xFFFFFFFF,
+            len(values), value_list, 0xFFFFFFFF, 0xFFFFFFFF, 0, 0, 0, 0, 0, len(raw_name), 0
+        ) + raw_name
+        if reserved is None:
+            offset = self.alloc(nk)
+        else:
+            offset = reserved
+            self.patch(offset + 4, f"<{len(nk)}s", nk)
+        for sub_offset, _ in subkeys:
+            # 子键的父键偏移
+            self.patch(sub_offset + 4 + 16, "<I", offset)
+        return offset
+
+    def close(self, root_offset):
+        """写出最后一个 hbin 与基本块"""
+        self._flush_hbin()
+        block = bytearray(struct.pack("<4sIIQIIIIIII", b"regf", 1, 1, filetime_now(), 1, 5, 0, 1,
+                                      root_offset, self.hbin_offset, 1).ljust(BASE_BLOCK_SIZE, b"\0"))
+        block[48:48 + 22] = "NTUSER.DAT".encode("utf-16-le") + b"\0\0"
+        struct.pack_into("<I", block, 508, base_block_checksum(block))
+        self.file.seek(0)
+        self.file.write(block)
+        self.file.close()
+
+
+def encode(value_type, value):
+    return value if value_type == REG_BINARY else value.to_bytes(4, "little")
+
+
+def build_hive(path, values, size_mb):
+    """生成配置单元: ROOT\\Filler\\K* (填充数据) 与 ROOT\\SOFTWARE\\Tencent\\Call-of-Duty"""
+    writer = SyntheticHiveWriter(path)
+    root = writer.reserve_key("ROOT")
+    filler_keys = []
+    filler_data = bytes(range(256)) * (FILLER_DATA // 256) + bytes(FILLER_DATA % 256)
+    key_bytes = FILLER_VALUES_PER_KEY * (FILLER_DATA + 64)
+    for index in range(size_mb * 1024 * 1024 // key_bytes):
+        vks = [writer.value(f"Value{i}", REG_BINARY, filler_data) for i in range(FILLER_VALUES_PER_KEY)]
+        filler_keys.append((writer.key(f"K{index}", vks), f"K{index}"))
+    filler = writer.key("Filler", subkeys=filler_keys)
+
+    vks = [writer.value(name, value_type, encode(value_type, value)) for name, value_type, value in values]
+    vks.append(writer.value(BLOB_NAME, REG_BINARY, bytes(BLOB_SIZE)))
+    codm = writer.key("Call-of-Duty", vks)
+    tencent = writer.key("Tencent", subkeys=[(codm, "Call-of-Duty")])
+    software = writer.key("SOFTWARE", subkeys=[(tencent, "Tencent")])
+    writer.key("ROOT", subkeys=[(filler, "Filler"), (software, "SOFTWARE")], flags=0x2C, reserved=root)
+    writer.close(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线配置单元基准测试")
+    parser.add_argument("--values", type=int, default=20_000, help="合成键值数量")
+    parser.add_argument("--size-mb", type=int, default=256, help="填充数据大小 (MB)")
+    parser.add_argument("--path", help="配置单元输出路径 (默认为临时文件)")
+    args = parser.parse_args()
+
+    for name in ("RegUnlockFPS", "ZeroSensitivity", "RegUnlockFOV", "PatchRules", "RegistrySweep"):
+        LoggerManager.get_logger(name).setLevel(logging.CRITICAL)
+
+    path = args.path or os.path.join(tempfile.gettempdir(), "bench_NTUSER.DAT")
+    values = synthetic_values(args.values)
+    _, elapsed = timed(build_hive, path, values, args.size_mb)
+    print(f"生成配置单元: {os.path.getsize(path) / 1024 / 1024:.1f} MB, 耗时 {elapsed:.1f} s")
+
+    backend = HiveRegistryBackend(path)
+    DependencyProvider.register_instance(RegistryBackend, backend)
+    DependencyProvider.register(RegUnlockFPSService, RegUnlockFPSService)
+    DependencyProvider.register(ZeroSensitivityService, ZeroSensitivityService)
+    DependencyProvider.register(RegUnlockFOVService, RegUnlockFOVService)
+
+    snapshot, elapsed = timed(backend.snapshot_values, CODM_ROOT_KEY, CODM_SUB_KEY)
+    assert [(v.name, v.value_type, v.data) for v in snapshot[:-1]] == values
+    assert snapshot[-1].data == bytes(BLOB_SIZE)
+    print(f"读取: {len(snapshot)} 项, 耗时 {elapsed * 1000:.1f} ms")
+
+    sweep_service = RegistrySweepService(backend)
+    for label in ("首次处理", "重复处理"):
+        report, elapsed = timed(sweep_service.sweep, CODM_ROOT_KEY, CODM_SUB_KEY, set(RegistryOperation))
+        failed = sum(stats['failed'] for stats in report['operations'].values())
+        print(f"{label}: {report['total']} 项, 写入 {report['writes']} 项, 失败 {failed} 项, "
+              f"耗时 {elapsed * 1000:.1f} ms")
+    backend.close()
+
+    # 重新打开并完整处理一次，统计内存峰值 (tracemalloc 会拖慢处理，不参与计时)
+    tracemalloc.start()
+    backend = HiveRegistryBackend(path)
+    RegistrySweepService(backend).sweep(CODM_ROOT_KEY, CODM_SUB_KEY, set(RegistryOperation))
+    backend.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"处理期间内存峰值: {peak / 1024 / 1024:.1f} MB")
+
+    # 重新打开 (校验基本块校验和) 并检查修改结果
+    reopened = HiveRegistryBackend(path, writable=False)
+    patched = {v.name: v for v in reopened.snapshot_values(CODM_ROOT_KEY, CODM_SUB_KEY)}
+    for name, value_type, _ in values:
+        data = patched[name].data
+        if "Fov" in name:
+            assert data[6] == 0xFF
+        elif "EnableFramerateCustomize" in name:
+            assert data == 1
+        elif "FramerateCustomizeValue" in name:
+            assert data == 0
+        elif value_type == REG_BINARY:
+            assert data[0] == 0x01
+        else:
+            assert value_type == REG_DWORD
+    print(f"校验通过 (序列号 {reopened.hive.sequence[0]})")
+    reopened.hive.close()
+    if not args.path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+日志基准测试
+以单个键值处理结果的日志为负载，分别在级别被过滤和正常输出时记录 10 万条，
+比较调用处立即格式化 (f-string + 十六进制拼接) 与延迟格式化 (HexDump 参数) 的耗时；
+并比较颜色标签的逐次正则替换与已编译模板渲染
+
+用法:
+    python scripts/bench_logging.py [--records 100000]
+"""
+import argparse
+import io
+import logging
+
+import bench_utils  # noqa: F401  (将项目根目录添加到系统路径)
+from bench_utils import timed
+
+from src.core.utils.logger import (
+    COLORS, COLOR_TAG_PATTERN, EnhancedFormatter, HexDump, LoggerManager, Style, apply_color_tags
+)
+
+KEY = r"2147483649\SOFTWARE\Tencent\Call-of-Duty\CODM_1001_iMSDK_CN_BrFiring_ACOG_h123456789"
+ORIGINAL = bytes(range(12))
+MODIFIED = bytes([0]) + bytes(range(1, 12))
+
+
+TEMPLATES = [
+    "{color:yellow}RegUnlockFPS{/color}依赖初始化完成",
+    "{color:yellow}CODM Tactix Hub{/color} - 注册表优化工具",
+    "{color:yellow}Bilibili{/color}: https://space.bilibili.com/3493117248407780",
+    ">>>{color:yellow}请输入功能选项: {/color}",
+    "{color:yellow}灵敏度设置{/color}: 匹配 7988 项, 修改 3902 项, 失败 0 项, 耗时 21.8 ms",
+]
+
+
+def regex_color_tags(message):
+    """对照组: 每次调用都执行带回调的正则替换"""
+    def replace(match):
+        return COLORS.get(match.group(1).lower(), COLORS["DEFAULT"]) + match.group(2) + COLORS["DEFAULT"]
+    return COLOR_TAG_PATTERN.sub(replace, message)
+
+
+def render_templates(func, count, *args):
+    for _ in range(count // len(TEMPLATES)):
+        for template in TEMPLATES:
+            func(template, *args)
+
+
+class EagerFormatter(logging.Formatter):
+    """对照组: 每条记录重新构建级别、模块前缀并执行颜色标签替换"""
+
+    def format(self, record):
+        level_part = COLORS.get(record.levelname, COLORS["DEFAULT"]) + f"[{record.levelname}]"
+        module_part = COLORS["MODULE_NAME"] + " " + COLORS["MODULE_UNDERLINE"] + record.name + Style.RESET_UNDERLINE
+        separator = COLORS["DEFAULT"] + " |"
+        message = regex_color_tags(record.getMessage())
+        return f"{level_part}{module_part}{separator} {message}{Style.RESET}"
+
+
+def log_eager(logger, count):
+    for _ in range(count):
+        orig_hex = ' '.join(f'{b:02X}' for b in ORIGINAL)
+        mod_hex = ' '.join(f'{b:02X}' for b in MODIFIED)
+        logger.success(
+            f"成功修改灵敏度设置: {KEY}\n"
+            f"原始值: {orig_hex}\n"
+            f"新值: {mod_hex}"
+        )
+
+
+def log_lazy(logger, count):
+    for _ in range(count):
+        logger.success(
+            "成功修改灵敏度设置: %s\n"
+            "原始值: %s\n"
+            "新值: %s",
+            KEY, HexDump(ORIGINAL), HexDump(MODIFIED)
+        )
+
+
+def make_logger(name, formatter):
+    logger = LoggerManager.get_logger(name, show_time=False)
+    stream = io.StringIO()
+    logger.handlers[0].setStream(stream)
+    logger.handlers[0].setFormatter(formatter)
+    return logger, stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志基准测试")
+    parser.add_argument("--records", type=int, default=100_000, help="记录条数")
+    args = parser.parse_args()
+
+    eager_logger, eager_stream = make_logger("BenchEager", EagerFormatter())
+    lazy_logger, lazy_stream = make_logger("BenchLazy", EnhancedFormatter(show_time=False))
+
+    for label, level in (("级别被过滤", logging.ERROR), ("正常输出", logging.DEBUG)):
+        for logger in (eager_logger, lazy_logger):
+            logger.setLevel(level)
+        _, eager = timed(log_eager, eager_logger, args.records)
+        _, lazy = timed(log_lazy, lazy_logger, args.records)
+        print(f"{label}: 立即格式化 {eager * 1000:.1f} ms, 延迟格式化 {lazy * 1000:.1f} ms, "
+              f"加速比 {eager / lazy:.2f}x")
+
+    # 两种方式输出内容一致 (模块名除外)
+    assert eager_stream.getvalue().replace("BenchEager", "") == lazy_stream.getvalue().replace("BenchLazy", "")
+
+    for template in TEMPLATES:
+        assert apply_color_tags(template) == regex_color_tags(template)
+    _, regex = timed(render_templates, regex_color_tags, args.records)
+    _, compiled = timed(render_templates, apply_color_tags, args.records)
+    _, plain = timed(render_templates, apply_color_tags, args.records, True)
+    print(f"颜色标签: 正则替换 {regex * 1000:.1f} ms, 已编译模板 {compiled * 1000:.1f} ms, "
+          f"纯文本模式 {plain * 1000:.1f} ms, 加速比 {regex / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
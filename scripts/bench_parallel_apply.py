@@ -0,0 +1,79 @@
+"""
+并行写入基准测试
+在带模拟写入延迟的内存后端上比较串行写入与线程池并行写入，可在非Windows环境运行
+
+模拟延迟通过 time.sleep 实现 (等待期间释放GIL)，因此测得的加速比只是
+"每次写入都有固定的、可并行的等待" 这一假设下的上限，与 CPU 核心数无关，
+不能代表同一注册表键上 RegSetValueEx 的实际竞争情况，需要在 Windows 上用 --workers 实测
+
+用法:
+    python scripts/bench_parallel_apply.py [--values 20000] [--workers 1 2 4 8] [--latency 0.0002]
+"""
+import argparse
+import logging
+import time
+
+from bench_utils import CODM_ROOT_KEY, CODM_SUB_KEY, populate_backend, timed
+
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend
+from src.core.registry.memory_backend import MemoryRegistryBackend
+from src.core.utils.logger import LoggerManager
+from src.modules.reg_unlock_fps import RegUnlockFPSService
+from src.modules.zero_sensitivity import ZeroSensitivityService
+from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.modules.registry_sweep import RegistrySweepService, RegistryOperation
+
+
+class LatencyRegistryBackend(MemoryRegistryBackend):
+    """每次写入前等待固定时长的内存后端 (模拟写入延迟)"""
+
+    def __init__(self, write_latency):
+        super().__init__()
+        self.write_latency = write_latency
+
+    def set_value(self, root_key, sub_key, value_name, value_type, value):
+        time.sleep(self.write_latency)
+        super().set_value(root_key, sub_key, value_name, value_type, value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行写入基准测试")
+    parser.add_argument("--values", type=int, default=20_000, help="合成键值数量")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="要比较的线程数")
+    parser.add_argument("--latency", type=float, default=0.0002, help="每次写入的模拟延迟 (秒)")
+    args = parser.parse_args()
+
+    # 关闭逐项日志，只测量处理本身
+    for name in ("RegUnlockFPS", "ZeroSensitivity", "RegUnlockFOV", "RegistrySweep"):
+        LoggerManager.get_logger(name).setLevel(logging.CRITICAL)
+
+    DependencyProvider.register(RegUnlockFPSService, RegUnlockFPSService)
+    DependencyProvider.register(ZeroSensitivityService, ZeroSensitivityService)
+    DependencyProvider.register(RegUnlockFOVService, RegUnlockFOVService)
+    operations = set(RegistryOperation)
+
+    baseline = None
+    snapshot = None
+    for workers in args.workers:
+        # 每轮使用相同的初始数据，保证写入量一致
+        backend = populate_backend(LatencyRegistryBackend(args.latency), args.values)
+        DependencyProvider.register_instance(RegistryBackend, backend)
+        sweep_service = RegistrySweepService(backend)
+
+        report, elapsed = timed(sweep_service.sweep, CODM_ROOT_KEY, CODM_SUB_KEY, operations, workers=workers)
+        result = sorted(v for v in backend.snapshot_values(CODM_ROOT_KEY, CODM_SUB_KEY))
+        if snapshot is None:
+            snapshot = result
+        assert result == snapshot, "并行写入结果与串行写入不一致"
+
+        baseline = baseline or elapsed
+        print(f"workers={workers:<3} 写入 {report['writes']} 项, 写入耗时 {report['write_elapsed'] * 1000:.1f} ms, "
+              f"总耗时 {elapsed * 1000:.1f} ms, 加速比 {baseline / elapsed:.2f}x")
+    print(f"注意: 写入延迟为模拟的 {args.latency * 1e6:.0f} µs sleep (等待期间释放GIL)，"
+          f"以上加速比是该假设下的理论上限，不代表同一注册表键上 RegSetValueEx 的实际竞争，"
+          f"需在 Windows 上以 --workers 实测")
+
+
+if __name__ == "__main__":
+    main()
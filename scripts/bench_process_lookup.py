@@ -0,0 +1,143 @@
+"""
+游戏进程查找基准测试
+使用模拟的进程表 (读取可执行文件路径有固定延迟，部分系统进程无权限、名称为空)，
+比较逐个读取名称和路径的原始实现与按名称枚举 + 缓存的 ProcessLookup
+
+用法:
+    python scripts/bench_process_lookup.py [--processes 400] [--exe-latency 0.0002]
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+import psutil
+
+from bench_utils import timed
+
+from src.core.utils.logger import LoggerManager
+from src.modules.game_shortcut.process_lookup import ProcessLookup
+
+GAME = "CODM.exe"
+
+
+class FakeProcess:
+    """模拟的进程: 读取路径有延迟，系统进程无权限"""
+
+    def __init__(self, table, pid, name, exe, protected):
+        self.table = table
+        self.pid = pid
+        self._name = name
+        self._exe = exe
+        self._protected = protected
+        self._create_time = 1_700_000_000.0 + pid
+        self.info = {}
+
+    def name(self):
+        if self._name is None:
+            raise psutil.AccessDenied(self.pid)
+        return self._name
+
+    def exe(self):
+        time.sleep(self.table.exe_latency)
+        self.table.exe_calls += 1
+        if self._protected:
+            raise psutil.AccessDenied(self.pid)
+        return self._exe
+
+    def create_time(self):
+        return self._create_time
+
+
+class FakeProcessTable:
+    """模拟的进程表，提供 process_iter / Process 的替代实现"""
+
+    def __init__(self, count, exe_latency, seed=0):
+        rng = random.Random(seed)
+        self.exe_latency = exe_latency
+        self.exe_calls = 0
+        self.processes = {}
+        for i in range(count):
+            pid = 4 * (i + 1)
+            kind = rng.random()
+            if kind < 0.05:
+                name, protected = None, True
+            elif kind < 0.3:
+                name, protected = rng.choice(("svchost.exe", "csrss.exe", "lsass.exe")), True
+            else:
+                name, protected = f"app{i}.exe", False
+            self.processes[pid] = FakeProcess(self, pid, name, rf"C:\Program Files\App{i}\{name}", protected)
+        # 游戏进程位于进程表末尾
+        pid = 4 * (count + 1)
+        self.game_exe = r"D:\Games\CODM\CODM.exe"
+        self.processes[pid] = FakeProcess(self, pid, GAME, self.game_exe, False)
+
+    def process_iter(self, attrs, ad_value=None):
+        for proc in list(self.processes.values()):
+            proc.info = {}
+            for attr in attrs:
+                try:
+                    proc.info[attr] = getattr(proc, attr)()
+                except psutil.Error:
+                    proc.info[attr] = ad_value
+            yield proc
+
+    def process(self, pid):
+        try:
+            return self.processes[pid]
+        except KeyError:
+            raise psutil.NoSuchProcess(pid)
+
+
+def find_original(table, process_name):
+    """对照组: 原始实现 (为每个进程读取路径；跳过空名称以免中断测试)"""
+    for proc in table.process_iter(['name', 'exe']):
+        if proc.info['name'] and proc.info['name'].lower() == process_name.lower():
+            return proc.info['exe']
+    return None
+
+
+def measure(label, func, table, repeat):
+    table.exe_calls = 0
+    result, elapsed = timed(lambda: [func() for _ in range(repeat)][-1])
+    print(f"{label:<16} 单次 {elapsed / repeat * 1000:8.2f} ms, 读取路径 {table.exe_calls / repeat:6.1f} 次")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="游戏进程查找基准测试")
+    parser.add_argument("--processes", type=int, default=400, help="模拟进程数量")
+    parser.add_argument("--exe-latency", type=float, default=0.0002, help="读取进程路径的模拟延迟 (秒)")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+
+    LoggerManager.get_logger("ProcessLookup", show_time=False).setLevel(logging.WARNING)
+    table = FakeProcessTable(args.processes, args.exe_latency)
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "process_cache.json")
+
+        def lookup(**kwargs):
+            return ProcessLookup(process_iter=table.process_iter, process_factory=table.process, **kwargs)
+
+        assert measure("原始实现", lambda: find_original(table, GAME), table, args.repeat) == table.game_exe
+        # 每次新建查找器且不使用缓存文件: 只测按名称枚举
+        assert measure("按名称枚举", lambda: lookup().find(GAME), table, args.repeat) == table.game_exe
+        # 首次查找写入缓存文件，之后的进程 (新建查找器) 只校验缓存的PID
+        lookup(cache_path=cache_path).find(GAME)
+        assert measure("缓存命中", lambda: lookup(cache_path=cache_path).find(GAME), table, args.repeat) \
+            == table.game_exe
+
+        # 游戏退出: 缓存失效，回退到配置的安装路径
+        game_pid = next(pid for pid, proc in table.processes.items() if proc._name == GAME)
+        del table.processes[game_pid]
+        install_path = os.path.join(directory, GAME)
+        open(install_path, "wb").close()
+        result = measure("未运行 (回退)", lambda: lookup(cache_path=cache_path, install_path=install_path).find(GAME),
+                         table, args.repeat)
+        assert result == install_path
+
+
+if __name__ == "__main__":
+    main()
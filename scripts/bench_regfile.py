@@ -0,0 +1,117 @@
+"""
+.reg 导出文件流式读写基准测试
+生成包含合成 Call-of-Duty 路径和大量填充键的 regedit 导出文件 (UTF-16，hex 续行)，
+统计流式解析、边读边写复制的耗时与内存峰值 (峰值只与单个值的大小有关，与文件大小无关)，
+并通过 .reg 文件后端完整处理一次
+
+用法:
+    python scripts/bench_regfile.py [--values 20000] [--size-mb 64] [--path export.reg]
+"""
+import argparse
+import filecmp
+import logging
+import os
+import tempfile
+import tracemalloc
+
+from bench_utils import CODM_ROOT_KEY, CODM_SUB_KEY, synthetic_values, timed
+
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend, REG_BINARY
+from src.core.registry.regfile import RegEntry, iter_reg_file, write_reg_file
+from src.core.registry.regfile_backend import RegFileRegistryBackend
+from src.core.utils.logger import LoggerManager
+from src.modules.reg_unlock_fps import RegUnlockFPSService
+from src.modules.zero_sensitivity import ZeroSensitivityService
+from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.modules.registry_sweep import RegistrySweepService, RegistryOperation
+
+# 填充键中每个值的数据长度
+FILLER_DATA = 4000
+FILLER_VALUES_PER_KEY = 16
+
+
+def synthetic_entries(values, size_mb):
+    """生成导出记录: SOFTWARE\\Filler\\K* (填充数据) 与 Call-of-Duty 路径"""
+    filler_data = bytes(range(256)) * (FILLER_DATA // 256) + bytes(FILLER_DATA % 256)
+    # 每字节在 UTF-16 文本中约占 3 个字符 (6 字节)
+    key_bytes = FILLER_VALUES_PER_KEY * FILLER_DATA * 6
+    for index in range(size_mb * 1024 * 1024 // key_bytes):
+        sub_key = f"SOFTWARE\\Filler\\K{index}"
+        yield RegEntry(CODM_ROOT_KEY, sub_key, None, None, None)
+        for i in range(FILLER_VALUES_PER_KEY):
+            yield RegEntry(CODM_ROOT_KEY, sub_key, f"Value{i}", REG_BINARY, filler_data)
+    yield RegEntry(CODM_ROOT_KEY, CODM_SUB_KEY, None, None, None)
+    for name, value_type, value in values:
+        yield RegEntry(CODM_ROOT_KEY, CODM_SUB_KEY, name, value_type, value)
+
+
+def count_entries(path):
+    return sum(1 for _ in iter_reg_file(path))
+
+
+def traced_peak(func, *args):
+    """执行并返回内存峰值 (tracemalloc 会拖慢执行，不参与计时)"""
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=".reg 导出文件流式读写基准测试")
+    parser.add_argument("--values", type=int, default=20_000, help="合成键值数量")
+    parser.add_argument("--size-mb", type=int, default=64, help="填充数据大小 (MB)")
+    parser.add_argument("--path", help=".reg 文件输出路径 (默认为临时文件)")
+    args = parser.parse_args()
+
+    for name in ("RegUnlockFPS", "ZeroSensitivity", "RegUnlockFOV", "RegistrySweep"):
+        LoggerManager.get_logger(name).setLevel(logging.CRITICAL)
+
+    path = args.path or os.path.join(tempfile.gettempdir(), "bench_export.reg")
+    copy_path = path + ".copy"
+    values = synthetic_values(args.values)
+    _, elapsed = timed(write_reg_file, path, synthetic_entries(values, args.size_mb))
+    size = os.path.getsize(path)
+    print(f"生成导出文件: {size / 1024 / 1024:.1f} MB, 耗时 {elapsed:.1f} s")
+
+    count, elapsed = timed(count_entries, path)
+    print(f"流式解析: {count} 条记录, 耗时 {elapsed:.2f} s ({size / elapsed / 1024 / 1024:.1f} MB/s), "
+          f"内存峰值 {traced_peak(count_entries, path) / 1024 / 1024:.2f} MB")
+
+    _, elapsed = timed(write_reg_file, copy_path, iter_reg_file(path))
+    peak = traced_peak(write_reg_file, copy_path, iter_reg_file(path))
+    assert filecmp.cmp(path, copy_path, shallow=False)
+    print(f"边读边写复制: 耗时 {elapsed:.2f} s, 内存峰值 {peak / 1024 / 1024:.2f} MB, 内容一致")
+
+    # 通过 .reg 文件后端处理 (整个文件加载到内存)，写回后重新读取检查修改结果
+    backend, elapsed = timed(RegFileRegistryBackend, path, copy_path)
+    print(f"后端加载: 耗时 {elapsed:.2f} s")
+    DependencyProvider.register_instance(RegistryBackend, backend)
+    DependencyProvider.register(RegUnlockFPSService, RegUnlockFPSService)
+    DependencyProvider.register(ZeroSensitivityService, ZeroSensitivityService)
+    DependencyProvider.register(RegUnlockFOVService, RegUnlockFOVService)
+    report, elapsed = timed(RegistrySweepService(backend).sweep, CODM_ROOT_KEY, CODM_SUB_KEY,
+                            set(RegistryOperation))
+    print(f"处理: {report['total']} 项, 写入 {report['writes']} 项, 耗时 {elapsed * 1000:.1f} ms")
+    _, elapsed = timed(backend.save)
+    print(f"写回: 耗时 {elapsed:.2f} s")
+
+    patched = {entry.name: entry.value for entry in iter_reg_file(copy_path)
+               if entry.sub_key == CODM_SUB_KEY and entry.name is not None}
+    for name, value_type, _ in values:
+        if "Fov" in name:
+            assert patched[name][6] == 0xFF
+        elif "EnableFramerateCustomize" in name:
+            assert patched[name] == 1
+        elif value_type == REG_BINARY:
+            assert patched[name][0] == 0x01
+    print("校验通过")
+    os.remove(copy_path)
+    if not args.path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+注册表二进制值读取基准测试 (仅Windows)
+在 HKEY_CURRENT_USER 下创建临时路径写入合成数据，比较原实现 (每个值两次 RegQueryValueEx: 先取大小再取数据)
+与单次调用读取 (按键的最大值长度预分配缓冲区) 的耗时和API调用次数
+
+用法:
+    python scripts/bench_registry_reads.py [--values 2000]
+"""
+import argparse
+import ctypes
+import sys
+from ctypes import wintypes
+
+from bench_utils import synthetic_values, timed
+
+from src.core.registry.backend import HKEY_CURRENT_USER, REG_BINARY
+
+BENCH_SUB_KEY = r"SOFTWARE\CODM-Tactix-Hub-Bench"
+
+
+def read_two_calls(registry_utils, pool, sub_key, value_name):
+    """对照组: 原实现 (第一次调用取大小，第二次调用取数据)"""
+    h_key = registry_utils.open_reg_key(HKEY_CURRENT_USER, sub_key, registry_utils.KEY_READ, pool)
+    data_size = wintypes.DWORD()
+    registry_utils._api().RegQueryValueEx(h_key, value_name, None, None, None, ctypes.byref(data_size))
+    data_buffer = (ctypes.c_ubyte * data_size.value)()
+    registry_utils._api().RegQueryValueEx(h_key, value_name, None, None, data_buffer, ctypes.byref(data_size))
+    registry_utils.close_reg_key(h_key, pool)
+    return bytes(data_buffer)
+
+
+def measure(label, registry_utils, func, names):
+    registry_utils.call_stats.reset()
+    with registry_utils.RegistryHandlePool() as pool:
+        result, elapsed = timed(lambda: [func(pool, name) for name in names])
+    calls, total_ns = registry_utils.call_stats.snapshot().get("RegQueryValueEx", (0, 0))
+    print(f"{label:<10} {elapsed * 1000:8.1f} ms, RegQueryValueEx {calls} 次 "
+          f"(平均 {total_ns / max(calls, 1) / 1000:.1f} µs)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="注册表二进制值读取基准测试")
+    parser.add_argument("--values", type=int, default=2000, help="临时路径中的值数量")
+    args = parser.parse_args()
+
+    if sys.platform != "win32":
+        print("此基准测试需要在Windows上运行")
+        return
+
+    import winreg
+    from src.core.utils import registry_utils
+
+    names = []
+    with winreg.CreateKey(HKEY_CURRENT_USER, BENCH_SUB_KEY) as key:
+        for name, value_type, value in synthetic_values(args.values):
+            if value_type == REG_BINARY:
+                winreg.SetValueEx(key, name, 0, value_type, value)
+                names.append(name)
+    try:
+        expected = measure("两次调用", registry_utils,
+                           lambda pool, name: read_two_calls(registry_utils, pool, BENCH_SUB_KEY, name), names)
+        actual = measure("单次调用", registry_utils,
+                         lambda pool, name: registry_utils.read_reg_binary_value(
+                             HKEY_CURRENT_USER, BENCH_SUB_KEY, name, pool), names)
+        assert actual == expected
+    finally:
+        winreg.DeleteKey(HKEY_CURRENT_USER, BENCH_SUB_KEY)
+
+
+if __name__ == "__main__":
+    main()
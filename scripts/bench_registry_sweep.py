@@ -0,0 +1,59 @@
+"""
+注册表批量处理基准测试
+在内存后端上构建合成的 Call-of-Duty 路径并执行一次完整处理，可在非Windows环境运行
+
+用法:
+    python scripts/bench_registry_sweep.py [--values 100000]
+"""
+import argparse
+import logging
+
+from bench_utils import CODM_ROOT_KEY, CODM_SUB_KEY, populate_backend, timed
+
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend
+from src.core.registry.memory_backend import MemoryRegistryBackend
+from src.core.utils.logger import LoggerManager
+from src.modules.reg_unlock_fps import RegUnlockFPSService
+from src.modules.zero_sensitivity import ZeroSensitivityService
+from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.modules.registry_sweep import RegistrySweepService, RegistryOperation
+from src.modules.patch_rules import builtin_rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="注册表批量处理基准测试")
+    parser.add_argument("--values", type=int, default=100_000, help="合成键值数量")
+    args = parser.parse_args()
+
+    # 关闭逐项日志，只测量处理本身
+    for name in ("RegUnlockFPS", "ZeroSensitivity", "RegUnlockFOV", "PatchRules", "RegistrySweep"):
+        LoggerManager.get_logger(name).setLevel(logging.CRITICAL)
+
+    backend = populate_backend(MemoryRegistryBackend(), args.values)
+    DependencyProvider.register_instance(RegistryBackend, backend)
+    DependencyProvider.register(RegUnlockFPSService, RegUnlockFPSService)
+    DependencyProvider.register(ZeroSensitivityService, ZeroSensitivityService)
+    DependencyProvider.register(RegUnlockFOVService, RegUnlockFOVService)
+
+    sweep_service = RegistrySweepService(backend)
+    operations = set(RegistryOperation)
+
+    for label in ("首次处理", "重复处理"):
+        report, elapsed = timed(sweep_service.sweep, CODM_ROOT_KEY, CODM_SUB_KEY, operations)
+        print(f"{label}: {report['total']} 项, 写入 {report['writes']} 项, 耗时 {elapsed * 1000:.1f} ms")
+        for operation, stats in report['operations'].items():
+            print(f"  {operation.name:<12} 匹配 {stats['matched']:>6}  修改 {stats['modified']:>6}  "
+                  f"耗时 {stats['elapsed'] * 1000:.1f} ms")
+
+    # 按内置规则集处理新的合成数据 (单次枚举执行全部规则)
+    sweep_service = RegistrySweepService(populate_backend(MemoryRegistryBackend(), args.values))
+    report, elapsed = timed(sweep_service.sweep_rules, CODM_ROOT_KEY, CODM_SUB_KEY, builtin_rules())
+    print(f"规则处理: {report['total']} 项, 写入 {report['writes']} 项, 耗时 {elapsed * 1000:.1f} ms")
+    for group, stats in report['operations'].items():
+        print(f"  {group.name:<12} 匹配 {stats['matched']:>6}  修改 {stats['modified']:>6}  "
+              f"耗时 {stats['elapsed'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
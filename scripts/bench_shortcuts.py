@@ -0,0 +1,73 @@
+"""
+快捷方式生成基准测试
+在临时目录中批量生成多个快捷方式变体，比较直接写入 .lnk 文件与 WScript.Shell (每次新建 COM 对象 / 批量共用)
+的耗时；并校验 .lnk 写入结果可被解析且相同参数生成的内容逐字节一致
+
+用法:
+    python scripts/bench_shortcuts.py [--shortcuts 50]
+"""
+import argparse
+import os
+import tempfile
+from unittest import mock
+
+from bench_utils import timed
+
+from src.modules.game_shortcut import strategy as strategy_module
+from src.modules.game_shortcut.lnk import build_shell_link, read_shell_link
+from src.modules.game_shortcut.strategy import DefaultShortcutStrategy, LnkShortcutStrategy, ShortcutSpec
+
+TARGET = r"D:\Games\CODM\CODM.exe"
+
+
+def make_specs(count):
+    """不同窗口模式 / 帧率预设 / 账号的快捷方式变体"""
+    modes = ["exclusive 5", "borderless", "windowed"]
+    return [
+        ShortcutSpec(f"CODM_{i}", f"-window-mode {modes[i % len(modes)]} -profile {i}", f"变体 {i}")
+        for i in range(count)
+    ]
+
+
+def create_one_by_one(strategy, specs):
+    """对照组: 每个快捷方式单独调用 (COM 后端时每次新建 WScript.Shell)"""
+    return [strategy.create_shortcut(TARGET, spec.arguments, spec.name) for spec in specs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="快捷方式生成基准测试")
+    parser.add_argument("--shortcuts", type=int, default=50, help="快捷方式变体数量")
+    args = parser.parse_args()
+
+    specs = make_specs(args.shortcuts)
+    strategies = [("lnk", LnkShortcutStrategy(lookup=object()))]
+    try:
+        import win32com.client  # noqa: F401
+        strategies.append(("com", DefaultShortcutStrategy(lookup=object())))
+    except ImportError:
+        print("未安装 pywin32, 跳过 WScript.Shell 对照")
+
+    with tempfile.TemporaryDirectory() as directory, \
+            mock.patch.object(strategy_module, "get_desktop_path", return_value=directory):
+        for label, strategy in strategies:
+            _, single = timed(create_one_by_one, strategy, specs)
+            results, batch = timed(strategy.create_shortcuts, TARGET, specs)
+            assert all(result['success'] for result in results)
+            print(f"{label}: 逐个创建 {single * 1000:8.1f} ms, 批量创建 {batch * 1000:8.1f} ms "
+                  f"({len(specs)} 个)")
+
+        # .lnk 写入结果: 字段可解析，且与相同参数重新生成的内容逐字节一致
+        for spec in specs:
+            with open(os.path.join(directory, f"{spec.name}.lnk"), "rb") as file:
+                data = file.read()
+            parsed = read_shell_link(data)
+            assert parsed['target_path'] == TARGET and parsed['arguments'] == spec.arguments
+            expected = build_shell_link(TARGET, arguments=spec.arguments, working_directory=os.path.dirname(TARGET),
+                                        icon_location=TARGET, description=spec.description)
+            if strategies[-1][0] == "lnk":
+                assert data == expected
+        print("校验通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+启动耗时基准测试
+对每组命令行参数启动一个新的解释器 (-X importtime)，执行到参数解析、依赖注册并获取该操作所需的服务为止，
+输出冷启动耗时、导入耗时以及自身导入耗时最高的模块
+
+用法:
+    python scripts/bench_startup.py [--repeat 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_utils import project_root
+
+# 参数组合 -> 该操作需要获取的服务
+SCENARIOS = [
+    (["--help"], []),
+    (["--fps-unlock"], ["src.modules.registry_sweep:RegistrySweepService"]),
+    (["--sensitivity"], ["src.modules.registry_sweep:RegistrySweepService"]),
+    (["--all"], ["src.modules.registry_sweep:RegistrySweepService", "src.modules.game_shortcut:GameShortcutService"]),
+    (["--create-shortcut"], ["src.modules.game_shortcut:GameShortcutService"]),
+]
+
+# 在子进程中执行: 与 main() 相同的启动步骤，但不执行注册表操作
+PROBE = """
+import sys
+from src.main import parse_arguments
+from src.bootstrap import initialize_app
+from src.core.di.container import import_target
+from src.core.di.provider import DependencyProvider
+
+sys.argv = ["main"] + sys.argv[1:]
+args = parse_arguments()
+initialize_app(reg_file=args.reg_file, use_index=False)
+for path in {services}:
+    DependencyProvider.get(import_target(path))
+"""
+
+
+def run_scenario(flags, services, reg_file):
+    probe = PROBE.format(services=services)
+    command = [sys.executable, "-X", "importtime", "-c", probe, *flags, "--reg-file", reg_file]
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=project_root, capture_output=True, text=True,
+                               env={**os.environ, "NO_COLOR": "1"})
+    elapsed = time.perf_counter() - start
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((int(self_us), int(cumulative_us), name.rstrip()))
+    # 顶层导入 (无缩进) 的累计耗时之和即总导入耗时
+    total_us = sum(cumulative for _, cumulative, name in imports if not name.startswith("  "))
+    return elapsed, total_us, imports, completed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每组参数重复次数 (取最小值)")
+    parser.add_argument("--top", type=int, default=3, help="显示自身导入耗时最高的模块数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        reg_file = os.path.join(directory, "empty.reg")
+        for flags, services in SCENARIOS:
+            runs = [run_scenario(flags, services, reg_file) for _ in range(args.repeat)]
+            elapsed, total_us, imports, completed = min(runs, key=lambda run: run[0])
+            label = " ".join(flags)
+            if completed.returncode != 0:
+                last_error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ""
+                print(f"{label:<18} 失败 (退出码 {completed.returncode}): {last_error}")
+                continue
+            slowest = sorted(imports, reverse=True)[:args.top]
+            top = ", ".join(f"{name.strip()} {self_us / 1000:.1f}ms" for self_us, _, name in slowest)
+            print(f"{label:<18} 冷启动 {elapsed * 1000:6.1f} ms, 导入 {total_us / 1000:6.1f} ms  [{top}]")
+
+
+if __name__ == "__main__":
+    main()
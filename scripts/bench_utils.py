@@ -0,0 +1,73 @@
+"""
+基准测试公共工具
+构建合成的 Call-of-Duty 注册表数据，供各基准脚本使用
+"""
+import os
+import random
+import sys
+import time
+
+# 将项目根目录添加到系统路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.core.registry.backend import HKEY_CURRENT_USER, REG_BINARY, REG_DWORD  # noqa: E402
+
+CODM_ROOT_KEY = HKEY_CURRENT_USER
+CODM_SUB_KEY = r"SOFTWARE\Tencent\Call-of-Duty"
+
+SENSITIVITY_MODES = ["PVE", "PVP", "TD", "Br", "PVEFiring", "PVPFiring", "TDFiring", "BrFiring"]
+SENSITIVITY_SCOPES = ["", "_RotateSensitive", "_AimRotate", "_ReddotHolo", "_Sniper", "_ACOG", "_3X", "_Vertical"]
+OTHER_SETTINGS = ["GraphicQuality", "SoundVolume", "LastLoginTime", "ChatChannel", "CrosshairColor"]
+
+
+def synthetic_values(count, seed=0):
+    """
+    生成合成的 CODM 注册表值
+
+    返回:
+        list: [(值名称, 值类型, 值)]，按约 40% 灵敏度 / 少量帧率与FOV / 其余无关项分布
+    """
+    rng = random.Random(seed)
+    values = []
+    for i in range(count):
+        account = 1000 + i % 7
+        suffix = f"_h{rng.randrange(10 ** 9)}"
+        kind = rng.random()
+        if kind < 0.4:
+            mode = rng.choice(SENSITIVITY_MODES)
+            scope = rng.choice(SENSITIVITY_SCOPES)
+            data = bytes([rng.choice((0x00, 0x01))]) + bytes(rng.randrange(256) for _ in range(11))
+            values.append((f"CODM_{account}_iMSDK_CN_{mode}{scope}{suffix}", REG_BINARY, data))
+        elif kind < 0.45:
+            setting = rng.choice(("EnableFramerateCustomize", "FramerateCustomizeValue"))
+            values.append((f"CODM_{account}_iMSDK_CN_{setting}{suffix}", REG_DWORD, rng.randrange(2)))
+        elif kind < 0.5:
+            setting = rng.choice(("BRWeaponFov", "MPWeaponFov"))
+            data = bytes(rng.randrange(256) for _ in range(12))
+            values.append((f"CODM_{account}_iMSDK_CN_{setting}{suffix}", REG_BINARY, data))
+        else:
+            setting = rng.choice(OTHER_SETTINGS)
+            values.append((f"CODM_{account}_iMSDK_CN_{setting}{suffix}", REG_DWORD, rng.randrange(100)))
+    return values
+
+
+def populate_backend(backend, count, seed=0):
+    """向内存后端写入合成的 Call-of-Duty 路径"""
+    key = backend.create_key(CODM_ROOT_KEY, CODM_SUB_KEY)
+    for name, value_type, value in synthetic_values(count, seed):
+        key[name] = (value_type, value)
+    return backend
+
+
+def timed(func, *args, **kwargs):
+    """
+    执行函数并计时
+
+    返回:
+        tuple: (返回值, 耗时秒数)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -104,6 +104,7 @@ def get_hidden_imports():
         "src.core",
         "src.core.di",
         "src.core.exceptions",
+        "src.core.registry",
         "src.core.utils",
 
         # 功能模块
@@ -111,11 +112,23 @@ def get_hidden_imports():
         "src.modules.zero_sensitivity",
         "src.modules.game_shortcut",
         "src.modules.reg_unlock_fov",
+        "src.modules.registry_sweep",
+        "src.modules.patch_rules",
+        "src.modules.batch_sweep",
+
+        # 运行时按需导入的模块 (静态分析无法发现)
+        "src.modules.registry_sweep.service",
+        "src.modules.registry_sweep.index",
+        "src.core.registry.winreg_backend",
+        "src.core.registry.regfile_backend",
+        "src.core.registry.hive_backend",
+        "src.core.utils.log_queue",
 
         # 其他可能需要的模块
         "win32api",  # Windows API支持
         "win32con",
         "win32gui",
+        "pythoncom",  # 工作线程中初始化COM
         "colorama",  # 日志颜色支持
         "ctypes",  # 底层API支持
         "re",  # 正则表达式
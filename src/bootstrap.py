@@ -1,21 +1,125 @@
 from src.core.utils.logger import LoggerManager
 from src.core.di.provider import DependencyProvider
-from src.modules.reg_unlock_fps import RegUnlockFPSService
-from src.modules.zero_sensitivity import ZeroSensitivityService
-from src.modules.game_shortcut import GameShortcutService
-from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.core.registry.backend import RegistryBackend
 
 # 导入模块接口和实现
+# 服务与策略按 "模块路径:类名" 延迟注册，首次获取时才导入对应模块 (及其依赖的 psutil / win32com 等)；
+# 构造函数参数按类型注解注入: 服务获得策略，策略获得注册表后端
+# 服务的实现即接口本身，只需列出键
+LAZY_SERVICES = (
+    "src.modules.reg_unlock_fps.service:RegUnlockFPSService",
+    "src.modules.zero_sensitivity.service:ZeroSensitivityService",
+    "src.modules.game_shortcut.service:GameShortcutService",
+    "src.modules.reg_unlock_fov.service:RegUnlockFOVService",
+    "src.modules.patch_rules.service:PatchRuleService",
+)
+# 策略接口 -> 默认实现
+LAZY_STRATEGIES = {
+    "src.modules.reg_unlock_fps.strategy:BaseRegUnlockFPSStrategy":
+        "src.modules.reg_unlock_fps.strategy:DefaultRegUnlockFPSStrategy",
+    "src.modules.zero_sensitivity.strategy:BaseZeroSensitivityStrategy":
+        "src.modules.zero_sensitivity.strategy:DefaultZeroSensitivityStrategy",
+    "src.modules.reg_unlock_fov.strategy:BaseRegUnlockFOV": "src.modules.reg_unlock_fov.strategy:DefaultRegUnlockFOV",
+}
+SWEEP_SERVICE_KEY = "src.modules.registry_sweep.service:RegistrySweepService"
+# 快捷方式后端: com 使用 WScript.Shell (需要 pywin32)，lnk 直接生成 .lnk 文件
+SHORTCUT_STRATEGY_KEY = "src.modules.game_shortcut.strategy:BaseShortcutStrategy"
+SHORTCUT_STRATEGIES = {
+    "com": "src.modules.game_shortcut.strategy:DefaultShortcutStrategy",
+    "lnk": "src.modules.game_shortcut.strategy:LnkShortcutStrategy",
+}
+PROCESS_LOOKUP_KEY = "src.modules.game_shortcut.process_lookup:ProcessLookup"
+# 注册表句柄池: 每次批量处理 (依赖作用域) 一个，处理结束时关闭其中的句柄
+HANDLE_POOL_KEY = "src.core.utils.registry_utils:RegistryHandlePool"
 
 
-def initialize_app():
-    """初始化应用依赖"""
+def create_registry_backend(reg_file=None, hive=None) -> RegistryBackend:
+    """
+    创建注册表访问后端
+
+    参数:
+        reg_file: .reg 文件路径 (为空时使用真实注册表)
+        hive: 离线配置单元 (NTUSER.DAT) 路径，映射为 HKEY_CURRENT_USER
+    """
+    if hive:
+        from src.core.registry.hive_backend import HiveRegistryBackend
+        return HiveRegistryBackend(hive)
+    if reg_file:
+        from src.core.registry.regfile_backend import RegFileRegistryBackend
+        return RegFileRegistryBackend(reg_file)
+
+    # 仅在Windows上可用，延迟导入
+    from src.core.registry.winreg_backend import WinRegistryBackend
+    return WinRegistryBackend()
+
+
+def create_sweep_service(use_index=True, journal_path=None, columnar=False):
+    """
+    创建注册表批量处理服务
+
+    参数:
+        use_index: 是否启用持久化分类索引
+        journal_path: JSON Lines 操作日志路径 (为空时不记录)
+        columnar: 是否以列式快照向量化处理二进制值 (需要 numpy)
+    """
+    from src.core.utils.journal import OperationJournal
+    from src.modules.registry_sweep import RegistrySweepService, ClassificationIndex
+
+    index = ClassificationIndex(ClassificationIndex.default_path()) if use_index else None
+    journal = OperationJournal(journal_path) if journal_path else None
+    return RegistrySweepService(index=index, journal=journal, columnar=columnar)
+
+
+def create_process_lookup(game_path=None):
+    """
+    创建游戏进程查找器
+
+    参数:
+        game_path: 游戏未运行时使用的可执行文件路径
+    """
+    from src.modules.game_shortcut.process_lookup import ProcessLookup
+    return ProcessLookup(ProcessLookup.default_cache_path(), install_path=game_path)
+
+
+def register_dependencies(reg_file=None, use_index=True, journal_path=None, game_path=None, shortcut_backend="com",
+                          columnar=False, hive=None):
+    """
+    注册应用依赖 (仅注册，各依赖在首次获取时才创建)
+
+    重新注册会丢弃已创建的实例，批量处理的工作进程借此为每个文件切换注册表后端。
+    参数同 initialize_app。
+    """
+    DependencyProvider.register(RegistryBackend, lambda: create_registry_backend(reg_file, hive))
+    for interface, target in LAZY_STRATEGIES.items():
+        DependencyProvider.register_lazy(interface, target)
+    for interface in LAZY_SERVICES:
+        DependencyProvider.register_lazy(interface)
+    DependencyProvider.register(SWEEP_SERVICE_KEY, lambda: create_sweep_service(use_index, journal_path, columnar))
+    DependencyProvider.register_lazy(SHORTCUT_STRATEGY_KEY, SHORTCUT_STRATEGIES[shortcut_backend])
+    DependencyProvider.register(PROCESS_LOOKUP_KEY, lambda: create_process_lookup(game_path))
+    DependencyProvider.register_scoped(HANDLE_POOL_KEY, HANDLE_POOL_KEY)
+
+
+def initialize_app(reg_file=None, use_index=True, journal_path=None, game_path=None, shortcut_backend="com",
+                   columnar=False, hive=None):
+    """
+    初始化应用依赖 (仅注册，各依赖在首次获取时才创建)
+
+    参数:
+        reg_file: .reg 文件路径 (为空时使用真实注册表)
+        use_index: 是否启用持久化分类索引
+        journal_path: JSON Lines 操作日志路径 (为空时不记录)
+        game_path: 游戏未运行时创建快捷方式使用的可执行文件路径
+        shortcut_backend: 快捷方式后端 (com / lnk)
+        columnar: 是否以列式快照向量化处理二进制值 (需要 numpy)
+        hive: 离线配置单元 (NTUSER.DAT) 路径 (为空时使用真实注册表)
+    """
     loggers = LoggerManager.get_logger("bootstrap", show_time=False)
-    DependencyProvider.register(RegUnlockFPSService, RegUnlockFPSService)
-    DependencyProvider.register(ZeroSensitivityService, ZeroSensitivityService)
-    DependencyProvider.register(GameShortcutService, GameShortcutService)
-    DependencyProvider.register(RegUnlockFOVService, RegUnlockFOVService)
+    register_dependencies(reg_file, use_index, journal_path, game_path, shortcut_backend, columnar, hive)
+    loggers.success(f"{{color:yellow}}RegistryBackend{{/color}}依赖初始化完成 ({'hive' if hive else 'regfile' if reg_file else 'winreg'})")
     loggers.success("{color:yellow}RegUnlockFPS{/color}依赖初始化完成")
     loggers.success("{color:yellow}ZeroSensitivity{/color}依赖初始化完成")
     loggers.success("{color:yellow}GameShortcut{/color}依赖初始化完成")
     loggers.success("{color:yellow}RegUnlockFOV{/color}依赖初始化完成")
+    loggers.success("{color:yellow}PatchRules{/color}依赖初始化完成")
+    loggers.success("{color:yellow}RegistrySweep{/color}依赖初始化完成")
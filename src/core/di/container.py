@@ -1,41 +1,262 @@
+import importlib
+import inspect
+import threading
+import typing
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
 from typing import Dict, Type, Any, Callable
 
+# 未找到实例的标记 (允许注册值为None的单例)
+_MISSING = object()
+
+
+def import_target(path: str) -> Any:
+    """
+    按 "模块路径:属性名" 导入对象
+
+    参数:
+        path: 如 "src.modules.game_shortcut.service:GameShortcutService"
+    """
+    module_name, _, attr = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+def interface_key(interface: Type | str) -> str:
+    """依赖的字符串键 ("模块路径:类名")，与延迟注册使用的键一致"""
+    if isinstance(interface, str):
+        return interface
+    return f"{interface.__module__}:{interface.__qualname__}"
+
+
+class Lifetime(Enum):
+    """依赖的生命周期"""
+    SINGLETON = "singleton"  # 全局单例
+    TRANSIENT = "transient"  # 每次解析新建
+    SCOPED = "scoped"        # 每个作用域一个实例
+
+
+class Scope:
+    """
+    依赖作用域
+
+    作用域内解析的 SCOPED 依赖共用同一实例，退出作用域时按创建的逆序调用实例的 close()。
+    """
+
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.RLock()
+
+    def get(self, key, factory):
+        """获取作用域内的实例 (不存在时创建)"""
+        instance = self._instances.get(key, _MISSING)
+        if instance is _MISSING:
+            with self._lock:
+                instance = self._instances.get(key, _MISSING)
+                if instance is _MISSING:
+                    instance = factory()
+                    self._instances[key] = instance
+        return instance
+
+    def close(self):
+        """释放作用域内创建的实例"""
+        with self._lock:
+            instances = list(self._instances.values())
+            self._instances.clear()
+        for instance in reversed(instances):
+            close = getattr(instance, "close", None)
+            if callable(close):
+                close()
+
+
+# 当前作用域 (按线程 / 异步任务上下文隔离)
+_current_scope: ContextVar[Scope | None] = ContextVar("dependency_scope", default=None)
+
 
 class DependencyContainer:
-    """轻量级依赖注入容器"""
-    _registry: Dict[Type, tuple] = {}
-    _instances: Dict[Type, Any] = {}
+    """
+    轻量级依赖注入容器
+
+    已创建的单例直接从字典读取 (无锁)，首次创建时加锁并二次检查，保证并发解析只构造一个实例。
+    注册的实现为类时，按构造函数参数的类型注解自动注入已注册的依赖。
+    """
+    _registry: Dict[Type | str, tuple] = {}
+    # 单例实例，同时以注册键和实际请求的类型为键 (后者供快速路径使用)
+    _instances: Dict[Type | str, Any] = {}
+    # 请求的类型 -> 注册键
+    _aliases: Dict[Type | str, Type | str] = {}
+    # 类 -> [(参数名, 依赖类型)]
+    _injection_plans: Dict[type, list] = {}
+    # 可重入: 工厂函数内部可以继续解析其他依赖
+    _lock = threading.RLock()
 
     @classmethod
     def register(cls,
-                 interface: Type,
+                 interface: Type | str,
                  implementation: Type | Callable,
-                 singleton: bool = True):
-        """注册依赖关系"""
-        cls._registry[interface] = (implementation, singleton)
+                 singleton: bool = True,
+                 lifetime: Lifetime = None):
+        """
+        注册依赖关系
+
+        参数:
+            singleton: 为False时每次解析新建实例 (指定 lifetime 时忽略)
+            lifetime: 生命周期
+        """
+        if lifetime is None:
+            lifetime = Lifetime.SINGLETON if singleton else Lifetime.TRANSIENT
+        with cls._lock:
+            cls._registry[interface] = (implementation, lifetime)
+            # 重新注册时丢弃旧实例 (包括别名)
+            cls._instances.pop(interface, None)
+            for alias in [alias for alias, key in cls._aliases.items() if key == interface]:
+                cls._instances.pop(alias, None)
+                del cls._aliases[alias]
+
+    @classmethod
+    def register_lazy(cls,
+                      interface: Type | str,
+                      target: str = None,
+                      singleton: bool = True,
+                      lifetime: Lifetime = None):
+        """
+        延迟注册: 首次解析时才导入实现所在模块
+
+        参数:
+            interface: 依赖类型，或其字符串键 "模块路径:类名" (注册时无需导入该模块)
+            target: 实现类或工厂函数的路径 "模块路径:属性名" (为空时实现即接口本身)
+        """
+        if target is None:
+            target = interface_key(interface)
+
+        def factory():
+            return cls.create(import_target(target))
+
+        cls.register(interface, factory, singleton, lifetime)
+
+    @classmethod
+    def _lookup(cls, interface):
+        """查找注册项，类型未直接注册时按字符串键查找延迟注册项"""
+        if interface in cls._registry:
+            return interface, cls._registry[interface]
+        if not isinstance(interface, str):
+            key = interface_key(interface)
+            if key in cls._registry:
+                return key, cls._registry[key]
+        name = interface if isinstance(interface, str) else interface.__name__
+        raise DependencyError(f"未注册的依赖: {name}")
 
     @classmethod
-    def resolve(cls, interface: Type) -> Any:
+    def resolve(cls, interface: Type | str) -> Any:
         """解析依赖项"""
-        if interface not in cls._registry:
-            raise DependencyError(f"未注册的依赖: {interface.__name__}")
+        # 快速路径: 已创建的单例
+        instance = cls._instances.get(interface, _MISSING)
+        if instance is not _MISSING:
+            return instance
 
-        impl, singleton = cls._registry[interface]
+        key, (impl, lifetime) = cls._lookup(interface)
 
-        # 处理单例模式
-        if singleton:
-            if interface not in cls._instances:
-                instance = impl() if callable(impl) else impl
+        if lifetime is Lifetime.TRANSIENT:
+            return cls._build(impl)
+
+        if lifetime is Lifetime.SCOPED:
+            scope = _current_scope.get()
+            if scope is None:
+                raise DependencyError(f"作用域依赖只能在作用域内解析: {key}")
+            return scope.get(key, lambda: cls._build(impl))
+
+        # 处理单例模式: 加锁后二次检查
+        with cls._lock:
+            instance = cls._instances.get(key, _MISSING)
+            if instance is _MISSING:
+                instance = cls._build(impl)
+                cls._instances[key] = instance
+            if interface is not key:
                 cls._instances[interface] = instance
-            return cls._instances[interface]
+                cls._aliases[interface] = key
+        return instance
 
+    @classmethod
+    def _build(cls, impl):
+        if isinstance(impl, type):
+            return cls.create(impl)
         return impl() if callable(impl) else impl
 
+    @classmethod
+    def _injection_plan(cls, implementation: type) -> list:
+        """构造函数中带类型注解的参数 (按类缓存)"""
+        plan = cls._injection_plans.get(implementation)
+        if plan is None:
+            plan = []
+            try:
+                init = implementation.__init__
+                hints = typing.get_type_hints(init)
+                parameters = inspect.signature(init).parameters.values()
+            except (TypeError, ValueError, NameError):
+                hints, parameters = {}, ()
+            for parameter in parameters:
+                if parameter.kind not in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY):
+                    continue
+                hint = hints.get(parameter.name)
+                # Optional[X] / X | None 取 X
+                candidates = [arg for arg in typing.get_args(hint) if arg is not type(None)] or [hint]
+                if len(candidates) == 1 and isinstance(candidates[0], type):
+                    plan.append((parameter.name, candidates[0]))
+            cls._injection_plans[implementation] = plan
+        return plan
+
+    @classmethod
+    def create(cls, implementation, **kwargs) -> Any:
+        """
+        创建实例: 为类时按构造函数的类型注解注入已注册的依赖
+
+        参数:
+            kwargs: 显式传入的参数 (优先于注入)
+        """
+        if not isinstance(implementation, type):
+            return implementation(**kwargs)
+        for name, interface in cls._injection_plan(implementation):
+            if name not in kwargs and cls.is_registered(interface):
+                kwargs[name] = cls.resolve(interface)
+        return implementation(**kwargs)
+
+    @classmethod
+    def is_registered(cls, interface: Type | str) -> bool:
+        """是否已注册"""
+        if interface in cls._registry:
+            return True
+        return isinstance(interface, type) and interface_key(interface) in cls._registry
+
+    @classmethod
+    @contextmanager
+    def scope(cls):
+        """
+        进入新的依赖作用域
+
+        作用域在当前线程 / 异步任务上下文中生效，退出时释放其中创建的 SCOPED 实例。
+        """
+        scope = Scope()
+        token = _current_scope.set(scope)
+        try:
+            yield scope
+        finally:
+            _current_scope.reset(token)
+            scope.close()
+
+    @classmethod
+    def in_scope(cls) -> bool:
+        """当前线程 / 异步任务上下文是否处于依赖作用域内"""
+        return _current_scope.get() is not None
+
     @classmethod
     def reset(cls):
         """重置容器(测试用)"""
-        cls._registry.clear()
-        cls._instances.clear()
+        with cls._lock:
+            cls._registry.clear()
+            cls._instances.clear()
+            cls._aliases.clear()
+            cls._injection_plans.clear()
 
 
 class DependencyError(Exception):
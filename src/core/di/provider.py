@@ -1,21 +1,52 @@
-from .container import DependencyContainer
+from .container import DependencyContainer, Lifetime
 from typing import Dict, Type, Any, Callable
 
 
 class DependencyProvider:
     """提供依赖注入的便捷访问方法"""
 
-    @staticmethod
-    def get(interface: Type) -> Any:
-        """获取依赖实例"""
-        return DependencyContainer.resolve(interface)
+    # 获取依赖实例: 直接绑定容器的 resolve (已创建的单例走其快速路径)，不再多包一层调用
+    get = staticmethod(DependencyContainer.resolve)
 
     @staticmethod
     def register(interface: Type, implementation: Type | Callable, singleton=True):
         """注册依赖"""
         DependencyContainer.register(interface, implementation, singleton)
 
+    @staticmethod
+    def register_scoped(interface: Type | str, implementation: Type | Callable | str):
+        """注册作用域依赖 (每个作用域一个实例，implementation 为 "模块路径:类名" 时首次获取才导入)"""
+        if isinstance(implementation, str):
+            DependencyContainer.register_lazy(interface, implementation, lifetime=Lifetime.SCOPED)
+        else:
+            DependencyContainer.register(interface, implementation, lifetime=Lifetime.SCOPED)
+
+    @staticmethod
+    def register_lazy(interface: Type | str, target: str = None, singleton=True):
+        """延迟注册依赖 (首次获取时才导入实现模块，target 为空时实现即接口本身)"""
+        DependencyContainer.register_lazy(interface, target, singleton)
+
     @staticmethod
     def register_instance(interface: Type, instance: Any):
         """直接注册实例"""
         DependencyContainer.register(interface, lambda: instance, singleton=True)
+
+    @staticmethod
+    def is_registered(interface: Type | str) -> bool:
+        """是否已注册"""
+        return DependencyContainer.is_registered(interface)
+
+    @staticmethod
+    def create(implementation: Type, **kwargs) -> Any:
+        """创建实例，构造函数参数按类型注解自动注入"""
+        return DependencyContainer.create(implementation, **kwargs)
+
+    @staticmethod
+    def scope():
+        """进入新的依赖作用域 (上下文管理器)"""
+        return DependencyContainer.scope()
+
+    @staticmethod
+    def in_scope() -> bool:
+        """是否处于依赖作用域内"""
+        return DependencyContainer.in_scope()
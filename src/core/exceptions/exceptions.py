@@ -29,6 +29,16 @@ class RegistryPermissionError(RegistryOperationError):
     pass
 
 
+class RegistryDataError(RegistryOperationError):
+    """注册表值的数据与修改规则不符异常 (如数据长度不足)"""
+    pass
+
+
+class PatchRuleError(Exception):
+    """修改规则定义错误异常"""
+    pass
+
+
 class GameShortcutError(Exception):
     """游戏快捷方式服务异常基类"""
     pass
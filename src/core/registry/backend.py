@@ -0,0 +1,261 @@
+"""
+注册表后端接口
+定义与平台无关的注册表访问接口及常量
+"""
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# 根键常量 (与 winreg 中的取值一致)
+HKEY_CLASSES_ROOT = 0x80000000
+HKEY_CURRENT_USER = 0x80000001
+HKEY_LOCAL_MACHINE = 0x80000002
+HKEY_USERS = 0x80000003
+
+# 值类型常量 (与 winreg 中的取值一致)
+REG_NONE = 0
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_MULTI_SZ = 7
+REG_QWORD = 11
+
+ROOT_KEY_NAMES = {
+    HKEY_CLASSES_ROOT: "HKEY_CLASSES_ROOT",
+    HKEY_CURRENT_USER: "HKEY_CURRENT_USER",
+    HKEY_LOCAL_MACHINE: "HKEY_LOCAL_MACHINE",
+    HKEY_USERS: "HKEY_USERS",
+}
+
+# 快照中的单个值 (data 的表示方式与 winreg 一致)
+RegistryValue = namedtuple("RegistryValue", ["name", "value_type", "data"])
+
+
+def decode_raw_value(value_type, data: bytes):
+    """将原始字节转换为与 winreg 一致的值表示"""
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        return data.decode("utf-16-le").split("\0", 1)[0]
+    if value_type == REG_MULTI_SZ:
+        return [item for item in data.decode("utf-16-le").split("\0") if item]
+    if value_type == REG_DWORD and len(data) == 4:
+        return int.from_bytes(data, "little")
+    if value_type == REG_QWORD and len(data) == 8:
+        return int.from_bytes(data, "little")
+    return data
+
+
+def encode_raw_value(value_type, value) -> bytes:
+    """将与 winreg 一致的值表示转换为原始字节 (decode_raw_value 的逆操作)"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        return (value + "\0").encode("utf-16-le")
+    if value_type == REG_MULTI_SZ:
+        return ("".join(item + "\0" for item in value) + "\0").encode("utf-16-le")
+    if value_type == REG_DWORD:
+        return value.to_bytes(4, "little")
+    if value_type == REG_QWORD:
+        return value.to_bytes(8, "little")
+    raise ValueError(f"不支持的值类型: {value_type}")
+
+
+def format_key_path(root_key, sub_key):
+    """格式化注册表完整路径，如 HKEY_CURRENT_USER\\SOFTWARE\\..."""
+    return f"{ROOT_KEY_NAMES.get(root_key, hex(root_key))}\\{sub_key}"
+
+
+class PollingChangeNotifier:
+    """
+    轮询式变化通知 (无原生通知机制的后端使用)
+
+    按固定间隔比较路径的 key_info (后端无法提供时比较完整快照)，间隔期间休眠。
+    """
+
+    def __init__(self, backend, root_key, sub_key, interval=1.0):
+        self.backend = backend
+        self.root_key = root_key
+        self.sub_key = sub_key
+        self.interval = interval
+        self._state = self._read_state()
+
+    def _read_state(self):
+        self.backend.refresh()
+        info = self.backend.key_info(self.root_key, self.sub_key)
+        if info is not None:
+            return info
+        return self.backend.snapshot_values(self.root_key, self.sub_key)
+
+    def wait(self, timeout):
+        """
+        等待值变化
+
+        参数:
+            timeout: 最长等待秒数
+
+        返回:
+            bool: 超时前发生变化返回True
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self._read_state()
+            if state != self._state:
+                self._state = state
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class RegistryBackend:
+    """
+    注册表访问后端基类
+
+    值的表示方式与 winreg 保持一致:
+    REG_DWORD/REG_QWORD 为 int, REG_SZ 为 str, REG_BINARY 为 bytes。
+    路径不存在时抛出 FileNotFoundError，其余失败抛出 OSError。
+    """
+
+    # 后端名称 (用于日志)
+    name = "base"
+    # 数据来源标识 (文件类后端为文件路径)，与名称一起区分不同的注册表内容
+    source = ""
+
+    def enum_value_names(self, root_key, sub_key):
+        """
+        枚举指定路径下的所有值名称
+
+        返回:
+            list: 值名称列表
+        """
+        raise NotImplementedError("子类必须实现此方法")
+
+    def snapshot_values(self, root_key, sub_key):
+        """
+        单次枚举读取指定路径下所有值的名称、类型和数据
+
+        返回:
+            list: RegistryValue 列表
+        """
+        return [
+            RegistryValue(name, value_type, data)
+            for name in self.enum_value_names(root_key, sub_key)
+            for data, value_type in (self.query_value(root_key, sub_key, name),)
+        ]
+
+    def key_info(self, root_key, sub_key):
+        """
+        获取路径的统计信息，用于低成本判断内容是否发生变化
+
+        返回:
+            dict: values (值数量) / max_name_len (最长值名称) / last_write (最后写入标记)，
+                  后端无法提供时返回None
+        """
+        return None
+
+    def query_value(self, root_key, sub_key, value_name):
+        """
+        读取指定值
+
+        返回:
+            tuple: (值, 值类型)
+        """
+        raise NotImplementedError("子类必须实现此方法")
+
+    def set_value(self, root_key, sub_key, value_name, value_type, value):
+        """写入指定值"""
+        raise NotImplementedError("子类必须实现此方法")
+
+    def read_binary(self, root_key, sub_key, value_name):
+        """
+        读取键值的原始二进制数据
+
+        返回:
+            bytes: 二进制数据，读取失败返回None
+        """
+        raise NotImplementedError("子类必须实现此方法")
+
+    def write_binary(self, root_key, sub_key, value_name, data):
+        """
+        写入二进制数据 (REG_BINARY)
+
+        返回:
+            bool: 写入是否成功
+        """
+        raise NotImplementedError("子类必须实现此方法")
+
+    def write_values(self, root_key, sub_key, items):
+        """
+        在同一会话中批量写入多个值
+
+        参数:
+            items: 可迭代的 (值名称, 值类型, 值)
+
+        返回:
+            list: 写入失败的 (值名称, OSError) 列表
+        """
+        failures = []
+        with self.session():
+            for value_name, value_type, value in items:
+                try:
+                    if value_type == REG_BINARY:
+                        if not self.write_binary(root_key, sub_key, value_name, value):
+                            raise OSError("注册表写入失败")
+                    else:
+                        self.set_value(root_key, sub_key, value_name, value_type, value)
+                except OSError as e:
+                    failures.append((value_name, e))
+        return failures
+
+    @contextmanager
+    def session(self):
+        """
+        处理会话: 会话期间可复用底层资源 (如已打开的注册表句柄)
+
+        返回:
+            上下文管理器，产出会话使用的句柄池 (无句柄概念的后端产出None)
+        """
+        yield None
+
+    def call_stats(self):
+        """
+        底层API调用统计
+
+        返回:
+            dict: API名称 -> (调用次数, 累计耗时纳秒)，后端无法提供时返回None
+        """
+        return None
+
+    def flush(self):
+        """提交挂起的修改 (文件类后端在此写回磁盘)"""
+        pass
+
+    def refresh(self):
+        """重新加载外部修改 (文件类后端在此检查并重新读取磁盘内容)"""
+        pass
+
+    def close(self):
+        """释放后端占用的资源 (如映射的文件)，之后不应再使用该后端"""
+        pass
+
+    def notifier(self, root_key, sub_key, poll_interval=1.0):
+        """
+        订阅路径下值的变化
+
+        参数:
+            poll_interval: 无原生通知机制时的轮询间隔 (秒)
+
+        返回:
+            具有 wait(timeout) / close() 的通知对象 (可用作上下文管理器)
+        """
+        return PollingChangeNotifier(self, root_key, sub_key, poll_interval)
@@ -0,0 +1,423 @@
+"""
+regf 注册表配置单元 (hive) 读写工具
+以内存映射方式打开离线的 NTUSER.DAT 等配置单元文件，按 nk/vk 单元索引逐级定位，
+不加载整个文件；支持在值大小不变时原地修改数据并更新校验和 (可在非Windows环境下使用)
+
+文件结构:
+    基本块 (4096字节): 签名 "regf"、主/次序列号、时间戳、根键单元偏移、hbin数据大小、校验和
+    hbin 数据区: 由单元 (cell) 组成，单元偏移相对于基本块末尾，单元大小为负数表示已分配
+    nk 单元: 注册表键 (子键列表、值列表)
+    vk 单元: 注册表值 (名称、类型、数据位置)
+    lf/lh/li/ri 单元: 子键列表；db 单元: 大数据 (超过 16344 字节) 的分段列表
+"""
+import errno
+import mmap
+import struct
+import threading
+import time
+
+from src.core.exceptions.exceptions import RegistryDataError
+
+BASE_BLOCK_SIZE = 4096
+REGF_SIGNATURE = b"regf"
+
+# 基本块中各字段的偏移
+_SEQUENCE_PRIMARY = 4
+_SEQUENCE_SECONDARY = 8
+_TIMESTAMP = 12
+_CHECKSUM = 508
+
+_BASE_BLOCK = struct.Struct("<4sIIQIIIIII")  # 签名 ~ hbin数据大小
+_INT32 = struct.Struct("<i")
+_UINT32 = struct.Struct("<I")
+_UINT64 = struct.Struct("<Q")
+_CHECKSUM_WORDS = struct.Struct("<127I")
+
+# nk 单元 (不含单元大小): 签名、标志、时间戳、… 、键名称长度、类名称长度
+_NK = struct.Struct("<2sHQ15IHH")
+_NK_TIMESTAMP = 4
+_NK_ASCII_NAME = 0x0020
+
+# vk 单元 (不含单元大小): 签名、名称长度、数据大小、数据偏移、值类型、标志、保留
+_VK = struct.Struct("<2sHIIIHH")
+_VK_TYPE = 12
+_VK_ASCII_NAME = 0x0001
+# 数据大小最高位: 数据直接保存在数据偏移字段中 (不超过4字节)
+_VK_DATA_INLINE = 0x80000000
+
+_LIST_HEADER = struct.Struct("<2sH")
+_DB = struct.Struct("<2sHI")
+# 大数据分段的最大长度
+BIG_DATA_SEGMENT = 16344
+
+# FILETIME 纪元 (1601-01-01) 与 Unix 纪元之间的100纳秒间隔数
+_FILETIME_EPOCH = 116444736000000000
+
+
+class HiveFormatError(RegistryDataError, ValueError):
+    """配置单元文件格式错误"""
+
+    def __init__(self, message, offset=None):
+        self.offset = offset
+        super().__init__(f"{message} (偏移 0x{offset:X})" if offset is not None else message)
+
+    def __str__(self):
+        # 格式错误与具体的注册表路径、值无关，只输出错误描述
+        return self.message
+
+
+def filetime_now():
+    """当前时间的 FILETIME 表示"""
+    return time.time_ns() // 100 + _FILETIME_EPOCH
+
+
+def base_block_checksum(block) -> int:
+    """基本块校验和: 前127个DWORD的异或 (0xFFFFFFFF 记为 0xFFFFFFFE，0 记为 1)"""
+    checksum = 0
+    for word in _CHECKSUM_WORDS.unpack_from(block, 0):
+        checksum ^= word
+    if checksum == 0xFFFFFFFF:
+        return 0xFFFFFFFE
+    return checksum or 1
+
+
+def name_hash(name) -> int:
+    """lh 子键列表使用的名称哈希"""
+    value = 0
+    for char in name:
+        # 按字符转大写 (与 Windows 一致，不展开为多个字符)
+        upper = char.upper()
+        value = (value * 37 + ord(upper if len(upper) == 1 else char)) & 0xFFFFFFFF
+    return value
+
+
+class HiveValue:
+    """vk 单元中的值记录 (数据按需读取)"""
+
+    __slots__ = ("name", "value_type", "size", "offset")
+
+    def __init__(self, name, value_type, size, offset):
+        self.name = name
+        self.value_type = value_type
+        # 数据大小 (含内联标志位)
+        self.size = size
+        # vk 单元数据的文件偏移
+        self.offset = offset
+
+
+class Hive:
+    """
+    regf 配置单元
+
+    文件通过 mmap 映射，读取时只访问路径上的单元，内存占用与文件大小无关。
+    修改只在原位置覆盖数据 (大小必须不变)；首次修改前递增主序列号，flush 时写回数据后再更新次序列号，
+    与 Windows 的写入顺序一致。
+    """
+
+    def __init__(self, path, writable=False):
+        """
+        打开配置单元
+
+        参数:
+            path: 配置单元文件路径 (如 NTUSER.DAT)
+            writable: 是否允许修改
+        """
+        self.path = path
+        self.writable = writable
+        self._file = open(path, "r+b" if writable else "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise HiveFormatError(f"配置单元文件为空: {path}")
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._read_base_block()
+        except Exception:
+            self.close()
+            raise
+        # 小写子路径 -> nk 单元的文件偏移
+        self._key_cache = {}
+        # nk 单元的文件偏移 -> {值名称: HiveValue}
+        self._value_cache = {}
+
+    def _read_base_block(self):
+        if len(self._map) < BASE_BLOCK_SIZE:
+            raise HiveFormatError("文件长度不足一个基本块")
+        (signature, primary, secondary, _, major, minor, _, _,
+         root_offset, data_size) = _BASE_BLOCK.unpack_from(self._map, 0)
+        if signature != REGF_SIGNATURE:
+            raise HiveFormatError("不是有效的配置单元文件 (缺少 regf 签名)", 0)
+        if major != 1:
+            raise HiveFormatError(f"不支持的配置单元版本: {major}.{minor}")
+        if base_block_checksum(self._map[:BASE_BLOCK_SIZE]) != _UINT32.unpack_from(self._map, _CHECKSUM)[0]:
+            raise HiveFormatError("基本块校验和错误", _CHECKSUM)
+        self.minor_version = minor
+        self.sequence = (primary, secondary)
+        # 数据区末尾 (不超过文件长度)
+        self._data_end = min(BASE_BLOCK_SIZE + data_size, len(self._map))
+        self.root = self._cell(root_offset, b"nk")
+
+    @property
+    def pending_log(self):
+        """主/次序列号不一致: 上次写入未完成，需要先用事务日志恢复"""
+        return self.sequence[0] != self.sequence[1]
+
+    def refresh(self):
+        """文件被其他程序修改 (序列号变化) 且没有挂起的修改时，清空缓存的单元位置"""
+        if not self._dirty and _BASE_BLOCK.unpack_from(self._map, 0)[1:3] != self.sequence:
+            self._read_base_block()
+            self._key_cache.clear()
+            self._value_cache.clear()
+
+    def close(self):
+        """关闭映射和文件 (不写回挂起的修改)"""
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        self.close()
+
+    # ---- 单元访问 ----
+
+    def _cell(self, offset, signature=None):
+        """
+        定位单元数据
+
+        参数:
+            offset: 相对数据区的单元偏移
+            signature: 期望的单元签名
+
+        返回:
+            int: 单元数据 (不含单元大小) 的文件偏移
+        """
+        position = BASE_BLOCK_SIZE + offset
+        if offset == 0xFFFFFFFF or position + 4 > self._data_end:
+            raise HiveFormatError("单元偏移超出数据区", offset)
+        size = _INT32.unpack_from(self._map, position)[0]
+        if size >= 0 or position - size > self._data_end:
+            raise HiveFormatError("单元未分配或大小无效", offset)
+        if signature is not None and self._map[position + 4:position + 6] != signature:
+            raise HiveFormatError(f"单元签名不符: 期望 {signature.decode()}", offset)
+        return position + 4
+
+    def _cell_size(self, position):
+        """单元数据的可用长度"""
+        return -_INT32.unpack_from(self._map, position - 4)[0] - 4
+
+    def _subkeys(self, list_offset):
+        """
+        遍历子键列表
+
+        返回:
+            生成器，产出 (子键 nk 单元的相对偏移, 名称哈希)，非 lh 列表的哈希为None
+        """
+        position = self._cell(list_offset)
+        signature, count = _LIST_HEADER.unpack_from(self._map, position)
+        position += 4
+        if signature in (b"lf", b"lh"):
+            entries = struct.unpack_from(f"<{count * 2}I", self._map, position)
+            hashed = signature == b"lh"
+            for index in range(0, count * 2, 2):
+                yield entries[index], entries[index + 1] if hashed else None
+        elif signature == b"li":
+            for offset in struct.unpack_from(f"<{count}I", self._map, position):
+                yield offset, None
+        elif signature == b"ri":
+            for offset in struct.unpack_from(f"<{count}I", self._map, position):
+                yield from self._subkeys(offset)
+        else:
+            raise HiveFormatError(f"未知的子键列表类型: {signature!r}", list_offset)
+
+    def _key_name(self, position):
+        """nk 单元中的键名称"""
+        fields = _NK.unpack_from(self._map, position)
+        flags, name_length = fields[1], fields[-2]
+        raw = self._map[position + _NK.size:position + _NK.size + name_length]
+        return raw.decode("latin-1") if flags & _NK_ASCII_NAME else raw.decode("utf-16-le")
+
+    def _find_subkey(self, position, name):
+        """在键的子键中查找名称 (不区分大小写)，不存在时返回None"""
+        fields = _NK.unpack_from(self._map, position)
+        subkey_count, subkey_list = fields[5], fields[7]
+        if not subkey_count:
+            return None
+        wanted, wanted_hash = name.lower(), name_hash(name)
+        for offset, hint in self._subkeys(subkey_list):
+            # lh 列表先比较名称哈希，避免解析不相关的子键
+            if hint is not None and hint != wanted_hash:
+                continue
+            subkey = self._cell(offset, b"nk")
+            if self._key_name(subkey).lower() == wanted:
+                return subkey
+        return None
+
+    def open_key(self, sub_key):
+        """
+        按路径定位键 (结果按路径缓存)
+
+        参数:
+            sub_key: 相对配置单元根键的路径，如 SOFTWARE\\Tencent
+
+        返回:
+            int: nk 单元的文件偏移，路径不存在时抛出 FileNotFoundError
+        """
+        key_id = sub_key.strip("\\").lower()
+        position = self._key_cache.get(key_id)
+        if position is None:
+            position = self.root
+            for part in filter(None, key_id.split("\\")):
+                position = self._find_subkey(position, part)
+                if position is None:
+                    raise FileNotFoundError(errno.ENOENT, "注册表路径不存在", sub_key)
+            self._key_cache[key_id] = position
+        return position
+
+    def key_timestamp(self, position) -> int:
+        """键的最后写入时间 (FILETIME)"""
+        return _UINT64.unpack_from(self._map, position + _NK_TIMESTAMP)[0]
+
+    def values(self, position):
+        """
+        键下的所有值 (按 vk 单元解析一次后缓存)
+
+        返回:
+            dict: 值名称 -> HiveValue (保持值列表顺序)
+        """
+        values = self._value_cache.get(position)
+        if values is not None:
+            return values
+
+        fields = _NK.unpack_from(self._map, position)
+        value_count, value_list = fields[9], fields[10]
+        values = {}
+        if value_count:
+            list_position = self._cell(value_list)
+            if value_count * 4 > self._cell_size(list_position):
+                raise HiveFormatError("值列表长度超出单元大小", value_list)
+            unpack_vk = _VK.unpack_from
+            data = self._map
+            for offset in struct.unpack_from(f"<{value_count}I", data, list_position):
+                vk = self._cell(offset, b"vk")
+                _, name_length, size, _, value_type, flags, _ = unpack_vk(data, vk)
+                raw = data[vk + _VK.size:vk + _VK.size + name_length]
+                name = raw.decode("latin-1") if flags & _VK_ASCII_NAME else raw.decode("utf-16-le")
+                values[name] = HiveValue(name, value_type, size, vk)
+        self._value_cache[position] = values
+        return values
+
+    def get_value(self, position, value_name):
+        """按名称获取值记录 (不区分大小写)，不存在时抛出 FileNotFoundError"""
+        values = self.values(position)
+        value = values.get(value_name)
+        if value is None:
+            wanted = value_name.lower()
+            value = next((item for name, item in values.items() if name.lower() == wanted), None)
+            if value is None:
+                raise FileNotFoundError(errno.ENOENT, "注册表值不存在", value_name)
+        return value
+
+    # ---- 值数据 ----
+
+    def _data_spans(self, value):
+        """
+        值数据在文件中的位置
+
+        返回:
+            list: (文件偏移, 长度) 列表 (大数据按分段顺序)
+        """
+        size = value.size
+        if size & _VK_DATA_INLINE:
+            return [(value.offset + 8, min(size & ~_VK_DATA_INLINE, 4))]
+        if not size:
+            return []
+        data_offset = _UINT32.unpack_from(self._map, value.offset + 8)[0]
+        position = self._cell(data_offset)
+        if size > BIG_DATA_SEGMENT and self.minor_version >= 4 and self._map[position:position + 2] == b"db":
+            _, count, segments = _DB.unpack_from(self._map, position)
+            segment_list = self._cell(segments)
+            spans = []
+            remaining = size
+            for offset in struct.unpack_from(f"<{count}I", self._map, segment_list):
+                length = min(remaining, BIG_DATA_SEGMENT)
+                spans.append((self._cell(offset), length))
+                remaining -= length
+                if remaining <= 0:
+                    break
+            return spans
+        if size > self._cell_size(position):
+            raise HiveFormatError("值数据超出单元大小", data_offset)
+        return [(position, size)]
+
+    def read_data(self, value) -> bytes:
+        """读取值的原始数据"""
+        data = self._map
+        return b"".join(data[position:position + length] for position, length in self._data_spans(value))
+
+    def write_data(self, key_position, value, data, value_type=None):
+        """
+        原地覆盖值的数据 (数据长度必须与原数据相同)
+
+        参数:
+            key_position: 值所属键的 nk 单元偏移 (用于更新键的最后写入时间)
+            value: HiveValue
+            data: 新数据
+            value_type: 新的值类型 (为空时保持不变)
+        """
+        if not self.writable:
+            raise PermissionError(errno.EACCES, "配置单元以只读方式打开", self.path)
+        if self.pending_log:
+            raise OSError(errno.EBUSY, "配置单元存在未应用的事务日志，请先在Windows中加载一次", self.path)
+        spans = self._data_spans(value)
+        if sum(length for _, length in spans) != len(data):
+            raise OSError(errno.EINVAL, f"无法原地修改: 数据长度由 {sum(length for _, length in spans)} "
+                                        f"变为 {len(data)}", value.name)
+        with self._lock:
+            if not self._dirty:
+                self._begin_write()
+            start = 0
+            for position, length in spans:
+                self._map[position:position + length] = data[start:start + length]
+                start += length
+            if value_type is not None and value_type != value.value_type:
+                _UINT32.pack_into(self._map, value.offset + _VK_TYPE, value_type)
+                value.value_type = value_type
+            _UINT64.pack_into(self._map, key_position + _NK_TIMESTAMP, filetime_now())
+
+    def _update_base_block(self, offset, sequence):
+        """写入序列号、时间戳和校验和，并将基本块写回磁盘"""
+        data = self._map
+        _UINT32.pack_into(data, offset, sequence)
+        _UINT64.pack_into(data, _TIMESTAMP, filetime_now())
+        _UINT32.pack_into(data, _CHECKSUM, base_block_checksum(data[:BASE_BLOCK_SIZE]))
+        data.flush(0, BASE_BLOCK_SIZE)
+
+    def _begin_write(self):
+        """
+        开始修改: 先递增主序列号并写回基本块，再覆盖数据
+
+        修改过程中中断时主/次序列号不一致，Windows 加载时会将配置单元视为未完成写入。
+        """
+        self._update_base_block(_SEQUENCE_PRIMARY, (self.sequence[0] + 1) & 0xFFFFFFFF)
+        self._dirty = True
+
+    def flush(self):
+        """提交修改: 先将数据写回磁盘，再把次序列号更新为主序列号并写回基本块"""
+        if not self._dirty:
+            return
+        with self._lock:
+            self._map.flush()
+            sequence = _UINT32.unpack_from(self._map, _SEQUENCE_PRIMARY)[0]
+            self._update_base_block(_SEQUENCE_SECONDARY, sequence)
+            self.sequence = (sequence, sequence)
+            self._dirty = False
+
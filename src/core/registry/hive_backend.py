@@ -0,0 +1,103 @@
+"""
+离线配置单元注册表后端
+直接读写离线用户配置文件中的 NTUSER.DAT (regf 格式)，用于网吧/批量镜像的预配置
+"""
+import errno
+import os
+
+from .backend import RegistryBackend, RegistryValue, HKEY_CURRENT_USER, REG_BINARY, \
+    decode_raw_value, encode_raw_value, format_key_path
+from .hive import Hive
+
+
+class HiveRegistryBackend(RegistryBackend):
+    """
+    基于 regf 配置单元文件的注册表后端
+
+    配置单元的根键映射为指定的根键 (NTUSER.DAT 对应 HKEY_CURRENT_USER)。
+    只支持原地修改: 写入的数据长度必须与原值相同，否则抛出 OSError。
+    """
+
+    name = "hive"
+
+    def __init__(self, path, root_key=HKEY_CURRENT_USER, writable=True):
+        """
+        初始化后端
+
+        参数:
+            path: 配置单元文件路径
+            root_key: 配置单元根键对应的注册表根键
+            writable: 是否允许修改
+        """
+        self.path = path
+        self.source = os.path.abspath(path)
+        self.root_key = root_key
+        try:
+            self.hive = Hive(path, writable)
+        except FileNotFoundError:
+            raise FileNotFoundError(errno.ENOENT, "配置单元文件不存在", self.source)
+
+    def _key(self, root_key, sub_key):
+        """定位路径对应的 nk 单元，路径不存在时抛出 FileNotFoundError"""
+        if root_key != self.root_key:
+            raise FileNotFoundError(errno.ENOENT, "配置单元中不包含该根键", format_key_path(root_key, sub_key))
+        try:
+            return self.hive.open_key(sub_key)
+        except FileNotFoundError:
+            raise FileNotFoundError(errno.ENOENT, "注册表路径不存在", format_key_path(root_key, sub_key))
+
+    def enum_value_names(self, root_key, sub_key):
+        return list(self.hive.values(self._key(root_key, sub_key)))
+
+    def snapshot_values(self, root_key, sub_key):
+        read_data = self.hive.read_data
+        return [
+            RegistryValue(name, value.value_type, decode_raw_value(value.value_type, read_data(value)))
+            for name, value in self.hive.values(self._key(root_key, sub_key)).items()
+        ]
+
+    def key_info(self, root_key, sub_key):
+        key = self._key(root_key, sub_key)
+        values = self.hive.values(key)
+        return {
+            'values': len(values),
+            'max_name_len': max(map(len, values), default=0),
+            'last_write': self.hive.key_timestamp(key),
+        }
+
+    def query_value(self, root_key, sub_key, value_name):
+        value = self.hive.get_value(self._key(root_key, sub_key), value_name)
+        return decode_raw_value(value.value_type, self.hive.read_data(value)), value.value_type
+
+    def set_value(self, root_key, sub_key, value_name, value_type, value):
+        key = self._key(root_key, sub_key)
+        try:
+            data = encode_raw_value(value_type, value)
+        except (ValueError, OverflowError, AttributeError) as e:
+            raise OSError(errno.EINVAL, f"无法编码注册表值: {str(e)}", value_name)
+        self.hive.write_data(key, self.hive.get_value(key, value_name), data, value_type)
+
+    def read_binary(self, root_key, sub_key, value_name):
+        try:
+            value = self.hive.get_value(self._key(root_key, sub_key), value_name)
+            return self.hive.read_data(value)
+        except OSError:
+            return None
+
+    def write_binary(self, root_key, sub_key, value_name, data):
+        try:
+            self.set_value(root_key, sub_key, value_name, REG_BINARY, bytes(data))
+        except OSError:
+            return False
+        return True
+
+    def flush(self):
+        self.hive.flush()
+
+    def refresh(self):
+        self.hive.refresh()
+
+    def close(self):
+        """提交挂起的修改并关闭配置单元文件"""
+        self.hive.flush()
+        self.hive.close()
@@ -0,0 +1,95 @@
+"""
+内存注册表后端
+以字典模拟注册表，可在非Windows环境下进行基准测试和压力测试
+"""
+import errno
+import threading
+
+from .backend import RegistryBackend, RegistryValue, REG_BINARY, format_key_path
+
+
+class MemoryRegistryBackend(RegistryBackend):
+    """基于字典的内存注册表后端"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (根键, 小写子路径) -> {值名称: (值类型, 值)}
+        self._keys = {}
+        # (根键, 小写子路径) -> 创建时的原始子路径
+        self._paths = {}
+        # 写入计数，作为 key_info 中的最后写入标记
+        self._writes = 0
+
+    @staticmethod
+    def _key_id(root_key, sub_key):
+        """注册表路径不区分大小写"""
+        return root_key, sub_key.lower()
+
+    def _get_key(self, root_key, sub_key):
+        """获取路径对应的值字典，路径不存在时抛出 FileNotFoundError"""
+        values = self._keys.get(self._key_id(root_key, sub_key))
+        if values is None:
+            raise FileNotFoundError(errno.ENOENT, "注册表路径不存在", format_key_path(root_key, sub_key))
+        return values
+
+    def create_key(self, root_key, sub_key):
+        """
+        创建路径 (已存在则直接返回)
+
+        返回:
+            dict: 路径对应的值字典
+        """
+        key_id = self._key_id(root_key, sub_key)
+        self._paths.setdefault(key_id, sub_key)
+        return self._keys.setdefault(key_id, {})
+
+    def iter_keys(self):
+        """遍历所有路径，产出 (根键, 子路径, 值字典)"""
+        for key_id, values in self._keys.items():
+            yield key_id[0], self._paths[key_id], values
+
+    def enum_value_names(self, root_key, sub_key):
+        return list(self._get_key(root_key, sub_key))
+
+    def snapshot_values(self, root_key, sub_key):
+        return [
+            RegistryValue(name, value_type, value)
+            for name, (value_type, value) in self._get_key(root_key, sub_key).items()
+        ]
+
+    def key_info(self, root_key, sub_key):
+        values = self._get_key(root_key, sub_key)
+        return {
+            'values': len(values),
+            'max_name_len': max(map(len, values), default=0),
+            'last_write': self._writes,
+        }
+
+    def query_value(self, root_key, sub_key, value_name):
+        values = self._get_key(root_key, sub_key)
+        if value_name not in values:
+            raise FileNotFoundError(errno.ENOENT, "注册表值不存在", value_name)
+        value_type, value = values[value_name]
+        return value, value_type
+
+    def set_value(self, root_key, sub_key, value_name, value_type, value):
+        values = self._get_key(root_key, sub_key)
+        with self._lock:
+            values[value_name] = (value_type, value)
+            self._writes += 1
+
+    def read_binary(self, root_key, sub_key, value_name):
+        try:
+            value, _ = self.query_value(root_key, sub_key, value_name)
+        except OSError:
+            return None
+        return bytes(value) if isinstance(value, (bytes, bytearray)) else None
+
+    def write_binary(self, root_key, sub_key, value_name, data):
+        try:
+            self.set_value(root_key, sub_key, value_name, REG_BINARY, bytes(data))
+        except OSError:
+            return False
+        return True
@@ -0,0 +1,423 @@
+"""
+.reg 导出文件读写工具
+支持 regedit 导出的 "Windows Registry Editor Version 5.00" (UTF-16) 与 REGEDIT4 格式，
+按行流式解析与写出，内存占用与文件大小无关
+"""
+import codecs
+import io
+import re
+from collections import namedtuple
+
+from .backend import (
+    HKEY_CLASSES_ROOT, HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE, HKEY_USERS,
+    REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD, REG_MULTI_SZ, REG_QWORD,
+    ROOT_KEY_NAMES, decode_raw_value,
+)
+
+REG_FILE_HEADER = "Windows Registry Editor Version 5.00"
+
+# 根键名称 (含缩写) -> 根键常量
+ROOT_KEYS_BY_NAME = {
+    "HKEY_CLASSES_ROOT": HKEY_CLASSES_ROOT,
+    "HKCR": HKEY_CLASSES_ROOT,
+    "HKEY_CURRENT_USER": HKEY_CURRENT_USER,
+    "HKCU": HKEY_CURRENT_USER,
+    "HKEY_LOCAL_MACHINE": HKEY_LOCAL_MACHINE,
+    "HKLM": HKEY_LOCAL_MACHINE,
+    "HKEY_USERS": HKEY_USERS,
+    "HKU": HKEY_USERS,
+}
+
+# regedit 导出时每行的最大宽度
+LINE_WIDTH = 80
+
+# 双引号字符串 (反斜杠转义) 与转义序列
+_QUOTED = re.compile(r'"((?:[^"\\]|\\.)*)"', re.S)
+_UNESCAPE = re.compile(r"\\(.)", re.S)
+
+# 流式读写的单条记录: 键路径记录的 name / value_type / value 为 None
+RegEntry = namedtuple("RegEntry", ["root_key", "sub_key", "name", "value_type", "value"])
+
+
+class RegFileFormatError(ValueError):
+    """.reg 文件格式错误"""
+
+    def __init__(self, message, line_number=None):
+        self.line_number = line_number
+        super().__init__(f"{message} (行 {line_number})" if line_number else message)
+
+
+def decode_reg_bytes(raw: bytes) -> str:
+    """按BOM解码 .reg 文件内容 (无BOM时按UTF-8处理)"""
+    if raw.startswith(codecs.BOM_UTF16_LE) or raw.startswith(codecs.BOM_UTF16_BE):
+        return raw.decode("utf-16")
+    return raw.decode("utf-8-sig")
+
+
+def split_key_path(path: str):
+    """
+    拆分完整路径为根键和子路径
+
+    返回:
+        tuple: (根键常量, 子路径)
+    """
+    root_name, _, sub_key = path.partition("\\")
+    root_key = ROOT_KEYS_BY_NAME.get(root_name.upper())
+    if root_key is None:
+        raise RegFileFormatError(f"未知的根键: {root_name}")
+    return root_key, sub_key
+
+
+def _parse_quoted(text: str, start: int):
+    """
+    解析从 start 处 (双引号) 开始的转义字符串
+
+    返回:
+        tuple: (字符串内容, 结束引号之后的位置)
+    """
+    match = _QUOTED.match(text, start)
+    if match is None:
+        raise RegFileFormatError("字符串缺少结束引号")
+    value = match.group(1)
+    if "\\" in value:
+        value = _UNESCAPE.sub(r"\1", value)
+    return value, match.end()
+
+
+def _parse_hex(text: str) -> bytes:
+    """解析一行 hex 数据 ("01,02,..."，不含续行符)"""
+    return bytes.fromhex(text.replace(",", " "))
+
+
+def _hex_type(prefix: str) -> int:
+    """hex / hex(n) 前缀对应的值类型"""
+    if prefix.lower() == "hex":
+        return REG_BINARY
+    return int(prefix[prefix.index("(") + 1:prefix.index(")")], 16)
+
+
+def parse_value(text: str):
+    """
+    解析等号右侧的值文本
+
+    返回:
+        tuple: (值类型, 值)，删除标记 "-" 返回 None
+    """
+    if text == "-":
+        return None
+    if text.startswith('"'):
+        value, _ = _parse_quoted(text, 0)
+        return REG_SZ, value
+    if text.lower().startswith("dword:"):
+        return REG_DWORD, int(text[6:], 16)
+    if text.lower().startswith("hex"):
+        prefix, _, hex_text = text.partition(":")
+        value_type = _hex_type(prefix)
+        return value_type, decode_raw_value(value_type, _parse_hex(hex_text))
+    raise RegFileFormatError(f"无法识别的值: {text[:32]}")
+
+
+def open_reg_text(path):
+    """
+    以增量解码方式打开 .reg 文件
+
+    按BOM选择编码 (无BOM时按UTF-8处理)，返回逐块解码的文本流，不一次读入整个文件。
+    """
+    raw = open(path, "rb")
+    head = raw.read(len(codecs.BOM_UTF16_LE))
+    raw.seek(0)
+    if head in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        encoding = "utf-16"
+    else:
+        encoding = "utf-8-sig"
+    return io.TextIOWrapper(raw, encoding=encoding, newline=None)
+
+
+def iter_reg_lines(lines):
+    """
+    逐行解析 .reg 文本，产出 RegEntry
+
+    每个键路径先产出一条 name 为 None 的记录 (用于创建没有值的键)，随后是该键下的值。
+    hex 值的续行逐行解码后追加到字节缓冲区，不拼接整个值的文本。
+    删除标记 ([-路径] 与 "名称"=-) 不产出记录。
+
+    参数:
+        lines: 可迭代的文本行 (如文本流或 str.splitlines() 的结果)
+    """
+    current = None
+    # 跨行的值: [起始行号, 值名称, 值类型, 字节缓冲区] 或 [起始行号, 值名称, None, 文本片段]
+    pending = None
+    skipping = False
+    for line_number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if pending is not None or skipping:
+            continued = stripped.endswith("\\")
+            if continued:
+                stripped = stripped[:-1]
+            if skipping:
+                skipping = continued
+                continue
+            start_line, name, value_type, data = pending
+            try:
+                if value_type is None:
+                    data.append(stripped)
+                    if continued:
+                        continue
+                    parsed = parse_value("".join(data))
+                else:
+                    data += _parse_hex(stripped)
+                    if continued:
+                        continue
+                    parsed = value_type, decode_raw_value(value_type, bytes(data))
+            except (ValueError, IndexError) as e:
+                raise RegFileFormatError(f"解析失败: {str(e)}", start_line if value_type is None else line_number)
+            pending = None
+            if parsed is not None:
+                yield RegEntry(current[0], current[1], name, parsed[0], parsed[1])
+            continue
+
+        if not stripped or stripped[0] == ";" or stripped == REG_FILE_HEADER or stripped == "REGEDIT4":
+            continue
+        if stripped[0] == "[":
+            end = stripped.rfind("]")
+            if end < 0:
+                raise RegFileFormatError("键路径缺少结束括号", line_number)
+            path = stripped[1:end]
+            if path.startswith("-"):
+                # 删除路径的记录不参与加载
+                current = None
+                continue
+            try:
+                current = split_key_path(path)
+            except RegFileFormatError as e:
+                raise RegFileFormatError(str(e), line_number)
+            yield RegEntry(current[0], current[1], None, None, None)
+            continue
+        if current is None:
+            # 不属于任何键 (或属于删除路径) 的值，跳过其续行
+            skipping = stripped.endswith("\\")
+            continue
+
+        try:
+            if stripped[0] == "@":
+                name, end = "", 1
+            else:
+                name, end = _parse_quoted(stripped, 0)
+            if stripped[end] != "=":
+                raise ValueError("缺少等号")
+            text = stripped[end + 1:].strip()
+            if text.endswith("\\"):
+                prefix, _, hex_text = text[:-1].partition(":")
+                if prefix.lower().startswith("hex"):
+                    pending = [line_number, name, _hex_type(prefix), bytearray(_parse_hex(hex_text))]
+                else:
+                    pending = [line_number, name, None, [text[:-1]]]
+                continue
+            parsed = parse_value(text)
+        except (ValueError, IndexError) as e:
+            raise RegFileFormatError(f"解析失败: {str(e)}", line_number)
+        if parsed is not None:
+            yield RegEntry(current[0], current[1], name, parsed[0], parsed[1])
+
+    if pending is not None:
+        # 文件以续行符结束
+        start_line, name, value_type, data = pending
+        try:
+            if value_type is None:
+                parsed = parse_value("".join(data))
+            else:
+                parsed = value_type, decode_raw_value(value_type, bytes(data))
+        except (ValueError, IndexError) as e:
+            raise RegFileFormatError(f"解析失败: {str(e)}", start_line)
+        if parsed is not None:
+            yield RegEntry(current[0], current[1], name, parsed[0], parsed[1])
+
+
+def iter_reg_file(path):
+    """
+    流式读取 .reg 文件，产出 RegEntry (见 iter_reg_lines)
+
+    内存占用只与单个值的大小有关，与文件大小无关。
+    """
+    with open_reg_text(path) as stream:
+        yield from iter_reg_lines(stream)
+
+
+def _collect_keys(entries):
+    """将 RegEntry 序列汇总为 {(根键, 子路径): {值名称: (值类型, 值)}}"""
+    keys = {}
+    key = values = None
+    for entry in entries:
+        if (entry.root_key, entry.sub_key) != key:
+            key = entry.root_key, entry.sub_key
+            values = keys.setdefault(key, {})
+        if entry.name is not None:
+            values[entry.name] = (entry.value_type, entry.value)
+    return keys
+
+
+def parse_reg_text(text: str):
+    """
+    解析 .reg 文件文本
+
+    返回:
+        dict: {(根键, 子路径): {值名称: (值类型, 值)}}
+    """
+    return _collect_keys(iter_reg_lines(text.splitlines()))
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _encode_typed_data(value_type: int, value) -> bytes:
+    """将值转换为 hex(n) 形式所需的原始字节"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        return (value + "\0").encode("utf-16-le")
+    if value_type == REG_MULTI_SZ:
+        return ("".join(item + "\0" for item in value) + "\0").encode("utf-16-le")
+    if value_type == REG_DWORD:
+        return value.to_bytes(4, "little")
+    if value_type == REG_QWORD:
+        return value.to_bytes(8, "little")
+    raise RegFileFormatError(f"不支持的值类型: {value_type}")
+
+
+def _hex_lines(prefix: str, data: bytes):
+    """按 regedit 的方式逐行产出 hex 数据，超过行宽时以反斜杠续行"""
+    limit = LINE_WIDTH - 2
+    line = prefix
+    position, remaining = 0, len(data)
+    while True:
+        # 每个字节占3列 ("xx,")，最后一个字节没有逗号
+        count = max(0, (limit - len(line)) // 3)
+        if remaining <= count or (remaining == count + 1 and len(line) + 3 * count + 2 <= limit):
+            yield line + data[position:].hex(",")
+            return
+        chunk = data[position:position + count].hex(",")
+        yield line + (chunk + "," if count else "") + "\\"
+        position += count
+        remaining -= count
+        line = "  "
+
+
+def _value_lines(name: str, value_type: int, value):
+    """逐行产出单个值的 .reg 文本"""
+    name_part = "@" if name == "" else f'"{_escape(name)}"'
+    if value_type == REG_SZ and isinstance(value, str):
+        yield f'{name_part}="{_escape(value)}"'
+    elif value_type == REG_DWORD and isinstance(value, int):
+        yield f"{name_part}=dword:{value:08x}"
+    else:
+        data = _encode_typed_data(value_type, value)
+        type_part = "hex" if value_type == REG_BINARY else f"hex({value_type:x})"
+        yield from _hex_lines(f"{name_part}={type_part}:", data)
+
+
+def format_value(name: str, value_type: int, value) -> str:
+    """格式化单个值为 .reg 文本行"""
+    return "\n".join(_value_lines(name, value_type, value))
+
+
+def iter_key_entries(keys):
+    """
+    将键集合展开为 RegEntry 序列
+
+    参数:
+        keys: 可迭代的 (根键, 子路径, {值名称: (值类型, 值)})
+    """
+    for root_key, sub_key, values in keys:
+        yield RegEntry(root_key, sub_key, None, None, None)
+        for name, (value_type, value) in values.items():
+            yield RegEntry(root_key, sub_key, name, value_type, value)
+
+
+class RegFileWriter:
+    """
+    流式写出 .reg 文本
+
+    逐行写入文本流 (换行符由文本流转换)，hex 数据按行分段格式化，
+    不在内存中拼接整个文件或整个值的文本。
+    """
+
+    def __init__(self, stream):
+        """
+        初始化并写入文件头
+
+        参数:
+            stream: 文本流 (写出 .reg 文件时使用 newline="\\r\\n")
+        """
+        self.stream = stream
+        self._key = None
+        stream.write(REG_FILE_HEADER + "\n\n")
+
+    def write_key(self, root_key, sub_key):
+        """开始新的键路径 (键之间以空行分隔)"""
+        if self._key is not None:
+            self.stream.write("\n")
+        self._key = (root_key, sub_key)
+        self.stream.write(f"[{ROOT_KEY_NAMES[root_key]}\\{sub_key}]\n")
+
+    def write_value(self, name, value_type, value):
+        """写入当前键下的值"""
+        if self._key is None:
+            raise RegFileFormatError("写入值之前需要先写入键路径")
+        write = self.stream.write
+        for line in _value_lines(name, value_type, value):
+            write(line)
+            write("\n")
+
+    def write_entries(self, entries):
+        """写入 RegEntry 序列 (同一键路径的连续记录只输出一次键路径)"""
+        for entry in entries:
+            if (entry.root_key, entry.sub_key) != self._key:
+                self.write_key(entry.root_key, entry.sub_key)
+            if entry.name is not None:
+                self.write_value(entry.name, entry.value_type, entry.value)
+
+    def close(self):
+        """结束最后一个键路径"""
+        if self._key is not None:
+            self.stream.write("\n")
+            self._key = None
+
+
+def format_reg_text(keys) -> str:
+    """
+    格式化为 .reg 文件文本
+
+    参数:
+        keys: 可迭代的 (根键, 子路径, {值名称: (值类型, 值)})
+    """
+    stream = io.StringIO(newline="\r\n")
+    writer = RegFileWriter(stream)
+    writer.write_entries(iter_key_entries(keys))
+    writer.close()
+    return stream.getvalue()
+
+
+def write_reg_file(path, entries):
+    """
+    以 regedit 默认格式 (UTF-16 LE 带BOM) 流式写入 .reg 文件
+
+    参数:
+        entries: 可迭代的 RegEntry (如 iter_reg_file 的结果，可边读边写)
+    """
+    with open(path, "wb") as raw:
+        raw.write(codecs.BOM_UTF16_LE)
+        with io.TextIOWrapper(raw, encoding="utf-16-le", newline="\r\n") as stream:
+            writer = RegFileWriter(stream)
+            writer.write_entries(entries)
+            writer.close()
+
+
+def load_reg_file(path):
+    """读取 .reg 文件"""
+    return _collect_keys(iter_reg_file(path))
+
+
+def save_reg_file(path, keys):
+    """以 regedit 默认格式 (UTF-16 LE 带BOM) 写入 .reg 文件"""
+    write_reg_file(path, iter_key_entries(keys))
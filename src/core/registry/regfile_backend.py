@@ -0,0 +1,79 @@
+"""
+.reg 文件注册表后端
+流式加载 regedit 导出文件到内存，修改后流式写回文件
+"""
+import os
+
+from .memory_backend import MemoryRegistryBackend
+from .regfile import iter_reg_file, save_reg_file
+
+
+class RegFileRegistryBackend(MemoryRegistryBackend):
+    """基于 .reg 导出文件的注册表后端"""
+
+    name = "regfile"
+
+    def __init__(self, path, output_path=None):
+        """
+        初始化后端
+
+        参数:
+            path: 要加载的 .reg 文件路径
+            output_path: 写回路径 (默认覆盖原文件)
+        """
+        super().__init__()
+        self.path = path
+        self.source = os.path.abspath(path)
+        self.output_path = output_path or path
+        self._dirty = False
+        # 已加载文件的修改时间，用于发现外部修改
+        self._mtime = None
+        self._load()
+
+    def _mtime_ns(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        self._keys.clear()
+        self._paths.clear()
+        self._mtime = self._mtime_ns()
+        if self._mtime is None:
+            return
+        # 逐条加载到内存，不构建中间的整文件文本或字典
+        key = values = None
+        for entry in iter_reg_file(self.path):
+            if (entry.root_key, entry.sub_key) != key:
+                key = entry.root_key, entry.sub_key
+                values = self.create_key(*key)
+            if entry.name is not None:
+                values[entry.name] = (entry.value_type, entry.value)
+
+    def set_value(self, root_key, sub_key, value_name, value_type, value):
+        super().set_value(root_key, sub_key, value_name, value_type, value)
+        self._dirty = True
+
+    def key_info(self, root_key, sub_key):
+        if self._dirty or self.output_path != self.path or not os.path.exists(self.path):
+            # 尚未写回或写回到其他文件时，无法提供稳定的写入标记
+            return None
+        info = super().key_info(root_key, sub_key)
+        info['last_write'] = os.stat(self.path).st_mtime_ns
+        return info
+
+    def save(self, path=None):
+        """将当前内容写入 .reg 文件"""
+        save_reg_file(path or self.output_path, self.iter_keys())
+        self._dirty = False
+        self._mtime = self._mtime_ns()
+
+    def flush(self):
+        if self._dirty:
+            self.save()
+
+    def refresh(self):
+        # 文件被外部修改且没有未写回的内容时重新加载
+        if not self._dirty and self._mtime_ns() != self._mtime:
+            self._load()
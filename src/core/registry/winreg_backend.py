@@ -0,0 +1,125 @@
+"""
+Windows注册表后端
+基于 winreg 与 advapi32 (ctypes) 访问真实注册表
+"""
+import winreg
+from contextlib import contextmanager
+
+from src.core.di.provider import DependencyProvider
+from src.core.utils.registry_utils import (
+    RegistryChangeNotifier,
+    RegistryHandlePool,
+    call_stats,
+    enum_reg_values,
+    open_reg_key,
+    close_reg_key,
+    query_reg_key_info,
+    read_reg_binary_value,
+    write_reg_binary_value,
+    KEY_READ,
+    KEY_WRITE,
+)
+from .backend import RegistryBackend, RegistryValue, decode_raw_value
+
+
+class WinRegistryBackend(RegistryBackend):
+    """真实注册表后端 (仅Windows)"""
+
+    name = "winreg"
+
+    def __init__(self):
+        # 当前会话的句柄池 (会话外为None，每次操作单独打开/关闭)
+        self._pool = None
+
+    @contextmanager
+    def session(self):
+        if self._pool is not None:
+            # 已处于会话中，沿用外层句柄池
+            yield self._pool
+            return
+
+        if DependencyProvider.in_scope() and DependencyProvider.is_registered(RegistryHandlePool):
+            # 处于依赖作用域内 (如一次批量处理): 使用作用域的句柄池，
+            # 同一作用域中先后打开的会话共用其中的句柄，退出作用域时才关闭
+            pool = DependencyProvider.get(RegistryHandlePool)
+            self._pool = pool
+            try:
+                yield pool
+            finally:
+                self._pool = None
+            return
+
+        with RegistryHandlePool() as pool:
+            self._pool = pool
+            try:
+                yield pool
+            finally:
+                self._pool = None
+
+    def _pooled_key(self, root_key, sub_key, access):
+        """会话中返回池化句柄的整数值，否则返回None"""
+        if self._pool is None:
+            return None
+        return self._pool.acquire(root_key, sub_key, access).value
+
+    def enum_value_names(self, root_key, sub_key):
+        handle = self._pooled_key(root_key, sub_key, KEY_READ)
+        if handle is None:
+            with winreg.OpenKey(root_key, sub_key, 0, winreg.KEY_READ) as key:
+                return self._enum_names(key)
+        return self._enum_names(handle)
+
+    @staticmethod
+    def _enum_names(key):
+        names = []
+        i = 0
+        while True:
+            try:
+                names.append(winreg.EnumValue(key, i)[0])
+            except OSError:
+                break
+            i += 1
+        return names
+
+    def snapshot_values(self, root_key, sub_key):
+        return [
+            RegistryValue(name, value_type, decode_raw_value(value_type, data))
+            for name, value_type, data in enum_reg_values(root_key, sub_key, pool=self._pool)
+        ]
+
+    def key_info(self, root_key, sub_key):
+        h_key = open_reg_key(root_key, sub_key, KEY_READ, pool=self._pool)
+        if h_key is None:
+            raise FileNotFoundError(2, "注册表路径不存在", sub_key)
+        try:
+            return query_reg_key_info(h_key)
+        finally:
+            close_reg_key(h_key, pool=self._pool)
+
+    def query_value(self, root_key, sub_key, value_name):
+        handle = self._pooled_key(root_key, sub_key, KEY_READ)
+        if handle is None:
+            with winreg.OpenKey(root_key, sub_key, 0, winreg.KEY_READ) as key:
+                return winreg.QueryValueEx(key, value_name)
+        return winreg.QueryValueEx(handle, value_name)
+
+    def set_value(self, root_key, sub_key, value_name, value_type, value):
+        handle = self._pooled_key(root_key, sub_key, KEY_WRITE)
+        if handle is None:
+            with winreg.OpenKey(root_key, sub_key, 0, winreg.KEY_SET_VALUE) as key:
+                winreg.SetValueEx(key, value_name, 0, value_type, value)
+            return
+        winreg.SetValueEx(handle, value_name, 0, value_type, value)
+
+    def read_binary(self, root_key, sub_key, value_name):
+        return read_reg_binary_value(root_key, sub_key, value_name, pool=self._pool)
+
+    def write_binary(self, root_key, sub_key, value_name, data):
+        return write_reg_binary_value(root_key, sub_key, value_name, data, pool=self._pool)
+
+    def call_stats(self):
+        return call_stats.snapshot()
+
+    def notifier(self, root_key, sub_key, poll_interval=1.0):
+        # 使用 RegNotifyChangeKeyValue，等待期间不轮询
+        return RegistryChangeNotifier(root_key, sub_key)
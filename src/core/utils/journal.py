@@ -0,0 +1,116 @@
+"""
+操作日志 (JSON Lines)
+每个处理过的键值写入一行紧凑的 JSON，便于跨机器汇总分析，不依赖彩色控制台输出
+"""
+import json
+import os
+import threading
+import time
+
+
+def _encode(value):
+    """将值转换为 JSON 可表示的形式 (二进制数据转为十六进制字符串)"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    return value
+
+
+class OperationJournal:
+    """带缓冲写入和按大小轮转的 JSON Lines 操作日志"""
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backup_count=3, buffer_size=64 * 1024):
+        """
+        初始化操作日志
+
+        参数:
+            path: 日志文件路径 (追加写入)
+            max_bytes: 单个文件的最大字节数，超过后轮转 (0 表示不轮转)
+            backup_count: 保留的历史文件数量 (path.1 ~ path.N)
+            buffer_size: 写入缓冲区大小
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "ab", buffering=self.buffer_size)
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        """关闭当前文件，依次重命名为 path.1 ~ path.N"""
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def write(self, entry):
+        """
+        写入一条记录
+
+        参数:
+            entry: 记录字典，bytes 值自动转为十六进制字符串
+        """
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'), default=_encode).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._file is None:
+                self._open()
+            if self.max_bytes and self._size and self._size + len(line) > self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._size += len(line)
+
+    def record(self, run, backend, key, operation, status, before=None, after=None, duration_us=None, error=None):
+        """
+        写入单个键值的处理结果
+
+        参数:
+            run: 本次处理的标识
+            backend: 注册表后端名称
+            key: 完整注册表路径 (含值名称)
+            operation: 操作名称
+            status: modified / unchanged / planned / failed
+            before: 修改前的值
+            after: 修改后的值 (未修改时为空)
+            duration_us: 处理耗时 (微秒)
+            error: 失败原因
+        """
+        entry = {
+            'ts': round(time.time(), 6),
+            'run': run,
+            'backend': backend,
+            'key': key,
+            'operation': operation,
+            'status': status,
+            'before': before,
+            'after': after,
+            'duration_us': duration_us,
+        }
+        if error is not None:
+            entry['error'] = error
+        self.write(entry)
+
+    def flush(self):
+        """将缓冲区内容写入磁盘"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """写出缓冲区并关闭文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
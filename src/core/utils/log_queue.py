@@ -0,0 +1,163 @@
+"""
+异步日志管线
+有界队列 + 单个后台线程批量写出，由 LoggerManager.enable_async 启用
+"""
+import logging
+import logging.handlers
+import queue
+import threading
+
+from .logger import OverflowPolicy
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """写入有界队列的日志处理器，队列满时按溢出策略处理"""
+
+    def __init__(self, log_queue, overflow=OverflowPolicy.BLOCK):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        # 尚未汇总输出的省略条数 (SUMMARIZE 策略)
+        self._pending_summary = 0
+        self._summary_name = None
+        self._lock = threading.Lock()
+
+    def prepare(self, record):
+        # 同进程内的线程队列无需提前格式化，格式化 (包括延迟消息) 交由写出线程完成
+        return record
+
+    def enqueue(self, record):
+        if self.overflow is OverflowPolicy.BLOCK:
+            self.queue.put(record)
+        elif self.overflow is OverflowPolicy.DROP_OLDEST:
+            with self._lock:
+                while True:
+                    try:
+                        self.queue.put_nowait(record)
+                        return
+                    except queue.Full:
+                        pass
+                    try:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+        else:
+            with self._lock:
+                try:
+                    if self._pending_summary:
+                        self.queue.put_nowait(self._summary_record())
+                        self._pending_summary = 0
+                    self.queue.put_nowait(record)
+                except queue.Full:
+                    self.dropped += 1
+                    self._pending_summary += 1
+                    self._summary_name = record.name
+
+    def flush_summary(self):
+        """立即输出尚未汇总的省略条数 (队列已满时阻塞等待)"""
+        with self._lock:
+            if self._pending_summary:
+                self.queue.put(self._summary_record())
+                self._pending_summary = 0
+
+    def _summary_record(self):
+        return logging.makeLogRecord({
+            'name': self._summary_name,
+            'levelno': logging.WARNING,
+            'levelname': logging.getLevelName(logging.WARNING),
+            'msg': f"日志输出过快，已省略 {self._pending_summary} 条记录",
+        })
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    单线程批量写出的队列监听器
+
+    每次取出队列中已有的全部记录 (最多 batch_size 条)，按各日志记录器原有的控制台处理器格式化，
+    合并为一次写入和一次 flush。
+    """
+
+    def __init__(self, log_queue, batch_size=256):
+        super().__init__(log_queue)
+        self.batch_size = batch_size
+        # 日志记录器名称 -> 原控制台处理器 (提供格式化器、级别和输出流)
+        self.targets = {}
+
+    def enqueue_sentinel(self):
+        # 队列已满时也要保证结束标记能够入队
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        log_queue = self.queue
+        running = True
+        while running:
+            batch = [log_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._sentinel in batch:
+                batch = [record for record in batch if record is not self._sentinel]
+                running = False
+            try:
+                self.write_batch(batch)
+            finally:
+                for _ in range(len(batch) + (0 if running else 1)):
+                    log_queue.task_done()
+
+    def write_batch(self, records):
+        """格式化并写出一批记录"""
+        chunks = {}
+        for record in records:
+            handler = self.targets.get(record.name)
+            if handler is None or record.levelno < handler.level:
+                continue
+            try:
+                text = handler.format(record)
+            except Exception:
+                handler.handleError(record)
+                continue
+            chunks.setdefault(handler.stream, []).append(text)
+
+        for stream, lines in chunks.items():
+            try:
+                stream.write('\n'.join(lines) + '\n')
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+
+class AsyncLogSink:
+    """异步日志管线: 各日志记录器写入有界队列，由单个后台线程批量写出"""
+
+    def __init__(self, maxsize=10000, overflow=OverflowPolicy.BLOCK, batch_size=256):
+        self.queue = queue.Queue(maxsize)
+        self.handler = BoundedQueueHandler(self.queue, OverflowPolicy(overflow))
+        self.listener = BatchingQueueListener(self.queue, batch_size)
+        self.listener.start()
+
+    def attach(self, logger):
+        """将日志记录器的控制台处理器替换为队列处理器"""
+        for handler in logger.handlers:
+            if handler is not self.handler:
+                self.listener.targets[logger.name] = handler
+        logger.handlers = [self.handler]
+
+    def detach(self, logger):
+        """恢复日志记录器原有的控制台处理器"""
+        target = self.listener.targets.get(logger.name)
+        if target is not None:
+            logger.handlers = [target]
+
+    def flush(self):
+        """等待队列中的记录全部写出"""
+        self.handler.flush_summary()
+        self.queue.join()
+
+    def close(self):
+        """写出剩余记录并停止后台线程"""
+        self.handler.flush_summary()
+        self.listener.stop()
@@ -1,18 +1,36 @@
+import atexit
 import logging
 import sys
 import re
 import os
-from datetime import datetime
+import time
+from enum import Enum
+from functools import lru_cache
 import colorama
 from colorama import Fore
 from typing import Optional
 
-# 初始化colorama
-colorama.init()
+_console_initialized = False
 
-# 确保在 Windows 上启用 ANSI 转义序列支持
-if sys.platform.startswith('win'):
-    os.system('')  # 启用 Windows ANSI 支持
+
+def init_console():
+    """
+    初始化控制台颜色支持 (首次创建控制台输出时调用一次)
+
+    colorama.init() 会包装 sys.stdout，Windows 上的 os.system('') 会启动一个子进程，
+    两者都推迟到真正需要输出时执行。
+    """
+    global _console_initialized
+    if _console_initialized:
+        return
+    _console_initialized = True
+
+    # 初始化colorama
+    colorama.init()
+
+    # 确保在 Windows 上启用 ANSI 转义序列支持
+    if sys.platform.startswith('win'):
+        os.system('')  # 启用 Windows ANSI 支持
 
 
 class Style:
@@ -50,11 +68,16 @@ class EnhancedLogger(logging.Logger):
         :param color: 可选的颜色名称（如 'red', 'green', 'yellow' 等）
         :return: 用户输入的字符串
         """
+        # 输出提示前写出队列中尚未输出的日志，保证显示顺序
+        LoggerManager.flush()
+        init_console()
+
         # 首先应用颜色标签
-        prompt = apply_color_tags(prompt)
+        plain = not supports_color(sys.stdout)
+        prompt = apply_color_tags(prompt, plain)
 
         # 如果指定了整体颜色，则应用整体颜色
-        if color:
+        if color and not plain:
             color_code = COLORS.get(color.lower(), COLORS["DEFAULT"])
             prompt = f"{color_code}{prompt}{COLORS['DEFAULT']}"
 
@@ -111,59 +134,165 @@ COLORS = {
 COLOR_TAG_PATTERN = re.compile(r'\{color:([a-z_]+)\}(.*?)\{/color\}', re.IGNORECASE)
 
 
-def apply_color_tags(message: str) -> str:
-    """处理消息中的自定义着色标签"""
+# 已编译颜色模板的缓存容量
+COLOR_TEMPLATE_CACHE_SIZE = 1024
+
+
+def supports_color(stream) -> bool:
+    """输出流是否应使用ANSI颜色 (非终端或设置了 NO_COLOR 环境变量时不使用)"""
+    if os.environ.get("NO_COLOR"):
+        return False
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return bool(isatty and isatty())
+    except ValueError:
+        # 流已关闭
+        return False
+
+
+class ColorTemplate:
+    """
+    已解析的颜色标签模板
+
+    将带标签的字符串解析为 (颜色名称, 文本) 片段，颜色名称为None表示普通文本；
+    彩色与纯文本两种渲染结果在首次使用时拼接并保存。
+    """
+
+    __slots__ = ('segments', '_rendered')
+
+    def __init__(self, message: str):
+        segments = []
+        position = 0
+        for match in COLOR_TAG_PATTERN.finditer(message):
+            if match.start() > position:
+                segments.append((None, message[position:match.start()]))
+            segments.append((match.group(1).lower(), match.group(2)))
+            position = match.end()
+        if position < len(message):
+            segments.append((None, message[position:]))
+        self.segments = tuple(segments)
+        # [彩色渲染结果, 纯文本渲染结果]
+        self._rendered = [None, None]
+
+    def render(self, plain: bool = False) -> str:
+        """
+        渲染模板
+
+        :param plain: 为True时去掉颜色标签，不输出ANSI序列
+        """
+        text = self._rendered[plain]
+        if text is None:
+            if plain:
+                text = ''.join(content for _, content in self.segments)
+            else:
+                default = COLORS["DEFAULT"]
+                text = ''.join(
+                    content if color is None else COLORS.get(color, default) + content + default
+                    for color, content in self.segments
+                )
+            self._rendered[plain] = text
+        return text
+
+
+@lru_cache(maxsize=COLOR_TEMPLATE_CACHE_SIZE)
+def compile_color_template(message: str) -> ColorTemplate:
+    """解析颜色标签模板 (按消息内容缓存)"""
+    return ColorTemplate(message)
+
+
+def apply_color_tags(message: str, plain: bool = False) -> str:
+    """
+    处理消息中的自定义着色标签
+
+    :param message: 可包含 {color:名称}文本{/color} 标签的消息
+    :param plain: 为True时只去掉标签，不输出ANSI序列
+    """
+    # 快速路径: 不含标签的消息无需解析
+    if '{' not in message:
+        return message
+    return compile_color_template(message).render(plain)
 
-    def replace_color_tag(match):
-        color_name = match.group(1).lower()
-        content = match.group(2)
-        color = COLORS.get(color_name, COLORS["DEFAULT"])
-        return color + content + COLORS["DEFAULT"]
 
-    return COLOR_TAG_PATTERN.sub(replace_color_tag, message)
+class HexDump:
+    """
+    延迟格式化的十六进制数据 (如 "00 1A FF")
+
+    作为 %s 参数传给日志方法，只有记录输出时才格式化。
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return bytes(self.data).hex(' ').upper()
 
 
 class EnhancedFormatter(logging.Formatter):
     """支持彩色输出的日志格式化器"""
 
-    def __init__(self, show_time=True):
+    def __init__(self, show_time=True, plain=False):
+        """
+        :param show_time: 是否显示时间戳
+        :param plain: 为True时输出不含ANSI颜色的纯文本 (输出到文件或管道时使用)
+        """
         super().__init__()
         self.show_time = show_time
+        self.plain = plain
+        self._colors = dict.fromkeys(COLORS, "") if plain else COLORS
+        self._reset = "" if plain else Style.RESET
+        self._reset_underline = "" if plain else Style.RESET_UNDERLINE
+        # (级别, 模块) -> 已渲染的级别与模块前缀
+        self._prefixes = {}
+        # (秒, 已渲染的时间部分)，同一秒内的记录复用
+        self._time_cache = (None, "")
+
+    def _prefix(self, levelname, module):
+        """级别与模块前缀 (按级别和模块缓存)"""
+        prefix = self._prefixes.get((levelname, module))
+        if prefix is None:
+            colors = self._colors
+            level_color = colors.get(levelname, colors["DEFAULT"])
+            prefix = (
+                level_color + f"[{levelname}]" +
+                colors["MODULE_NAME"] + " " +
+                colors["MODULE_UNDERLINE"] + module +
+                self._reset_underline +
+                colors["DEFAULT"] + " |"
+            )
+            self._prefixes[(levelname, module)] = prefix
+        return prefix
+
+    def _time_part(self, created):
+        """时间部分 (按秒缓存)"""
+        second = int(created)
+        cached_second, time_part = self._time_cache
+        if second != cached_second:
+            time_part = self._colors["TIME"] + time.strftime("%m-%d %H:%M:%S", time.localtime(second)) + " "
+            self._time_cache = (second, time_part)
+        return time_part
 
     def format(self, record):
-        levelname = record.levelname
-        module = record.name if record.name else "system"
-        message = record.getMessage()
-
-        # 构建时间部分（如果启用）
+        prefix = self._prefix(record.levelname, record.name or "system")
         if self.show_time:
-            current_time = datetime.now().strftime("%m-%d %H:%M:%S")
-            time_part = COLORS["TIME"] + current_time + " "  # 时间后面添加空格
-        else:
-            time_part = ""
-
-        # 构建级别部分 - 不再添加前导空格
-        level_color = COLORS.get(levelname, COLORS["DEFAULT"])
-        level_part = level_color + f"[{levelname}]"  # 移除前面的空格
-
-        # 构建模块部分
-        module_part = (
-                COLORS["MODULE_NAME"] + " " +
-                COLORS["MODULE_UNDERLINE"] + module +
-                Style.RESET_UNDERLINE
-        )
+            prefix = self._time_part(record.created) + prefix
+        return f"{prefix} {apply_color_tags(record.getMessage(), self.plain)}{self._reset}"
 
-        separator = COLORS["DEFAULT"] + " |"
-        colored_message = apply_color_tags(message)
 
-        # 组合所有部分
-        return f"{time_part}{level_part}{module_part}{separator} {colored_message}{Style.RESET}"
+class OverflowPolicy(Enum):
+    """异步日志队列已满时的处理策略"""
+    BLOCK = "block"              # 阻塞记录线程，直到队列有空位
+    DROP_OLDEST = "drop-oldest"  # 丢弃队列中最早的记录
+    SUMMARIZE = "summarize"      # 丢弃新记录，队列恢复后输出一条省略汇总
 
 
 class LoggerManager:
     """集中管理日志记录器的类"""
 
     _loggers = {}
+    # 异步日志管线 (未启用时为None，日志同步写出)
+    _sink = None
 
     @classmethod
     def get_logger(cls, name: str, level: int = logging.DEBUG, show_time: bool = True) -> EnhancedLogger:
@@ -188,17 +317,59 @@ class LoggerManager:
 
         # 避免重复添加处理器
         if not logger.handlers:
+            init_console()
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(level)
-            console_handler.setFormatter(EnhancedFormatter(show_time=show_time))
+            console_handler.setFormatter(EnhancedFormatter(show_time=show_time, plain=not supports_color(sys.stdout)))
             logger.addHandler(console_handler)
 
         # 禁用传播到根日志记录器
         logger.propagate = False
 
+        if cls._sink is not None:
+            cls._sink.attach(logger)
+
         cls._loggers[name] = logger
         return logger
 
+    @classmethod
+    def enable_async(cls, maxsize: int = 10000, overflow=OverflowPolicy.BLOCK, batch_size: int = 256):
+        """
+        启用异步日志: 所有日志记录器改为写入有界队列，由单个后台线程批量写出到控制台
+
+        :param maxsize: 队列容量
+        :param overflow: 队列已满时的处理策略 (OverflowPolicy 或其取值字符串)
+        :param batch_size: 单次批量写出的最大记录数
+        """
+        if cls._sink is not None:
+            return
+        # 延迟导入: logging.handlers 会连带导入 socket 等模块
+        from .log_queue import AsyncLogSink
+        cls._sink = AsyncLogSink(maxsize, overflow, batch_size)
+        for logger in cls._loggers.values():
+            cls._sink.attach(logger)
+        atexit.register(cls.shutdown)
+
+    @classmethod
+    def flush(cls):
+        """等待异步队列中的日志全部写出 (未启用异步日志时立即返回)"""
+        if cls._sink is not None:
+            cls._sink.flush()
+
+    @classmethod
+    def shutdown(cls):
+        """写出剩余日志，停止后台线程并恢复同步输出"""
+        sink = cls._sink
+        if sink is None:
+            return
+        cls._sink = None
+        # 先恢复同步输出再停止后台线程，否则期间写入队列的记录无人读取 (BLOCK 策略下队列满时会一直阻塞)
+        for logger in cls._loggers.values():
+            sink.detach(logger)
+        sink.close()
+        if sink.handler.dropped:
+            cls.get_logger("Logger", show_time=False).warning(f"异步日志队列溢出，共省略 {sink.handler.dropped} 条记录")
+
     @classmethod
     def set_global_level(cls, level: int):
         """设置所有日志记录器的全局级别"""
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -14,3 +15,12 @@ def resource_path(relative_path: str) -> str:
     # 处理Windows路径分隔符
     full_path = base_path / relative_path
     return str(full_path).replace('\\', '/')
+
+
+def user_cache_dir(app_name: str = "CODM-Tactix-Hub") -> str:
+    """获取用户缓存目录 (Windows: %LOCALAPPDATA%，其他平台: XDG_CACHE_HOME)"""
+    if sys.platform.startswith('win'):
+        base_path = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser("~"), 'AppData', 'Local')
+    else:
+        base_path = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), '.cache')
+    return os.path.join(base_path, app_name)
@@ -3,122 +3,547 @@ Windows注册表操作工具模块
 包含底层API封装和辅助函数
 """
 from ctypes import wintypes
+from types import SimpleNamespace
 import ctypes
-import winreg
-
-# 定义Windows API所需的数据结构和函数
-advapi32 = ctypes.WinDLL("advapi32.dll")
-
-RegOpenKeyEx = advapi32.RegOpenKeyExW
-RegOpenKeyEx.argtypes = [
-    wintypes.HKEY,
-    wintypes.LPCWSTR,
-    wintypes.DWORD,
-    wintypes.DWORD,
-    ctypes.POINTER(wintypes.HKEY),
-]
-RegOpenKeyEx.restype = wintypes.LONG
-
-RegQueryValueEx = advapi32.RegQueryValueExW
-RegQueryValueEx.argtypes = [
-    wintypes.HKEY,
-    wintypes.LPCWSTR,
-    wintypes.LPDWORD,
-    ctypes.POINTER(wintypes.DWORD),
-    ctypes.POINTER(ctypes.c_ubyte),
-    ctypes.POINTER(wintypes.DWORD),
-]
-RegQueryValueEx.restype = wintypes.LONG
-
-RegSetValueEx = advapi32.RegSetValueExW
-RegSetValueEx.argtypes = [
-    wintypes.HKEY,
-    wintypes.LPCWSTR,
-    wintypes.DWORD,
-    wintypes.DWORD,
-    ctypes.POINTER(ctypes.c_ubyte),
-    wintypes.DWORD
-]
-RegSetValueEx.restype = wintypes.LONG
-
-RegCloseKey = advapi32.RegCloseKey
-RegCloseKey.argtypes = [wintypes.HKEY]
-RegCloseKey.restype = wintypes.LONG
+import functools
+import threading
+import time
+
+
+class CallStats:
+    """
+    注册表API调用统计
+
+    记录每个 advapi32 注册表函数的调用次数和累计耗时 (纳秒)，各线程共用。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, elapsed_ns):
+        """记录一次调用"""
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                self._stats[name] = [1, elapsed_ns]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed_ns
+
+    def snapshot(self):
+        """
+        获取当前统计
+
+        返回:
+            dict: 函数名 -> (调用次数, 累计耗时纳秒)
+        """
+        with self._lock:
+            return {name: (calls, total_ns) for name, (calls, total_ns) in self._stats.items()}
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self._stats.clear()
+
+
+# 全局调用统计
+call_stats = CallStats()
+
+
+def _counted(name, func):
+    """包装API函数，记录每次调用的耗时"""
+    record = call_stats.record
+    perf_counter_ns = time.perf_counter_ns
+
+    def wrapper(*args):
+        start = perf_counter_ns()
+        try:
+            return func(*args)
+        finally:
+            record(name, perf_counter_ns() - start)
+    return wrapper
+
+
+# 定义Windows API所需的数据结构和函数 (延迟加载)
+@functools.lru_cache(maxsize=None)
+def _api():
+    """
+    加载 advapi32 / kernel32 并设置函数签名 (首次调用注册表函数时执行一次)
+
+    返回:
+        SimpleNamespace: 以函数名访问的 API 绑定
+    """
+    advapi32 = ctypes.WinDLL("advapi32.dll")
+
+    RegOpenKeyEx = advapi32.RegOpenKeyExW
+    RegOpenKeyEx.argtypes = [
+        wintypes.HKEY,
+        wintypes.LPCWSTR,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        ctypes.POINTER(wintypes.HKEY),
+    ]
+    RegOpenKeyEx.restype = wintypes.LONG
+
+    RegQueryValueEx = advapi32.RegQueryValueExW
+    RegQueryValueEx.argtypes = [
+        wintypes.HKEY,
+        wintypes.LPCWSTR,
+        wintypes.LPDWORD,
+        ctypes.POINTER(wintypes.DWORD),
+        ctypes.POINTER(ctypes.c_ubyte),
+        ctypes.POINTER(wintypes.DWORD),
+    ]
+    RegQueryValueEx.restype = wintypes.LONG
+
+    RegSetValueEx = advapi32.RegSetValueExW
+    RegSetValueEx.argtypes = [
+        wintypes.HKEY,
+        wintypes.LPCWSTR,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        ctypes.c_void_p,  # 接受 bytes 或 ctypes 数组，避免逐字节构造数组
+        wintypes.DWORD
+    ]
+    RegSetValueEx.restype = wintypes.LONG
+
+    RegQueryInfoKey = advapi32.RegQueryInfoKeyW
+    RegQueryInfoKey.argtypes = [
+        wintypes.HKEY,
+        wintypes.LPWSTR,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        ctypes.POINTER(wintypes.FILETIME),
+    ]
+    RegQueryInfoKey.restype = wintypes.LONG
+
+    RegEnumValue = advapi32.RegEnumValueW
+    RegEnumValue.argtypes = [
+        wintypes.HKEY,
+        wintypes.DWORD,
+        wintypes.LPWSTR,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        ctypes.POINTER(ctypes.c_ubyte),
+        wintypes.LPDWORD,
+    ]
+    RegEnumValue.restype = wintypes.LONG
+
+    RegNotifyChangeKeyValue = advapi32.RegNotifyChangeKeyValue
+    RegNotifyChangeKeyValue.argtypes = [
+        wintypes.HKEY,
+        wintypes.BOOL,
+        wintypes.DWORD,
+        wintypes.HANDLE,
+        wintypes.BOOL,
+    ]
+    RegNotifyChangeKeyValue.restype = wintypes.LONG
+
+    kernel32 = ctypes.WinDLL("kernel32.dll", use_last_error=True)
+
+    CreateEvent = kernel32.CreateEventW
+    CreateEvent.argtypes = [wintypes.LPVOID, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+    CreateEvent.restype = wintypes.HANDLE
+
+    WaitForSingleObject = kernel32.WaitForSingleObject
+    WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    WaitForSingleObject.restype = wintypes.DWORD
+
+    CloseHandle = kernel32.CloseHandle
+    CloseHandle.argtypes = [wintypes.HANDLE]
+    CloseHandle.restype = wintypes.BOOL
+
+    RegCloseKey = advapi32.RegCloseKey
+    RegCloseKey.argtypes = [wintypes.HKEY]
+    RegCloseKey.restype = wintypes.LONG
+
+    # 注册表函数记录调用耗时 (事件等待等阻塞调用不计入)
+    return SimpleNamespace(
+        RegOpenKeyEx=_counted("RegOpenKeyEx", RegOpenKeyEx),
+        RegQueryValueEx=_counted("RegQueryValueEx", RegQueryValueEx),
+        RegSetValueEx=_counted("RegSetValueEx", RegSetValueEx),
+        RegQueryInfoKey=_counted("RegQueryInfoKey", RegQueryInfoKey),
+        RegEnumValue=_counted("RegEnumValue", RegEnumValue),
+        RegNotifyChangeKeyValue=RegNotifyChangeKeyValue,
+        CreateEvent=CreateEvent,
+        WaitForSingleObject=WaitForSingleObject,
+        CloseHandle=CloseHandle,
+        RegCloseKey=_counted("RegCloseKey", RegCloseKey),
+    )
+
 
 # 常量定义
 ERROR_SUCCESS = 0
-KEY_READ = winreg.KEY_READ
-KEY_WRITE = winreg.KEY_WRITE
-REG_BINARY = winreg.REG_BINARY
+ERROR_MORE_DATA = 234
+ERROR_NO_MORE_ITEMS = 259
+KEY_READ = 0x20019
+KEY_NOTIFY = 0x0010
+REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+REG_NOTIFY_THREAD_AGNOSTIC = 0x10000000
+WAIT_OBJECT_0 = 0
+WAIT_TIMEOUT = 0x00000102
+KEY_WRITE = 0x20006
+REG_BINARY = 3
 
+# 未知键最大值长度时读取缓冲区的初始大小 (字节)
+DEFAULT_READ_CAPACITY = 256
 
-def read_reg_binary_value(hkey, sub_key, value_name):
+
+class RegistryHandlePool:
     """
-    读取注册表键值的原始二进制数据
+    已打开注册表句柄池
+
+    以 (根键, 子路径, 访问掩码) 为键缓存 RegOpenKeyEx 得到的句柄，
+    在 with 块内复用，退出时统一 RegCloseKey。
+    """
+
+    def __init__(self):
+        self._handles = {}
+        self._capacities = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, hkey, sub_key, access):
+        """
+        获取已打开的句柄 (不存在时打开并缓存)
+
+        返回:
+            wintypes.HKEY: 注册表句柄，打开失败时抛出 OSError
+        """
+        cache_key = (hkey, sub_key.lower(), access)
+        # 池在并行写入的线程间共用，命中计数也需要在锁内累加
+        with self._lock:
+            h_key = self._handles.get(cache_key)
+            if h_key is not None:
+                self.hits += 1
+                return h_key
+
+            h_key = wintypes.HKEY()
+            result = _api().RegOpenKeyEx(hkey, sub_key, 0, access, ctypes.byref(h_key))
+            if result != ERROR_SUCCESS:
+                raise ctypes.WinError(result)
+            self.misses += 1
+            self._handles[cache_key] = h_key
+            return h_key
+
+    def read_capacity(self, hkey, sub_key, h_key):
+        """
+        键下最长值的字节数 (每个键只调用一次 RegQueryInfoKey，之后使用缓存)
+
+        参数:
+            h_key: 该键已打开的句柄
+        """
+        cache_key = (hkey, sub_key.lower())
+        capacity = self._capacities.get(cache_key)
+        if capacity is None:
+            try:
+                capacity = max(query_reg_key_info(h_key)['max_value_len'], 1)
+            except OSError:
+                capacity = DEFAULT_READ_CAPACITY
+            self._capacities[cache_key] = capacity
+        return capacity
+
+    def close(self):
+        """关闭池中的所有句柄"""
+        with self._lock:
+            for h_key in self._handles.values():
+                _api().RegCloseKey(h_key)
+            self._handles.clear()
+            self._capacities.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def open_reg_key(hkey, sub_key, access, pool=None):
+    """
+    打开注册表键 (提供句柄池时从池中获取)
 
     返回:
-        bytes: 二进制数据，读取失败返回None
+        wintypes.HKEY: 注册表句柄，打开失败返回None
     """
+    if pool is not None:
+        try:
+            return pool.acquire(hkey, sub_key, access)
+        except OSError:
+            return None
+
     h_key = wintypes.HKEY()
-    if RegOpenKeyEx(hkey, sub_key, 0, KEY_READ, ctypes.byref(h_key)) != ERROR_SUCCESS:
+    if _api().RegOpenKeyEx(hkey, sub_key, 0, access, ctypes.byref(h_key)) != ERROR_SUCCESS:
         return None
+    return h_key
 
-    data_type = wintypes.DWORD()
-    data_size = wintypes.DWORD()
-
-    # 第一次调用获取数据大小
-    if RegQueryValueEx(
-            h_key,
-            value_name,
-            None,
-            ctypes.byref(data_type),
-            None,
-            ctypes.byref(data_size)
-    ) != ERROR_SUCCESS:
-        RegCloseKey(h_key)
-        return None
 
-    # 分配缓冲区并读取数据
-    data_buffer = (ctypes.c_ubyte * data_size.value)()
-    if RegQueryValueEx(
-            h_key,
-            value_name,
-            None,
-            None,
-            data_buffer,
-            ctypes.byref(data_size)
-    ) != ERROR_SUCCESS:
-        RegCloseKey(h_key)
+def close_reg_key(h_key, pool=None):
+    """关闭注册表句柄 (来自句柄池的句柄由池统一关闭)"""
+    if pool is None:
+        _api().RegCloseKey(h_key)
+
+
+def _data_pointer(data):
+    """
+    获取传给 RegSetValueEx 的数据指针和字节数，不复制数据
+
+    bytes 直接传递其内部缓冲区；bytearray / 可写的连续 memoryview 通过 from_buffer 共享内存；
+    只读或不连续的其他缓冲区先转换为 bytes。字节数按缓冲区的总字节数计算
+    (元素大于1字节的 memoryview 的 len() 是元素个数)。
+
+    返回:
+        tuple: (数据指针, 字节数)
+    """
+    if isinstance(data, bytes):
+        return data, len(data)
+    view = memoryview(data)
+    if view.readonly or not view.c_contiguous:
+        data = view.tobytes()
+        return data, len(data)
+    return (ctypes.c_ubyte * view.nbytes).from_buffer(view), view.nbytes
+
+
+# 每个线程复用的读取缓冲区
+_read_buffers = threading.local()
+
+
+def _read_buffer(capacity):
+    """获取当前线程的读取缓冲区 (容量不足时重新分配)"""
+    data_buffer = getattr(_read_buffers, 'buffer', None)
+    if data_buffer is None or len(data_buffer) < capacity:
+        data_buffer = _read_buffers.buffer = (ctypes.c_ubyte * capacity)()
+    return data_buffer
+
+
+def read_reg_binary_value(hkey, sub_key, value_name, pool=None):
+    """
+    读取注册表键值的原始二进制数据
+
+    直接以预先分配的缓冲区调用一次 RegQueryValueEx，缓冲区按键的最大值长度确定
+    (来自 RegQueryInfoKey，由句柄池缓存)；仅当数据更长 (ERROR_MORE_DATA) 时按所需大小扩容重试。
+
+    参数:
+        pool: 可选的 RegistryHandlePool，提供时复用已打开的句柄
+
+    返回:
+        bytes: 二进制数据，读取失败返回None
+    """
+    h_key = open_reg_key(hkey, sub_key, KEY_READ, pool)
+    if h_key is None:
         return None
 
-    RegCloseKey(h_key)
-    return bytes(data_buffer)
+    try:
+        capacity = pool.read_capacity(hkey, sub_key, h_key) if pool is not None else DEFAULT_READ_CAPACITY
+        data_size = wintypes.DWORD()
+        while True:
+            data_buffer = _read_buffer(capacity)
+            data_size.value = len(data_buffer)
+            result = _api().RegQueryValueEx(
+                h_key,
+                value_name,
+                None,
+                None,
+                data_buffer,
+                ctypes.byref(data_size)
+            )
+            if result == ERROR_MORE_DATA:
+                # 值比缓冲区长 (data_size 为所需大小)，扩容后重试
+                capacity = max(data_size.value, len(data_buffer) * 2)
+                continue
+            if result != ERROR_SUCCESS:
+                return None
+            return ctypes.string_at(data_buffer, data_size.value)
+    finally:
+        close_reg_key(h_key, pool)
 
 
-def write_reg_binary_value(hkey, sub_key, value_name, data):
+def write_reg_binary_value(hkey, sub_key, value_name, data, pool=None):
     """
     写入二进制数据到注册表
 
+    参数:
+        data: bytes / bytearray / memoryview (可写缓冲区直接传给 RegSetValueEx，不复制)
+        pool: 可选的 RegistryHandlePool，提供时复用已打开的句柄
+
     返回:
         bool: 写入是否成功
     """
-    h_key = wintypes.HKEY()
-    if RegOpenKeyEx(hkey, sub_key, 0, KEY_WRITE, ctypes.byref(h_key)) != ERROR_SUCCESS:
+    h_key = open_reg_key(hkey, sub_key, KEY_WRITE, pool)
+    if h_key is None:
         return False
 
-    # 准备数据
-    data_size = len(data)
-    data_buffer = (ctypes.c_ubyte * data_size)(*data)
-
     # 写入数据
-    result = RegSetValueEx(
+    pointer, size = _data_pointer(data)
+    result = _api().RegSetValueEx(
         h_key,
         value_name,
         0,
         REG_BINARY,
-        data_buffer,
-        data_size
+        pointer,
+        size
     )
 
-    RegCloseKey(h_key)
+    close_reg_key(h_key, pool)
     return result == ERROR_SUCCESS
+
+
+def query_reg_key_info(h_key):
+    """
+    通过 RegQueryInfoKey 获取已打开键的统计信息
+
+    返回:
+        dict: 值数量、最长值名称(字符数)、最长数据(字节数)、最后写入时间(FILETIME整数)
+    """
+    values = wintypes.DWORD()
+    max_name_len = wintypes.DWORD()
+    max_value_len = wintypes.DWORD()
+    last_write = wintypes.FILETIME()
+    result = _api().RegQueryInfoKey(
+        h_key, None, None, None, None, None, None,
+        ctypes.byref(values),
+        ctypes.byref(max_name_len),
+        ctypes.byref(max_value_len),
+        None,
+        ctypes.byref(last_write)
+    )
+    if result != ERROR_SUCCESS:
+        raise ctypes.WinError(result)
+    return {
+        'values': values.value,
+        'max_name_len': max_name_len.value,
+        'max_value_len': max_value_len.value,
+        'last_write': (last_write.dwHighDateTime << 32) | last_write.dwLowDateTime,
+    }
+
+
+def enum_reg_values(hkey, sub_key, pool=None):
+    """
+    单次枚举读取键下所有值的名称、类型和原始数据
+
+    名称和数据缓冲区按 RegQueryInfoKey 返回的最大长度预先分配并在整个枚举中复用，
+    仅当枚举期间有更长的值写入 (ERROR_MORE_DATA) 时扩容重试。
+
+    参数:
+        pool: 可选的 RegistryHandlePool，提供时复用已打开的句柄
+
+    返回:
+        list: [(值名称, 值类型, bytes数据)]，打开失败时抛出 OSError
+    """
+    h_key = open_reg_key(hkey, sub_key, KEY_READ, pool)
+    if h_key is None:
+        raise FileNotFoundError(2, "注册表路径不存在", sub_key)
+
+    try:
+        info = query_reg_key_info(h_key)
+        name_capacity = info['max_name_len'] + 1
+        data_capacity = max(info['max_value_len'], 1)
+        name_buffer = ctypes.create_unicode_buffer(name_capacity)
+        data_buffer = (ctypes.c_ubyte * data_capacity)()
+        name_len = wintypes.DWORD()
+        data_type = wintypes.DWORD()
+        data_size = wintypes.DWORD()
+        reg_enum_value = _api().RegEnumValue
+
+        values = []
+        index = 0
+        while True:
+            name_len.value = name_capacity
+            data_size.value = data_capacity
+            result = reg_enum_value(
+                h_key,
+                index,
+                name_buffer,
+                ctypes.byref(name_len),
+                None,
+                ctypes.byref(data_type),
+                data_buffer,
+                ctypes.byref(data_size)
+            )
+            if result == ERROR_NO_MORE_ITEMS:
+                break
+            if result == ERROR_MORE_DATA:
+                # 枚举期间出现了更长的值，扩容后重试当前索引
+                name_capacity *= 2
+                data_capacity = max(data_capacity * 2, data_size.value)
+                name_buffer = ctypes.create_unicode_buffer(name_capacity)
+                data_buffer = (ctypes.c_ubyte * data_capacity)()
+                continue
+            if result != ERROR_SUCCESS:
+                raise ctypes.WinError(result)
+
+            values.append((
+                name_buffer.value,
+                data_type.value,
+                ctypes.string_at(data_buffer, data_size.value)
+            ))
+            index += 1
+        return values
+    finally:
+        close_reg_key(h_key, pool)
+
+
+class RegistryChangeNotifier:
+    """
+    注册表值变化通知
+
+    通过 RegNotifyChangeKeyValue 异步订阅路径下值的写入，等待期间阻塞在事件对象上，不占用CPU。
+    通知为一次性的，每次触发后重新订阅。
+    """
+
+    def __init__(self, hkey, sub_key):
+        self._h_key = wintypes.HKEY()
+        result = _api().RegOpenKeyEx(hkey, sub_key, 0, KEY_NOTIFY, ctypes.byref(self._h_key))
+        if result != ERROR_SUCCESS:
+            raise ctypes.WinError(result)
+        self._event = _api().CreateEvent(None, False, False, None)
+        if not self._event:
+            _api().RegCloseKey(self._h_key)
+            raise ctypes.WinError(ctypes.get_last_error())
+        self._subscribe()
+
+    def _subscribe(self):
+        # 线程无关的订阅: 等待线程与订阅线程可以不同
+        result = _api().RegNotifyChangeKeyValue(
+            self._h_key, False, REG_NOTIFY_CHANGE_LAST_SET | REG_NOTIFY_THREAD_AGNOSTIC, self._event, True
+        )
+        if result != ERROR_SUCCESS:
+            raise ctypes.WinError(result)
+
+    def wait(self, timeout):
+        """
+        等待值变化
+
+        参数:
+            timeout: 最长等待秒数
+
+        返回:
+            bool: 超时前发生变化返回True
+        """
+        if _api().WaitForSingleObject(self._event, int(timeout * 1000)) != WAIT_OBJECT_0:
+            return False
+        self._subscribe()
+        return True
+
+    def close(self):
+        if self._event:
+            _api().CloseHandle(self._event)
+            self._event = None
+        if self._h_key:
+            _api().RegCloseKey(self._h_key)
+            self._h_key = wintypes.HKEY()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
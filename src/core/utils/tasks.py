@@ -0,0 +1,70 @@
+"""
+异步任务编排
+将阻塞操作交给线程池执行，并发运行相互独立的任务并输出进度
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def com_apartment(func):
+    """
+    包装在工作线程中使用COM的函数
+
+    win32com 对象只能在已初始化COM的线程中创建，线程池中的线程需要自行初始化与释放。
+    未安装 pywin32 时直接执行 (不使用COM的实现，如直接生成 .lnk 文件)。
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            import pythoncom
+        except ImportError:
+            return func(*args, **kwargs)
+        pythoncom.CoInitialize()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            pythoncom.CoUninitialize()
+    return wrapper
+
+
+async def run_blocking_tasks(tasks, logger):
+    """
+    并发执行多个阻塞任务，每完成一个输出一次进度
+
+    参数:
+        tasks: [(任务名称, 无参可调用对象)]
+        logger: 输出进度的日志记录器
+
+    返回:
+        list: 按任务顺序排列的结果，任务抛出异常时对应位置为该异常
+    """
+    loop = asyncio.get_running_loop()
+    total = len(tasks)
+    start = time.perf_counter()
+
+    async def run(index, func):
+        task_start = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(executor, func)
+        except Exception as e:
+            result = e
+        return index, result, time.perf_counter() - task_start
+
+    with ThreadPoolExecutor(max_workers=max(1, total), thread_name_prefix="Task") as executor:
+        for label, _ in tasks:
+            logger.info(f"开始: {label}")
+        results = [None] * total
+        pending = [run(index, func) for index, (_, func) in enumerate(tasks)]
+        for done, future in enumerate(asyncio.as_completed(pending), 1):
+            index, result, elapsed = await future
+            results[index] = result
+            label = tasks[index][0]
+            if isinstance(result, Exception):
+                logger.error(f"[{done}/{total}] {label} 失败: {str(result)} ({elapsed * 1000:.0f} ms)")
+            else:
+                logger.info(f"[{done}/{total}] {label} 完成 ({elapsed * 1000:.0f} ms)")
+
+    logger.info(f"全部任务完成, 总耗时 {(time.perf_counter() - start) * 1000:.0f} ms")
+    return results
@@ -1,44 +1,23 @@
 import ctypes
+import functools
+import multiprocessing
 import os
-import re
-import winreg
 import argparse
 from enum import Enum, auto
 
 from src.bootstrap import initialize_app
 from src.core.di.provider import DependencyProvider
-from src.core.exceptions.exceptions import RegistryOperationError
-from src.core.utils.logger import LoggerManager
-from src.modules.reg_unlock_fps import RegUnlockFPSService
-from src.modules.zero_sensitivity import ZeroSensitivityService
-from src.modules.game_shortcut import GameShortcutService
-from src.modules.reg_unlock_fov import RegUnlockFOVService
-
-# 配置正则表达式模式
-SENSITIVITY_PATTERN = re.compile(
-    r"^CODM_\d+_"
-    r"iMSDK_CN_"
-    r"(PVE|PVP|TD|Br|PVEFiring|PVPFiring|TDFiring|BrFiring)"
-    r"(_(?:RotateSensitive|AimRotate|ReddotHolo|Sniper|Free|ACOG|[\dX]+|SkyVehicle|GroundVehicle|Vertical|Ult).*?)?"
-    r"_h\d+$",
-    re.IGNORECASE
-)
-
-FPS_UNLOCK_PATTERN = re.compile(
-    r"^CODM_\d+_"
-    r"iMSDK_CN_"
-    r"(EnableFramerateCustomize|FramerateCustomizeValue)"
-    r"_h\d+$",
-    re.IGNORECASE
-)
-
-FOV_UNLOCK_PATTERN = re.compile(
-    r"^CODM_\d+_"
-    r"iMSDK_CN_"
-    r"(BRWeaponFov|MPWeaponFov)"
-    r"_h\d+$",
-    re.IGNORECASE
-)
+from src.core.exceptions.exceptions import PatchRuleError, RegistryDataError
+from src.core.registry.backend import HKEY_CURRENT_USER
+from src.core.utils.logger import LoggerManager, OverflowPolicy
+from src.modules.registry_sweep import RegistryOperation
+from src.modules.registry_sweep.operations import OPERATION_LABELS
+
+# 各服务模块在实际使用时才导入，只执行部分操作时不加载无关模块
+
+# CODM注册表路径
+CODM_ROOT_KEY = HKEY_CURRENT_USER
+CODM_SUB_KEY = r"SOFTWARE\Tencent\Call-of-Duty"
 
 
 class MenuOption(Enum):
@@ -66,70 +45,91 @@ class MenuOption(Enum):
         return None
 
 
-class RegistryOperation(Enum):
-    """注册表操作类型枚举"""
-    SENSITIVITY = auto()
-    FPS_UNLOCK = auto()
-    FOV_UNLOCK = auto()
+def missing_path_message(error):
+    """
+    FileNotFoundError 的说明
 
+    离线配置单元等文件不存在时给出文件路径，Windows API 未给出路径时为CODM注册表路径。
+    """
+    if error.filename:
+        return f"{error.strerror}: {error.filename}"
+    return f"注册表路径不存在: HKEY_CURRENT_USER\\{CODM_SUB_KEY}"
 
-def process_codm_registry(operation: RegistryOperation, fov_value: int = 0xFF):
-    """处理CODM注册表键值"""
+
+def process_codm_registries(operations, fov_value: int = 0xFF, dry_run: bool = False, workers: int = 1):
+    """单次枚举CODM注册表键值，同时处理多个操作"""
     logger = LoggerManager.get_logger("RegistryProcessor", show_time=False)
-    root_key = winreg.HKEY_CURRENT_USER
-    sub_key = r"SOFTWARE\Tencent\Call-of-Duty"
+    operations = set(operations)
 
     # 验证FOV值范围
-    if operation == RegistryOperation.FOV_UNLOCK and not (0 <= fov_value <= 255):
+    if RegistryOperation.FOV_UNLOCK in operations and not (0 <= fov_value <= 255):
         logger.error(f"错误：FOV值 {fov_value} 超出范围 (0-255)")
-        return
+        return None
 
     try:
-        # 获取服务实例
-        fps_service = DependencyProvider.get(RegUnlockFPSService)
-        sensitivity_service = DependencyProvider.get(ZeroSensitivityService)
-        fov_service = DependencyProvider.get(RegUnlockFOVService)
+        from src.modules.registry_sweep import RegistrySweepService
+        sweep_service = DependencyProvider.get(RegistrySweepService)
+        return sweep_service.sweep(CODM_ROOT_KEY, CODM_SUB_KEY, operations, fov_value,
+                                   dry_run=dry_run, workers=workers)
+    except FileNotFoundError as e:
+        logger.error(missing_path_message(e))
+    except RegistryDataError as e:
+        logger.error(f"注册表文件格式错误: {str(e)}")
+    except Exception as e:
+        logger.critical(f"处理注册表时发生未知错误: {str(e)}")
+    return None
 
-        # 打开注册表键
-        with winreg.OpenKey(
-                root_key, sub_key, 0, winreg.KEY_READ | winreg.KEY_WRITE
-        ) as key:
-            logger.info(f"成功打开注册表路径: HKEY_CURRENT_USER\\{sub_key}")
 
-            i = 0
-            while True:
-                try:
-                    # 枚举所有键值
-                    name, value, value_type = winreg.EnumValue(key, i)
-
-                    # 根据操作类型处理注册表项
-                    if operation == RegistryOperation.SENSITIVITY and SENSITIVITY_PATTERN.match(name):
-                        try:
-                            sensitivity_service.apply_zero_sensitivity(root_key, sub_key, name)
-                        except RegistryOperationError as e:
-                            logger.error(f"灵敏度设置失败: {str(e)}")
-
-                    elif operation == RegistryOperation.FPS_UNLOCK and FPS_UNLOCK_PATTERN.match(name):
-                        try:
-                            fps_service.apply_reg_unlock(root_key, sub_key, name)
-                        except RegistryOperationError as e:
-                            logger.error(f"帧率解锁失败: {str(e)}")
-
-                    elif operation == RegistryOperation.FOV_UNLOCK and FOV_UNLOCK_PATTERN.match(name):
-                        try:
-                            fov_service.apply_reg_unlock(root_key, sub_key, name, fov_value)
-                        except RegistryOperationError as e:
-                            logger.error(f"FOV设置失败: {str(e)}")
-
-                    i += 1
-                except OSError:
-                    logger.info("注册表处理完成")
-                    break
-
-    except FileNotFoundError:
-        logger.error(f"注册表路径不存在: HKEY_CURRENT_USER\\{sub_key}")
+def process_codm_registry(operation: RegistryOperation, fov_value: int = 0xFF, dry_run: bool = False,
+                          workers: int = 1):
+    """处理CODM注册表键值"""
+    return process_codm_registries({operation}, fov_value, dry_run, workers)
+
+
+def process_rule_file(rules_path, fov_value: int = 0xFF, dry_run: bool = False, workers: int = 1):
+    """按规则文件 (内置规则 + 文件中的规则) 单次枚举处理CODM注册表键值"""
+    logger = LoggerManager.get_logger("RegistryProcessor", show_time=False)
+    if not (0 <= fov_value <= 255):
+        logger.error(f"错误：FOV值 {fov_value} 超出范围 (0-255)")
+        return None
+
+    try:
+        from src.modules.patch_rules import load_rules
+        from src.modules.registry_sweep import RegistrySweepService
+        rules = load_rules(rules_path, {'fov': fov_value})
+        logger.info(f"已加载 {len(rules)} 条修改规则: {', '.join(rule.name for rule in rules)}")
+        sweep_service = DependencyProvider.get(RegistrySweepService)
+        return sweep_service.sweep_rules(CODM_ROOT_KEY, CODM_SUB_KEY, rules, dry_run=dry_run, workers=workers)
+    except PatchRuleError as e:
+        logger.error(f"规则文件无效: {str(e)}")
+    except FileNotFoundError as e:
+        logger.error(missing_path_message(e))
+    except RegistryDataError as e:
+        logger.error(f"注册表文件格式错误: {str(e)}")
     except Exception as e:
         logger.critical(f"处理注册表时发生未知错误: {str(e)}")
+    return None
+
+
+def watch_codm_registries(operations, fov_value: int = 0xFF, workers: int = 1):
+    """持续监视CODM注册表，游戏内修改设置后自动重新处理变化的键值"""
+    logger = LoggerManager.get_logger("RegistryProcessor", show_time=False)
+
+    # 验证FOV值范围
+    if RegistryOperation.FOV_UNLOCK in operations and not (0 <= fov_value <= 255):
+        logger.error(f"错误：FOV值 {fov_value} 超出范围 (0-255)")
+        return
+
+    try:
+        from src.modules.registry_sweep import RegistrySweepService
+        sweep_service = DependencyProvider.get(RegistrySweepService)
+        sweep_service.watch(CODM_ROOT_KEY, CODM_SUB_KEY, operations, fov_value, workers=workers)
+    except FileNotFoundError as e:
+        logger.error(missing_path_message(e))
+    except RegistryDataError as e:
+        logger.error(f"注册表文件格式错误: {str(e)}")
+    except Exception as e:
+        logger.critical(f"监视注册表时发生未知错误: {str(e)}")
 
 
 def create_exclusive_shortcut():
@@ -137,6 +137,7 @@ def create_exclusive_shortcut():
     logger = LoggerManager.get_logger("ShortcutCreator", show_time=False)
     try:
         # 获取服务实例
+        from src.modules.game_shortcut import GameShortcutService
         shortcut_service = DependencyProvider.get(GameShortcutService)
 
         # 创建快捷方式
@@ -148,6 +149,88 @@ def create_exclusive_shortcut():
         return False
 
 
+def parse_shortcut_specs(values):
+    """
+    解析 --shortcut 参数
+
+    参数:
+        values: ["名称=启动参数", ...]
+
+    返回:
+        list: ShortcutSpec 列表
+    """
+    from src.modules.game_shortcut import ShortcutSpec
+
+    specs = []
+    for value in values:
+        name, separator, arguments = value.partition("=")
+        if not separator or not name.strip():
+            raise ValueError(f"快捷方式参数格式应为 名称=启动参数: {value}")
+        specs.append(ShortcutSpec(name.strip(), arguments.strip()))
+    return specs
+
+
+def create_game_shortcuts(values):
+    """按 --shortcut 参数批量创建快捷方式"""
+    logger = LoggerManager.get_logger("ShortcutCreator", show_time=False)
+    try:
+        from src.modules.game_shortcut import GameShortcutService
+        specs = parse_shortcut_specs(values)
+        shortcut_service = DependencyProvider.get(GameShortcutService)
+
+        results = shortcut_service.create_shortcuts(specs)
+        created = [result for result in results if result['success']]
+        logger.success(f"已创建 {len(created)}/{len(results)} 个快捷方式到桌面: "
+                       f"{', '.join(os.path.basename(result['path']) for result in created)}")
+        return len(created) == len(results)
+    except Exception as e:
+        logger.error(f"创建快捷方式失败: {str(e)}")
+        return False
+
+
+def shortcut_task(args):
+    """命令行参数对应的快捷方式创建函数"""
+    if args.shortcut:
+        return functools.partial(create_game_shortcuts, args.shortcut)
+    return create_exclusive_shortcut
+
+
+def log_skipped_shortcut(args, logger, reason):
+    """输出未执行的快捷方式创建计划"""
+    names = ", ".join(args.shortcut) if args.shortcut else "全屏独占模式快捷方式"
+    logger.info(f"跳过创建快捷方式 ({names}): {reason}")
+
+
+async def run_all_operations(args, logger):
+    """
+    并发执行所有优化操作
+
+    注册表处理 (单次枚举完成灵敏度/帧率/FOV) 与游戏进程查找及快捷方式创建互不依赖，
+    分别在工作线程中运行，总耗时取决于最慢的一项。
+    dry-run 以及修改 .reg 文件/离线配置单元 (不涉及本机游戏) 时只输出快捷方式计划。
+    """
+    from src.core.utils.tasks import com_apartment, run_blocking_tasks
+
+    if args.rules:
+        # 规则集包含全部内置规则 (灵敏度/帧率/FOV)，以及规则文件中的规则
+        registry_task = functools.partial(process_rule_file, args.rules, args.fov_value, args.dry_run, args.workers)
+    else:
+        operations = {RegistryOperation.SENSITIVITY, RegistryOperation.FPS_UNLOCK, RegistryOperation.FOV_UNLOCK}
+        registry_task = functools.partial(
+            process_codm_registries, operations, args.fov_value, args.dry_run, args.workers)
+    tasks = [("注册表优化", registry_task)]
+    if args.dry_run:
+        log_skipped_shortcut(args, logger, "dry-run 模式不写入任何文件")
+    elif args.reg_file or args.hive:
+        log_skipped_shortcut(args, logger, "正在修改离线文件，不涉及本机游戏")
+    else:
+        tasks.append(("创建快捷方式", com_apartment(shortcut_task(args))))
+
+    results = await run_blocking_tasks(tasks, logger)
+    if len(results) > 1 and results[1] is True:
+        logger.info("快捷方式创建成功")
+
+
 def logger_banner(logger):
     """显示横幅信息"""
     logger.info("{color:yellow}CODM Tactix Hub{/color} - 注册表优化工具")
@@ -204,42 +287,232 @@ def parse_arguments():
         action='store_true',
         help='执行所有优化操作 (灵敏度 + 帧率解锁 + FOV解锁)'
     )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='仅显示修改计划及数量，不写入注册表'
+    )
+    parser.add_argument(
+        '--reg-file',
+        metavar='PATH',
+        help='修改regedit导出的.reg文件而非当前注册表 (无需管理员权限)'
+    )
+    parser.add_argument(
+        '--hive',
+        metavar='PATH',
+        help='直接修改离线用户配置文件中的 NTUSER.DAT (仅原地修改, 无需管理员权限, 可在Linux上运行)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='并行写入注册表的线程数 (默认1, 串行写入)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='持续运行，游戏内修改设置后自动重新应用所选优化 (未选择时为灵敏度 + 帧率解锁)'
+    )
+    parser.add_argument(
+        '--async-log',
+        choices=[policy.value for policy in OverflowPolicy],
+        metavar='POLICY',
+        help='由后台线程批量输出日志，队列满时的处理策略: block / drop-oldest / summarize'
+    )
+    parser.add_argument(
+        '--journal',
+        metavar='PATH',
+        help='将每个键值的处理结果以 JSON Lines 格式追加写入指定文件 (按大小轮转)'
+    )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='不使用持久化分类索引，每次完整枚举注册表'
+    )
+    parser.add_argument(
+        '--rules',
+        metavar='PATH',
+        help='按规则文件 (JSON / TOML) 执行内置规则及文件中的规则，同名规则以文件为准'
+    )
+    parser.add_argument(
+        '--columnar',
+        action='store_true',
+        help='以列式快照批量计算灵敏度与FOV修改 (需要安装 numpy)'
+    )
+    parser.add_argument(
+        '--game-path',
+        metavar='PATH',
+        help='游戏未运行时用于创建快捷方式的 CODM.exe 路径'
+    )
+    parser.add_argument(
+        '--shortcut',
+        action='append',
+        metavar='NAME=ARGS',
+        help='创建名为 NAME、启动参数为 ARGS 的快捷方式 (可重复指定，一次创建多个)'
+    )
+    parser.add_argument(
+        '--shortcut-backend',
+        choices=['com', 'lnk'],
+        default='com',
+        help='快捷方式生成方式: com (WScript.Shell, 默认) / lnk (直接写入.lnk文件, 无需pywin32)'
+    )
+
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    batch_parser = subparsers.add_parser(
+        'batch',
+        help='批量处理离线配置单元 (NTUSER.DAT) 与 .reg 文件',
+        description='在多个进程中批量处理离线配置单元与 .reg 文件。'
+                    '未选择修改项时为灵敏度 + 帧率解锁，例如: batch D:\\Profiles --all --jobs 8',
+    )
+    # 修改项选项也可以写在子命令之后 (未指定时沿用子命令之前的取值)
+    for flag, help_text in (('--sensitivity', '应用灵敏度优化'), ('--fps-unlock', '解锁帧率限制'),
+                            ('--fov-unlock', '解锁FOV设置'), ('--all', '执行所有优化操作'),
+                            ('--dry-run', '仅统计修改计划，不写入文件')):
+        batch_parser.add_argument(flag, action='store_true', default=argparse.SUPPRESS, help=help_text)
+    batch_parser.add_argument(
+        '--fov-value',
+        type=lambda x: int(x, 0),
+        default=argparse.SUPPRESS,
+        help='自定义FOV值 (0-255, 十六进制, 默认0xFF)'
+    )
+    batch_parser.add_argument(
+        '--rules',
+        metavar='PATH',
+        default=argparse.SUPPRESS,
+        help='按规则文件 (JSON / TOML) 处理'
+    )
+    batch_parser.add_argument(
+        'paths',
+        nargs='+',
+        metavar='PATH',
+        help='目录 (递归查找 NTUSER.DAT 与 .reg 文件)、通配符 (支持 **) 或文件路径'
+    )
+    batch_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        metavar='N',
+        help='工作进程数 (默认为CPU核心数)'
+    )
+    batch_parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=0,
+        metavar='N',
+        help='每次提交给工作进程的文件数 (默认按文件数与进程数自动计算)'
+    )
 
     return parser.parse_args()
 
 
+def selected_operations(args):
+    """命令行选项对应的修改操作 (未选择时为灵敏度 + 帧率解锁)"""
+    operations = set()
+    if args.all or args.sensitivity:
+        operations.add(RegistryOperation.SENSITIVITY)
+    if args.all or args.fps_unlock:
+        operations.add(RegistryOperation.FPS_UNLOCK)
+    if args.all or args.fov_unlock:
+        operations.add(RegistryOperation.FOV_UNLOCK)
+    return operations or {RegistryOperation.SENSITIVITY, RegistryOperation.FPS_UNLOCK}
+
+
+def check_rule_flags(args, logger):
+    """规则文件已包含全部内置规则，单独选择的修改项无法生效，同时指定时报错"""
+    if args.rules and (args.sensitivity or args.fps_unlock or args.fov_unlock):
+        logger.error("--rules 会执行全部内置规则 (灵敏度 + 帧率解锁 + FOV解锁)，"
+                     "不能与 --sensitivity / --fps-unlock / --fov-unlock 同时使用")
+        return False
+    return True
+
+
+def run_batch(args, logger):
+    """batch 子命令: 在进程池中批量处理离线配置单元与 .reg 文件"""
+    if not check_rule_flags(args, logger):
+        return None
+    if not (0 <= args.fov_value <= 255):
+        logger.error(f"错误：FOV值 {args.fov_value} 超出范围 (0-255)")
+        return None
+    if (args.jobs is not None and args.jobs < 1) or args.chunk_size < 0:
+        logger.error("--jobs 必须大于0, --chunk-size 不能为负数")
+        return None
+
+    from src.modules.batch_sweep import BatchSweepService, discover_files
+    files = discover_files(args.paths)
+    if not files:
+        logger.error(f"未找到配置单元或 .reg 文件: {', '.join(args.paths)}")
+        return None
+
+    operations = selected_operations(args)
+    if args.rules:
+        logger.info(f"按规则文件批量处理 {len(files)} 个文件: {args.rules}")
+    else:
+        logger.info(f"批量处理 {len(files)} 个文件: "
+                    f"{', '.join(OPERATION_LABELS[operation] for operation in RegistryOperation if operation in operations)}")
+    batch_service = BatchSweepService(args.jobs, args.chunk_size)
+    report = batch_service.run(files, CODM_ROOT_KEY, CODM_SUB_KEY, operations, args.fov_value,
+                               args.dry_run, args.rules)
+    batch_service.log_report(report)
+    return report
+
+
 def run_from_command_line(args, logger):
     """根据命令行参数执行操作"""
+    if not check_rule_flags(args, logger):
+        return False
+
+    # 监视模式
+    if args.watch:
+        if args.dry_run:
+            logger.error("--watch 不能与 --dry-run 同时使用")
+            return False
+        if args.rules:
+            logger.error("--watch 不支持 --rules")
+            return False
+        watch_codm_registries(selected_operations(args), args.fov_value, args.workers)
+        return True
+
     # 执行所有操作
     if args.all:
         logger.info("执行所有优化操作...")
-        process_codm_registry(RegistryOperation.SENSITIVITY)
-        process_codm_registry(RegistryOperation.FPS_UNLOCK)
-        process_codm_registry(RegistryOperation.FOV_UNLOCK, args.fov_value)
-        if create_exclusive_shortcut():
-            logger.info("快捷方式创建成功")
+        import asyncio
+        asyncio.run(run_all_operations(args, logger))
         logger.info("所有操作已完成!")
         return True
 
     # 执行单个操作
     executed = False
 
+    if args.rules:
+        logger.info(f"按规则文件处理: {args.rules}")
+        process_rule_file(args.rules, args.fov_value, args.dry_run, args.workers)
+        executed = True
+
     if args.sensitivity:
         logger.info("应用灵敏度优化...")
-        process_codm_registry(RegistryOperation.SENSITIVITY)
+        process_codm_registry(RegistryOperation.SENSITIVITY, dry_run=args.dry_run, workers=args.workers)
         executed = True
 
     if args.fps_unlock:
         logger.info("解锁帧率限制...")
-        process_codm_registry(RegistryOperation.FPS_UNLOCK)
+        process_codm_registry(RegistryOperation.FPS_UNLOCK, dry_run=args.dry_run, workers=args.workers)
         executed = True
 
     if args.fov_unlock:
         logger.info(f"解锁FOV设置 (值: 0x{args.fov_value:02X})...")
-        process_codm_registry(RegistryOperation.FOV_UNLOCK, args.fov_value)
+        process_codm_registry(RegistryOperation.FOV_UNLOCK, args.fov_value, args.dry_run, args.workers)
         executed = True
 
-    if args.create_shortcut:
+    if (args.shortcut or args.create_shortcut) and args.dry_run:
+        log_skipped_shortcut(args, logger, "dry-run 模式不写入任何文件")
+        executed = True
+    elif args.shortcut:
+        logger.info("批量创建快捷方式...")
+        if create_game_shortcuts(args.shortcut):
+            logger.info("快捷方式创建成功")
+        executed = True
+    elif args.create_shortcut:
         logger.info("创建全屏独占模式快捷方式...")
         if create_exclusive_shortcut():
             logger.info("快捷方式创建成功")
@@ -270,20 +543,33 @@ def get_valid_fov_input(logger):
 
 
 def main():
-    # 1. 检查管理员权限
-    is_admin = check_admin_privileges()
-    if not is_admin:
-        return
+    # 解析命令行参数
+    args = parse_arguments()
+
+    # 1. 检查管理员权限 (修改.reg文件或离线配置单元时无需)
+    if args.reg_file is None and args.hive is None and args.command != 'batch':
+        is_admin = check_admin_privileges()
+        if not is_admin:
+            return
 
-    initialize_app()
+    if args.async_log:
+        LoggerManager.enable_async(overflow=args.async_log)
+
+    initialize_app(reg_file=args.reg_file, use_index=not args.no_index, journal_path=args.journal,
+                   game_path=args.game_path, shortcut_backend=args.shortcut_backend, columnar=args.columnar,
+                   hive=args.hive)
     logger = LoggerManager.get_logger("Main", show_time=False)
 
     try:
-        # 解析命令行参数
-        args = parse_arguments()
+        # 批量处理离线文件
+        if args.command == 'batch':
+            logger_banner(logger)
+            run_batch(args, logger)
+            return
 
         # 检查是否有真正的操作标志被设置
-        operation_flags = ['sensitivity', 'fps_unlock', 'fov_unlock', 'create_shortcut', 'all']
+        operation_flags = ['sensitivity', 'fps_unlock', 'fov_unlock', 'create_shortcut', 'shortcut', 'rules', 'all',
+                           'watch']
         has_operation = any(getattr(args, flag) for flag in operation_flags)
         has_operation = has_operation or (args.fov_value != 0xFF and args.fov_unlock)
 
@@ -319,8 +605,7 @@ def main():
 
                 elif option == MenuOption.OPTIMIZE:
                     # 执行灵敏度优化和帧率解锁
-                    process_codm_registry(RegistryOperation.SENSITIVITY)
-                    process_codm_registry(RegistryOperation.FPS_UNLOCK)
+                    process_codm_registries({RegistryOperation.SENSITIVITY, RegistryOperation.FPS_UNLOCK})
                     logger.info("优化操作成功完成!")
                     input("按Enter键返回主菜单...")
                     os.system('cls')  # 清屏
@@ -345,8 +630,12 @@ def main():
     except Exception as e:
         logger.critical(f"程序运行时发生严重错误: {str(e)}")
     finally:
+        # 写出异步队列中剩余的日志
+        LoggerManager.shutdown()
         input("按Enter键退出程序...")
 
 
 if __name__ == "__main__":
+    # 打包后的可执行文件中，批量处理的工作进程需要在此接管启动
+    multiprocessing.freeze_support()
     main()
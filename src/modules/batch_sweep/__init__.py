@@ -0,0 +1,21 @@
+"""
+BatchSweep主模块
+在进程池中批量处理离线用户配置单元 (NTUSER.DAT) 与 .reg 导出文件，用于批量准备网吧/机房的用户配置
+"""
+
+from .service import BatchSweepService, BatchTask, discover_files, process_file
+
+
+def create_service(jobs=None, chunk_size=0) -> BatchSweepService:
+    """创建批量处理服务实例 (默认进程数为CPU核心数)"""
+    return BatchSweepService(jobs, chunk_size)
+
+
+# 公共API
+__all__ = [
+    'create_service',
+    'BatchSweepService',
+    'BatchTask',
+    'discover_files',
+    'process_file',
+]
@@ -0,0 +1,278 @@
+"""
+服务层实现
+在进程池中批量处理多个离线注册表文件 (NTUSER.DAT 配置单元或 .reg 导出文件)，
+每个文件在工作进程中独立完成一次单次枚举处理，主进程汇总各文件的结果
+"""
+import glob
+import logging
+import os
+import time
+import unicodedata
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from src.bootstrap import register_dependencies
+from src.core.di.provider import DependencyProvider
+from src.core.exceptions.exceptions import PatchRuleError
+from src.core.registry.backend import RegistryBackend
+from src.core.registry.hive import REGF_SIGNATURE
+from src.core.utils.logger import LoggerManager
+from src.modules.registry_sweep.operations import OPERATION_LABELS
+
+# 目录中递归查找的文件: 用户配置单元与 .reg 导出文件 (不区分大小写)
+HIVE_FILE_NAME = "ntuser.dat"
+REG_FILE_SUFFIX = ".reg"
+
+# 工作进程中只输出警告及以上级别的日志 (逐项结果由主进程按文件汇总)
+WORKER_LOGGERS = ("bootstrap", "RegistrySweep", "ZeroSensitivity", "RegUnlockFPS", "RegUnlockFOV", "PatchRules")
+
+# 单个文件的处理任务 (需要可序列化，传递给工作进程)
+BatchTask = namedtuple("BatchTask", ["path", "root_key", "sub_key", "operations", "fov_value", "dry_run", "rules_path"])
+
+
+def is_hive_file(path):
+    """文件是否为 regf 配置单元 (否则按 .reg 导出文件处理)"""
+    with open(path, "rb") as file:
+        return file.read(len(REGF_SIGNATURE)) == REGF_SIGNATURE
+
+
+def discover_files(patterns):
+    """
+    展开目录与通配符
+
+    参数:
+        patterns: 目录 (递归查找 NTUSER.DAT 与 .reg 文件)、通配符 (支持 **) 或文件路径
+
+    返回:
+        list: 去重后的文件路径 (按路径排序)
+    """
+    files = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(pattern)
+                for name in names
+                if name.lower() == HIVE_FILE_NAME or name.lower().endswith(REG_FILE_SUFFIX)
+            ]
+        elif any(char in pattern for char in "*?["):
+            candidates = [path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)]
+        else:
+            # 明确指定的文件不存在时保留，由处理结果报告错误
+            candidates = [pattern]
+        for path in candidates:
+            files.setdefault(os.path.normcase(os.path.abspath(path)), path)
+    return sorted(files.values())
+
+
+def _init_worker():
+    """工作进程初始化: 降低逐项日志的级别"""
+    for name in WORKER_LOGGERS:
+        LoggerManager.get_logger(name, level=logging.WARNING, show_time=False)
+
+
+def process_file(task):
+    """
+    在工作进程中处理单个文件 (模块级函数，可被进程池序列化)
+
+    每个文件重新注册依赖，使各服务与策略使用该文件的注册表后端。
+
+    返回:
+        dict: 文件处理结果 (operations 以显示名称为键)
+    """
+    result = {
+        'path': task.path,
+        'backend': None,
+        'total': 0,
+        'writes': 0,
+        'failed': 0,
+        'elapsed': 0.0,
+        'error': None,
+        'operations': {}
+    }
+    start = time.perf_counter()
+    backend = None
+    try:
+        hive = is_hive_file(task.path)
+        result['backend'] = "hive" if hive else "regfile"
+        register_dependencies(reg_file=None if hive else task.path, hive=task.path if hive else None,
+                              use_index=False)
+        backend = DependencyProvider.get(RegistryBackend)
+
+        # 延迟导入: 工作进程首次处理时才加载处理服务及各策略
+        from src.modules.registry_sweep import RegistrySweepService
+        sweep_service = DependencyProvider.get(RegistrySweepService)
+        if task.rules_path:
+            from src.modules.patch_rules import load_rules
+            rules = load_rules(task.rules_path, {'fov': task.fov_value})
+            report = sweep_service.sweep_rules(task.root_key, task.sub_key, rules, dry_run=task.dry_run)
+        else:
+            report = sweep_service.sweep(task.root_key, task.sub_key, task.operations, task.fov_value,
+                                         dry_run=task.dry_run)
+
+        result['total'] = report['total']
+        result['writes'] = report['writes']
+        for operation, stats in report['operations'].items():
+            label = OPERATION_LABELS.get(operation) or operation.label
+            result['operations'][label] = {
+                'matched': stats['matched'],
+                'modified': stats['planned'] if task.dry_run else stats['modified'],
+                'failed': stats['failed'],
+            }
+            result['failed'] += stats['failed']
+    except FileNotFoundError as e:
+        # 文件不存在时给出文件路径，注册表路径不存在时给出注册表路径
+        result['error'] = f"{e.strerror}: {e.filename}" if e.filename else f"文件或注册表路径不存在: {str(e)}"
+    except PatchRuleError as e:
+        result['error'] = f"规则文件无效: {str(e)}"
+    except ValueError as e:
+        # 配置单元 / .reg 文件格式错误
+        result['error'] = f"文件格式错误: {str(e)}"
+    except Exception as e:
+        result['error'] = f"处理失败: {str(e)}"
+    finally:
+        if backend is not None:
+            backend.close()
+        result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def _display_width(text):
+    """文本在终端中的显示宽度 (全角字符占两列)"""
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+
+
+def _pad(text, width, right=False):
+    """按显示宽度填充文本"""
+    padding = " " * max(0, width - _display_width(text))
+    return padding + text if right else text + padding
+
+
+def _format_table(headers, rows):
+    """格式化表格 (首列左对齐，其余列右对齐)"""
+    columns = [headers] + rows
+    widths = [max(_display_width(str(row[index])) for row in columns) for index in range(len(headers))]
+    return [
+        "  ".join(_pad(str(cell), widths[index], right=index > 0) for index, cell in enumerate(row))
+        for row in columns
+    ]
+
+
+class BatchSweepService:
+    """离线注册表文件批量处理服务"""
+
+    def __init__(self, jobs=None, chunk_size=0):
+        """
+        初始化服务
+
+        参数:
+            jobs: 工作进程数 (默认为CPU核心数)
+            chunk_size: 每次提交给工作进程的文件数 (0 为按文件数与进程数自动计算)
+        """
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.logger = LoggerManager.get_logger("BatchSweep", show_time=False)
+
+    def _chunk_size(self, count, jobs):
+        """每批提交的文件数 (与 multiprocessing.Pool.map 相同: 每个进程约分到4批)"""
+        if self.chunk_size > 0:
+            return self.chunk_size
+        chunk, extra = divmod(count, jobs * 4)
+        return max(1, chunk + (1 if extra else 0))
+
+    def run(self, files, root_key, sub_key, operations=(), fov_value=0xFF, dry_run=False, rules_path=None):
+        """
+        批量处理文件
+
+        参数:
+            files: 文件路径列表 (见 discover_files)
+            root_key: 注册表根键 (配置单元的根键映射为 HKEY_CURRENT_USER)
+            sub_key: 注册表子路径
+            operations: 需要执行的 RegistryOperation 集合
+            fov_value: FOV修改值 (仅 FOV_UNLOCK 使用)
+            dry_run: 仅计算修改计划，不写入文件
+            rules_path: 按规则文件处理 (忽略 operations)
+
+        返回:
+            dict: 汇总报告，results 为各文件的处理结果 (按文件顺序)
+        """
+        tasks = [
+            BatchTask(path, root_key, sub_key, frozenset(operations), fov_value, dry_run, rules_path)
+            for path in files
+        ]
+        jobs = min(self.jobs, len(tasks)) or 1
+        report = {
+            'files': len(tasks),
+            'succeeded': 0,
+            'failed': 0,
+            'total': 0,
+            'writes': 0,
+            'failed_values': 0,
+            'jobs': jobs,
+            'dry_run': dry_run,
+            'elapsed': 0.0,
+            'busy': 0.0,
+            'operations': {},
+            'results': []
+        }
+        if not tasks:
+            return report
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            results = executor.map(process_file, tasks, chunksize=self._chunk_size(len(tasks), jobs))
+            for index, result in enumerate(results, 1):
+                self._aggregate(report, result)
+                self.log_result(result, index, len(tasks))
+        report['elapsed'] = time.perf_counter() - start
+        return report
+
+    @staticmethod
+    def _aggregate(report, result):
+        """将单个文件的结果计入汇总报告"""
+        report['results'].append(result)
+        report['busy'] += result['elapsed']
+        if result['error'] is not None:
+            report['failed'] += 1
+            return
+        report['succeeded'] += 1
+        report['total'] += result['total']
+        report['writes'] += result['writes']
+        report['failed_values'] += result['failed']
+        for label, stats in result['operations'].items():
+            totals = report['operations'].setdefault(label, {'matched': 0, 'modified': 0, 'failed': 0})
+            for field, count in stats.items():
+                totals[field] += count
+
+    def log_result(self, result, index, count):
+        """输出单个文件的处理结果"""
+        if result['error'] is not None:
+            self.logger.error(f"[{index}/{count}] {result['path']}: {result['error']}")
+            return
+        self.logger.info(
+            f"[{index}/{count}] {result['path']} ({result['backend']}): "
+            f"枚举 {result['total']} 项, 写入 {result['writes']} 项, 失败 {result['failed']} 项, "
+            f"耗时 {result['elapsed'] * 1000:.0f} ms"
+        )
+
+    def log_report(self, report):
+        """输出汇总表格: 各操作的计数以及文件/秒、值/秒"""
+        if report['operations']:
+            modified = "计划修改" if report['dry_run'] else "修改"
+            for line in _format_table(
+                    ["操作", "匹配", modified, "失败"],
+                    [[label, stats['matched'], stats['modified'], stats['failed']]
+                     for label, stats in report['operations'].items()]):
+                self.logger.info(line)
+
+        elapsed = report['elapsed'] or 1e-9
+        for line in _format_table(
+                ["文件", "成功", "失败", "枚举值", "写入值", "耗时(s)", "文件/秒", "值/秒"],
+                [[report['files'], report['succeeded'], report['failed'], report['total'], report['writes'],
+                  f"{report['elapsed']:.2f}", f"{report['files'] / elapsed:.1f}",
+                  f"{report['total'] / elapsed:.0f}"]]):
+            self.logger.info(line)
+        self.logger.info(
+            f"批量处理完成: 进程数 {report['jobs']}, "
+            f"并行度 {report['busy'] / elapsed:.1f} (各文件耗时之和 / 总耗时)"
+        )
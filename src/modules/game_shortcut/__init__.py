@@ -3,7 +3,8 @@
 提供创建游戏快捷方式的功能
 """
 
-from .service import GameShortcutService
+from .service import GameShortcutService, EXCLUSIVE_SHORTCUT
+from .strategy import ShortcutSpec
 
 
 def create_service() -> GameShortcutService:
@@ -14,5 +15,7 @@ def create_service() -> GameShortcutService:
 # 公共API
 __all__ = [
     'create_service',
-    'GameShortcutService'
+    'GameShortcutService',
+    'ShortcutSpec',
+    'EXCLUSIVE_SHORTCUT'
 ]
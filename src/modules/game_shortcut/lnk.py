@@ -0,0 +1,174 @@
+"""
+Shell Link (.lnk) 文件读写
+按 [MS-SHLLINK] 格式直接生成快捷方式文件，不依赖 COM / pywin32，可在任意平台生成并逐字节校验
+
+生成的文件包含: 文件头、LinkInfo (本地路径)、字符串数据 (说明、工作目录、参数、图标) 和结束块。
+"""
+import struct
+
+# ShellLinkHeader
+HEADER_SIZE = 0x4C
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")  # {00021401-0000-0000-C000-000000000046}
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_NAME = 0x04
+HAS_RELATIVE_PATH = 0x08
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+
+# 字符串数据的顺序与对应标志
+STRING_FIELDS = [
+    (HAS_NAME, 'description'),
+    (HAS_RELATIVE_PATH, 'relative_path'),
+    (HAS_WORKING_DIR, 'working_directory'),
+    (HAS_ARGUMENTS, 'arguments'),
+    (HAS_ICON_LOCATION, 'icon_location'),
+]
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x01
+LINK_INFO_HEADER_SIZE = 0x24  # 包含 Unicode 路径偏移
+VOLUME_ID_SIZE = 0x11         # 固定部分 + 空卷标
+DRIVE_FIXED = 3
+
+FILE_ATTRIBUTE_ARCHIVE = 0x20
+
+# ShowCommand
+SW_SHOWNORMAL = 1
+SW_SHOWMAXIMIZED = 3
+SW_SHOWMINNOACTIVE = 7
+
+_HEADER = struct.Struct("<I16sII8s8s8sIiIHHII")
+
+
+def _link_info(target_path):
+    """LinkInfo 结构: 本地路径同时以 ANSI (非ASCII字符替换为?) 和 UTF-16 写入"""
+    volume_id = struct.pack("<IIII", VOLUME_ID_SIZE, DRIVE_FIXED, 0, 0x10) + b"\0"
+    local_base_path = target_path.encode("ascii", "replace") + b"\0"
+    common_path_suffix = b"\0"
+    local_base_path_unicode = target_path.encode("utf-16-le") + b"\0\0"
+    common_path_suffix_unicode = b"\0\0"
+
+    volume_id_offset = LINK_INFO_HEADER_SIZE
+    local_base_path_offset = volume_id_offset + len(volume_id)
+    common_path_suffix_offset = local_base_path_offset + len(local_base_path)
+    local_base_path_unicode_offset = common_path_suffix_offset + len(common_path_suffix)
+    common_path_suffix_unicode_offset = local_base_path_unicode_offset + len(local_base_path_unicode)
+    size = common_path_suffix_unicode_offset + len(common_path_suffix_unicode)
+
+    header = struct.pack(
+        "<IIIIIIIII", size, LINK_INFO_HEADER_SIZE, VOLUME_ID_AND_LOCAL_BASE_PATH,
+        volume_id_offset, local_base_path_offset, 0, common_path_suffix_offset,
+        local_base_path_unicode_offset, common_path_suffix_unicode_offset
+    )
+    return (header + volume_id + local_base_path + common_path_suffix
+            + local_base_path_unicode + common_path_suffix_unicode)
+
+
+def _string_data(text):
+    """StringData: UTF-16 码元数量 + UTF-16LE 内容 (无结束符)"""
+    data = text.encode("utf-16-le")
+    return struct.pack("<H", len(data) // 2) + data
+
+
+def build_shell_link(target_path, arguments="", working_directory="", icon_location="",
+                     icon_index=0, description="", show_command=SW_SHOWNORMAL):
+    """
+    生成 .lnk 文件内容
+
+    参数:
+        target_path: 目标程序的绝对路径
+        arguments: 命令行参数
+        working_directory: 起始位置
+        icon_location: 图标文件路径
+        icon_index: 图标索引
+        description: 说明 (鼠标悬停提示)
+        show_command: 窗口显示方式 (SW_SHOWNORMAL / SW_SHOWMAXIMIZED / SW_SHOWMINNOACTIVE)
+
+    返回:
+        bytes: 文件内容 (相同参数生成的内容完全一致)
+    """
+    strings = {
+        'description': description,
+        'relative_path': "",
+        'working_directory': working_directory,
+        'arguments': arguments,
+        'icon_location': icon_location,
+    }
+    flags = HAS_LINK_INFO | IS_UNICODE
+    string_data = b""
+    for flag, field in STRING_FIELDS:
+        if strings[field]:
+            flags |= flag
+            string_data += _string_data(strings[field])
+
+    header = _HEADER.pack(
+        HEADER_SIZE, LINK_CLSID, flags, FILE_ATTRIBUTE_ARCHIVE,
+        bytes(8), bytes(8), bytes(8),  # 创建 / 访问 / 修改时间 (未知时为0)
+        0, icon_index, show_command, 0, 0, 0, 0
+    )
+    # 末尾为 TerminalBlock (4字节0)
+    return header + _link_info(target_path) + string_data + bytes(4)
+
+
+def write_shell_link(path, target_path, **kwargs):
+    """
+    生成 .lnk 文件并写入磁盘
+
+    参数:
+        path: 快捷方式文件路径
+        target_path: 目标程序的绝对路径
+        kwargs: 传给 build_shell_link 的其他参数
+    """
+    data = build_shell_link(target_path, **kwargs)
+    with open(path, "wb") as file:
+        file.write(data)
+    return path
+
+
+def read_shell_link(data):
+    """
+    解析 .lnk 文件内容 (仅支持本模块生成的字段，用于校验)
+
+    返回:
+        dict: target_path、show_command、icon_index 以及各字符串字段
+    """
+    (header_size, clsid, flags, _, _, _, _, _, icon_index, show_command,
+     _, _, _, _) = _HEADER.unpack_from(data)
+    if header_size != HEADER_SIZE or clsid != LINK_CLSID:
+        raise ValueError("不是有效的 Shell Link 文件")
+
+    offset = HEADER_SIZE
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        (id_list_size,) = struct.unpack_from("<H", data, offset)
+        offset += 2 + id_list_size
+
+    result = {'target_path': None, 'show_command': show_command, 'icon_index': icon_index}
+    if flags & HAS_LINK_INFO:
+        size, info_header_size = struct.unpack_from("<II", data, offset)
+        if info_header_size >= LINK_INFO_HEADER_SIZE:
+            (unicode_offset,) = struct.unpack_from("<I", data, offset + 0x1C)
+            end = offset + unicode_offset
+            while data[end:end + 2] != b"\0\0":
+                end += 2
+            result['target_path'] = data[offset + unicode_offset:end].decode("utf-16-le")
+        else:
+            (local_offset,) = struct.unpack_from("<I", data, offset + 0x10)
+            start = offset + local_offset
+            result['target_path'] = data[start:data.index(b"\0", start)].decode("ascii", "replace")
+        offset += size
+
+    for flag, field in STRING_FIELDS:
+        result[field] = ""
+        if flags & flag:
+            (count,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            width = 2 if flags & IS_UNICODE else 1
+            raw = data[offset:offset + count * width]
+            result[field] = raw.decode("utf-16-le" if width == 2 else "ascii", "replace")
+            offset += count * width
+    return result
@@ -0,0 +1,141 @@
+"""
+游戏进程查找
+按进程名枚举 (不读取每个进程的可执行文件路径)，只对名称匹配的候选进程解析路径；
+缓存上次找到的进程 (PID、创建时间、路径)，下次先校验该进程是否仍在运行；
+游戏未运行时回退到配置的安装路径或上次记录的路径
+"""
+import json
+import os
+
+from src.core.utils.logger import LoggerManager
+from src.core.utils.paths import user_cache_dir
+from ...core.exceptions.exceptions import GameProcessNotFoundError
+
+
+class ProcessLookup:
+    """带缓存的游戏进程查找"""
+
+    def __init__(self, cache_path=None, install_path=None, process_iter=None, process_factory=None):
+        """
+        初始化查找器
+
+        参数:
+            cache_path: 上次查找结果的缓存文件 (为空时只在内存中缓存)
+            install_path: 游戏未运行时使用的可执行文件路径
+            process_iter: 进程枚举函数 (默认 psutil.process_iter)
+            process_factory: 按PID构造进程对象的函数 (默认 psutil.Process)
+        """
+        self.cache_path = cache_path
+        self.install_path = install_path
+        self._process_iter = process_iter
+        self._process_factory = process_factory
+        self._cache = None
+        self.logger = LoggerManager.get_logger("ProcessLookup", show_time=False)
+
+    @classmethod
+    def default_cache_path(cls):
+        """默认缓存文件位置 (用户缓存目录)"""
+        return os.path.join(user_cache_dir(), "process_cache.json")
+
+    def _entries(self):
+        """缓存的查找结果: 小写进程名 -> {pid, create_time, exe}"""
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path:
+                try:
+                    with open(self.cache_path, encoding="utf-8") as file:
+                        data = json.load(file)
+                    if isinstance(data, dict):
+                        self._cache = data
+                except (OSError, ValueError):
+                    pass
+        return self._cache
+
+    def _remember(self, key, pid, create_time, exe):
+        entries = self._entries()
+        entries[key] = {'pid': pid, 'create_time': create_time, 'exe': exe}
+        if self.cache_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+                with open(self.cache_path, "w", encoding="utf-8") as file:
+                    json.dump(entries, file, ensure_ascii=False)
+            except OSError:
+                # 缓存写入失败不影响查找结果
+                pass
+
+    def _check_cached(self, psutil, key, entry):
+        """缓存的进程是否仍在运行 (按创建时间排除PID复用)"""
+        try:
+            proc = self._process_factory(entry['pid'])
+            name = proc.name()
+            if name and name.lower() == key and proc.create_time() == entry['create_time']:
+                return entry['exe']
+        except (psutil.Error, KeyError, TypeError):
+            pass
+        return None
+
+    def _scan(self, psutil, key):
+        """
+        按名称枚举进程，只为名称匹配的进程读取路径
+
+        返回:
+            tuple: (pid, 创建时间, 路径)，未找到时返回None
+        """
+        for proc in self._process_iter(['name'], ad_value=None):
+            name = proc.info.get('name')
+            # 无权限或已退出的进程名称可能为空
+            if not name or name.lower() != key:
+                continue
+            try:
+                exe = proc.exe()
+                if exe:
+                    return proc.pid, proc.create_time(), exe
+            except psutil.Error:
+                continue
+        return None
+
+    def _fallback(self, entry):
+        """游戏未运行时可用的路径: 配置的安装路径优先，其次为上次记录的路径"""
+        candidates = [(self.install_path, "安装路径")]
+        if entry:
+            candidates.append((entry.get('exe'), "上次记录的路径"))
+        for path, label in candidates:
+            if path and os.path.isfile(path):
+                return path, label
+        return None, None
+
+    def find(self, process_name):
+        """
+        查找游戏可执行文件路径
+
+        参数:
+            process_name: 进程名称 (如 CODM.exe，不区分大小写)
+
+        返回:
+            str: 可执行文件路径
+        """
+        # 延迟导入: 只有创建快捷方式时才需要
+        import psutil
+        if self._process_iter is None:
+            self._process_iter = psutil.process_iter
+        if self._process_factory is None:
+            self._process_factory = psutil.Process
+
+        key = process_name.lower()
+        entry = self._entries().get(key)
+        if entry:
+            exe = self._check_cached(psutil, key, entry)
+            if exe:
+                self.logger.debug(f"使用缓存的进程: PID {entry['pid']}")
+                return exe
+
+        found = self._scan(psutil, key)
+        if found:
+            self._remember(key, *found)
+            return found[2]
+
+        path, label = self._fallback(entry)
+        if path:
+            self.logger.info(f"未找到运行中的 {process_name} 进程, 使用{label}: {path}")
+            return path
+        raise GameProcessNotFoundError(f"未找到运行中的 {process_name} 进程")
@@ -1,7 +1,10 @@
 from src.core.utils.logger import LoggerManager
 from src.core.utils.paths import resource_path
 from ...core.exceptions.exceptions import GameProcessNotFoundError, ShortcutCreationError
-from .strategy import BaseShortcutStrategy, DefaultShortcutStrategy
+from .strategy import BaseShortcutStrategy, DefaultShortcutStrategy, ShortcutSpec
+
+# 默认的全屏独占模式快捷方式
+EXCLUSIVE_SHORTCUT = ShortcutSpec("CODM全屏独占模式", "-window-mode exclusive 5")
 
 
 class GameShortcutService:
@@ -27,24 +30,35 @@ class GameShortcutService:
         返回:
             str: 创建的快捷方式路径
         """
+        result = self.create_shortcuts([EXCLUSIVE_SHORTCUT], game_name)[0]
+        if not result['success']:
+            raise ShortcutCreationError(result['error'])
+        return result['path']
+
+    def create_shortcuts(self, specs, game_name="CODM.exe"):
+        """
+        为同一游戏批量创建多个快捷方式 (只查找一次游戏进程)
+
+        参数:
+            specs: ShortcutSpec 列表 (不同的窗口模式、帧率预设或账号配置)
+            game_name: 游戏进程名称 (默认: CODM.exe)
+
+        返回:
+            list: 每个快捷方式的结果字典 (name, path, success, error)
+        """
         try:
             # 获取游戏路径
             game_path = self.strategy.find_game_process(game_name)
             self.logger.info(f"找到游戏进程: {game_path}")
-
-            # 创建快捷方式
-            shortcut_path = self.strategy.create_shortcut(
-                game_path,
-                "-window-mode exclusive 5",
-                "CODM全屏独占模式"
-            )
-
-            self.logger.success(f"快捷方式创建成功: {shortcut_path}")
-            return shortcut_path
-
         except GameProcessNotFoundError:
             self.logger.error(f"未找到运行中的游戏进程: {game_name}")
             raise
-        except ShortcutCreationError as e:
-            self.logger.error(f"快捷方式创建失败: {str(e)}")
-            raise
+
+        # 创建快捷方式
+        results = self.strategy.create_shortcuts(game_path, specs)
+        for result in results:
+            if result['success']:
+                self.logger.success(f"快捷方式创建成功: {result['path']}")
+            else:
+                self.logger.error(f"快捷方式创建失败: {result['error']}")
+        return results
@@ -1,14 +1,19 @@
 import os
-import psutil
-import win32com.client
 import ctypes
+from collections import namedtuple
 from ctypes import wintypes
-from ...core.exceptions.exceptions import GameProcessNotFoundError, ShortcutCreationError
+from ...core.exceptions.exceptions import ShortcutCreationError
+from .lnk import SW_SHOWNORMAL, write_shell_link
+from .process_lookup import ProcessLookup
 
 # 定义Windows常量
 CSIDL_DESKTOP = 0
 SHGFP_TYPE_CURRENT = 0
 
+# 快捷方式描述: 名称 (不含扩展名)、启动参数、说明、窗口显示方式
+ShortcutSpec = namedtuple("ShortcutSpec", ["name", "arguments", "description", "show_command"],
+                          defaults=["", SW_SHOWNORMAL])
+
 
 def get_desktop_path():
     """使用Windows API获取真实的桌面路径"""
@@ -33,44 +38,120 @@ class BaseShortcutStrategy:
         """创建快捷方式"""
         raise NotImplementedError("子类必须实现此方法")
 
+    def create_shortcuts(self, target_path, specs):
+        """
+        批量创建快捷方式 (默认逐个调用 create_shortcut)
+
+        返回:
+            list: 每个快捷方式的结果字典 (name, path, success, error)
+        """
+        results = []
+        for spec in specs:
+            try:
+                path = self.create_shortcut(target_path, spec.arguments, spec.name)
+                results.append({'name': spec.name, 'path': path, 'success': True, 'error': None})
+            except ShortcutCreationError as e:
+                results.append({'name': spec.name, 'path': None, 'success': False, 'error': str(e)})
+        return results
+
 
 class DefaultShortcutStrategy(BaseShortcutStrategy):
     """默认快捷方式策略"""
 
+    def __init__(self, lookup: ProcessLookup = None):
+        """
+        初始化策略
+
+        参数:
+            lookup: 游戏进程查找器 (默认使用用户缓存目录中的进程缓存)
+        """
+        self.lookup = lookup or ProcessLookup(ProcessLookup.default_cache_path())
+
     def find_game_process(self, process_name):
         """查找游戏进程路径"""
-        for proc in psutil.process_iter(['name', 'exe']):
-            if proc.info['name'].lower() == process_name.lower():
-                return proc.info['exe']
-        raise GameProcessNotFoundError(f"未找到运行中的 {process_name} 进程")
+        return self.lookup.find(process_name)
 
     def create_shortcut(self, target_path, arguments, shortcut_name):
         """创建快捷方式"""
+        result = self.create_shortcuts(target_path, [ShortcutSpec(shortcut_name, arguments)])[0]
+        if not result['success']:
+            raise ShortcutCreationError(result['error'])
+        return result['path']
+
+    def create_shortcuts(self, target_path, specs):
+        """
+        批量创建快捷方式 (共用一个 WScript.Shell 会话)
+
+        参数:
+            target_path: 游戏可执行文件路径
+            specs: ShortcutSpec 列表
+
+        返回:
+            list: 每个快捷方式的结果字典 (name, path, success, error)
+        """
+        # 获取桌面路径 - 使用新的方法
+        desktop = get_desktop_path()
+        # 确保目录存在
+        os.makedirs(desktop, exist_ok=True)
+        # 获取游戏目录作为起始位置
+        working_directory = os.path.dirname(target_path)
+
+        results = []
         try:
-            # 获取桌面路径 - 使用新的方法
-            desktop = get_desktop_path()
+            session = self._open_session()
+        except Exception as e:
+            error = f"创建快捷方式失败: {str(e)}"
+            return [{'name': spec.name, 'path': None, 'success': False, 'error': error} for spec in specs]
 
+        for spec in specs:
             # 创建快捷方式路径
-            shortcut_path = os.path.join(desktop, f"{shortcut_name}.lnk")
-
-            # 确保目录存在
-            os.makedirs(os.path.dirname(shortcut_path), exist_ok=True)
-
-            # 获取游戏目录作为起始位置
-            working_directory = os.path.dirname(target_path)
-
-            # 创建快捷方式
-            shell = win32com.client.Dispatch("WScript.Shell")
-            shortcut = shell.CreateShortCut(shortcut_path)
-            shortcut.TargetPath = target_path
-            shortcut.Arguments = arguments
-            shortcut.WorkingDirectory = working_directory  # 设置起始位置
-            shortcut.IconLocation = target_path
-            shortcut.save()
-
-            return shortcut_path
-        except Exception as e:
-            # 添加详细的错误信息
-            import traceback
-            error_details = traceback.format_exc()
-            raise ShortcutCreationError(f"创建快捷方式失败: {str(e)}\n详细信息: {error_details}")
+            shortcut_path = os.path.join(desktop, f"{spec.name}.lnk")
+            try:
+                self._save(session, shortcut_path, target_path, working_directory, spec)
+                results.append({'name': spec.name, 'path': shortcut_path, 'success': True, 'error': None})
+            except Exception as e:
+                # 添加详细的错误信息
+                import traceback
+                error_details = traceback.format_exc()
+                results.append({
+                    'name': spec.name,
+                    'path': shortcut_path,
+                    'success': False,
+                    'error': f"创建快捷方式失败: {str(e)}\n详细信息: {error_details}"
+                })
+        return results
+
+    def _open_session(self):
+        """创建本批次共用的 WScript.Shell 对象 (延迟导入COM支持)"""
+        import win32com.client
+        return win32com.client.Dispatch("WScript.Shell")
+
+    def _save(self, shell, shortcut_path, target_path, working_directory, spec):
+        """写入单个快捷方式"""
+        shortcut = shell.CreateShortCut(shortcut_path)
+        shortcut.TargetPath = target_path
+        shortcut.Arguments = spec.arguments
+        shortcut.WorkingDirectory = working_directory  # 设置起始位置
+        shortcut.IconLocation = target_path
+        if spec.description:
+            shortcut.Description = spec.description
+        shortcut.WindowStyle = spec.show_command
+        shortcut.save()
+
+
+class LnkShortcutStrategy(DefaultShortcutStrategy):
+    """直接生成 .lnk 文件的快捷方式策略 (不依赖 COM / pywin32)"""
+
+    def _open_session(self):
+        return None
+
+    def _save(self, session, shortcut_path, target_path, working_directory, spec):
+        write_shell_link(
+            shortcut_path,
+            target_path,
+            arguments=spec.arguments,
+            working_directory=working_directory,
+            icon_location=target_path,
+            description=spec.description,
+            show_command=spec.show_command,
+        )
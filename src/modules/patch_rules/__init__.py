@@ -0,0 +1,25 @@
+"""
+PatchRules主模块
+声明式的注册表修改规则: 从 JSON / TOML 文件加载并编译，新增修改项无需编写策略类
+"""
+
+from .rules import PatchRule, RuleSet, builtin_rules, compile_rules, load_rules
+from .service import PatchRuleService, RuleGroup
+
+
+def create_service(rules: RuleSet = None) -> PatchRuleService:
+    """创建修改规则服务实例 (默认使用内置规则)"""
+    return PatchRuleService(rules)
+
+
+# 公共API
+__all__ = [
+    'create_service',
+    'PatchRuleService',
+    'RuleGroup',
+    'PatchRule',
+    'RuleSet',
+    'builtin_rules',
+    'compile_rules',
+    'load_rules',
+]
@@ -0,0 +1,49 @@
+"""
+内置修改规则
+灵敏度、帧率解锁和FOV解锁的规则定义，格式与规则文件相同 (见 rules.py)
+"""
+from src.modules.registry_sweep.operations import SENSITIVITY_PATTERN, FOV_UNLOCK_PATTERN
+
+# 帧率设置名称区分大小写 (与原帧率策略一致)，其余部分不区分；
+# 只处理 REG_DWORD 类型的值，其他类型的同名值报告类型不符而不改写
+DEFAULT_RULES = {
+    "rules": [
+        {
+            "name": "SENSITIVITY",
+            "label": "灵敏度设置",
+            "pattern": SENSITIVITY_PATTERN.pattern,
+            "type": "binary",
+            # 第一个字节改为0x01
+            "program": [{"op": "set_byte", "offset": 0, "value": 0x01}],
+        },
+        {
+            "name": "FPS_ENABLE",
+            "label": "帧率解锁",
+            "group": "FPS_UNLOCK",
+            "pattern": r"(?i:^CODM_\d+_iMSDK_CN_)EnableFramerateCustomize(?i:_h\d+$)",
+            "ignore_case": False,
+            "type": "dword",
+            "program": [{"op": "set_dword", "value": 1}],
+        },
+        {
+            "name": "FPS_VALUE",
+            "label": "帧率解锁",
+            "group": "FPS_UNLOCK",
+            "pattern": r"(?i:^CODM_\d+_iMSDK_CN_)FramerateCustomizeValue(?i:_h\d+$)",
+            "ignore_case": False,
+            "type": "dword",
+            "program": [{"op": "set_dword", "value": 0}],
+        },
+        {
+            "name": "FOV_UNLOCK",
+            "label": "FOV设置",
+            "pattern": FOV_UNLOCK_PATTERN.pattern,
+            "type": "binary",
+            # 第7个字节改为FOV值 (由参数 fov 提供)
+            "program": [{"op": "set_byte", "offset": 6, "value": "$fov"}],
+        },
+    ]
+}
+
+# 内置规则的参数默认值
+DEFAULT_PARAMS = {"fov": 0xFF}
@@ -0,0 +1,327 @@
+"""
+声明式修改规则
+每条规则由值名称匹配模式、期望的值类型和修改程序组成，加载时编译为闭包，处理时不再解释规则定义
+
+规则文件 (JSON 或 TOML) 格式:
+    {"rules": [{
+        "name": "FOV_UNLOCK",                    规则名称 (唯一)
+        "label": "FOV设置",                      日志中显示的名称 (可选，默认为规则名称)
+        "group": "FOV_UNLOCK",                   统计分组 (可选，默认为规则名称)
+        "pattern": "^CODM_\\d+_..._h\\d+$",      值名称匹配模式 (从名称开头匹配)
+        "ignore_case": true,                     是否忽略大小写 (可选，默认true)
+        "type": "binary",                        期望的值类型: binary / dword
+        "program": [                             修改程序 (按顺序执行)
+            {"op": "set_byte", "offset": 6, "value": "$fov"},
+            {"op": "set_dword", "value": 1}
+        ]
+    }]}
+
+以 "$" 开头的值为参数，编译时代入 (如 FOV 值)。
+"""
+import hashlib
+import json
+import re
+from collections import namedtuple
+
+from src.core.registry.backend import REG_BINARY, REG_DWORD
+from src.core.exceptions.exceptions import PatchRuleError
+from .defaults import DEFAULT_RULES, DEFAULT_PARAMS
+
+try:
+    import tomllib
+except ImportError:  # Python 3.11 以下不支持 TOML 规则文件
+    tomllib = None
+
+# 规则文件中的类型名称 -> 注册表值类型
+VALUE_TYPES = {"binary": REG_BINARY, "dword": REG_DWORD}
+
+# 各值类型支持的修改指令
+OPCODES = {REG_BINARY: {"set_byte"}, REG_DWORD: {"set_dword"}}
+
+# 编译后的规则: apply(当前值) 返回修改后的值，无需修改时返回None；
+# 数据不满足修改条件 (如长度不足) 时抛出 ValueError。
+# byte_patch 为等价的单字节修改 (偏移, 值)，供列式批量处理使用，其他程序为None
+PatchRule = namedtuple("PatchRule", ["name", "label", "group", "pattern", "value_type", "apply", "byte_patch"])
+
+# 已编译的规则集: (规则定义摘要, 参数) -> RuleSet
+_compiled_cache = {}
+
+# 规则匹配结果缓存容量 (与键值名称分类缓存相同)
+MATCH_CACHE_SIZE = 1 << 17
+
+# 含命名分组或反向引用的模式 (合并后分组编号会改变)
+_UNSAFE_TO_COMBINE = re.compile(r"\(\?P|\\\d")
+
+
+def _param(value, params, rule_name):
+    """代入参数并检查取值范围"""
+    if isinstance(value, str) and value.startswith("$"):
+        if value[1:] not in params:
+            raise PatchRuleError(f"规则 {rule_name} 使用了未提供的参数: {value}")
+        value = params[value[1:]]
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise PatchRuleError(f"规则 {rule_name} 的值必须为整数: {value!r}")
+    return value
+
+
+def _compile_binary(program, params, rule_name):
+    """编译二进制值的修改程序"""
+    patches = []
+    for instruction in program:
+        offset = instruction.get("offset")
+        if isinstance(offset, bool) or not isinstance(offset, int) or offset < 0:
+            raise PatchRuleError(f"规则 {rule_name} 的偏移无效: {offset!r}")
+        value = _param(instruction.get("value"), params, rule_name)
+        if not 0 <= value <= 0xFF:
+            raise PatchRuleError(f"规则 {rule_name} 的字节值超出范围 (0-255): {value}")
+        patches.append((offset, value))
+    required = max(offset for offset, _ in patches) + 1
+
+    if len(patches) == 1:
+        offset, value = patches[0]
+        replacement = bytes((value,))
+
+        def apply(data):
+            if len(data) < required:
+                raise ValueError(f"数据长度不足{required}个字节，实际长度: {len(data)}")
+            if data[offset] == value:
+                return None
+            return data[:offset] + replacement + data[offset + 1:]
+        return apply, (offset, value)
+
+    def apply(data):
+        if len(data) < required:
+            raise ValueError(f"数据长度不足{required}个字节，实际长度: {len(data)}")
+        if all(data[offset] == value for offset, value in patches):
+            return None
+        modified = bytearray(data)
+        for offset, value in patches:
+            modified[offset] = value
+        return bytes(modified)
+    return apply, None
+
+
+def _compile_dword(program, params, rule_name):
+    """编译DWORD值的修改程序 (多条指令时以最后一条为准)"""
+    value = _param(program[-1].get("value"), params, rule_name)
+    if not 0 <= value <= 0xFFFFFFFF:
+        raise PatchRuleError(f"规则 {rule_name} 的DWORD值超出范围: {value}")
+
+    def apply(current):
+        return None if current == value else value
+    return apply, None
+
+
+_COMPILERS = {REG_BINARY: _compile_binary, REG_DWORD: _compile_dword}
+
+
+def compile_rule(definition, params):
+    """
+    编译单条规则
+
+    参数:
+        definition: 规则定义字典
+        params: 参数 (名称 -> 整数)
+
+    返回:
+        PatchRule: 编译后的规则
+    """
+    if not isinstance(definition, dict):
+        raise PatchRuleError(f"规则定义必须为对象: {definition!r}")
+    name = definition.get("name")
+    if not isinstance(name, str) or not name:
+        raise PatchRuleError(f"规则缺少名称: {definition!r}")
+    value_type = VALUE_TYPES.get(definition.get("type"))
+    if value_type is None:
+        raise PatchRuleError(f"规则 {name} 的值类型无效: {definition.get('type')!r} (可选: {', '.join(VALUE_TYPES)})")
+    program = definition.get("program")
+    if not isinstance(program, list) or not program:
+        raise PatchRuleError(f"规则 {name} 缺少修改程序")
+    for instruction in program:
+        if not isinstance(instruction, dict) or instruction.get("op") not in OPCODES[value_type]:
+            raise PatchRuleError(f"规则 {name} 包含无效的指令: {instruction!r}")
+    try:
+        pattern = re.compile(definition.get("pattern", ""), re.IGNORECASE if definition.get("ignore_case", True) else 0)
+    except (re.error, TypeError) as e:
+        raise PatchRuleError(f"规则 {name} 的匹配模式无效: {str(e)}")
+
+    apply, byte_patch = _COMPILERS[value_type](program, params, name)
+    return PatchRule(
+        name,
+        definition.get("label") or name,
+        definition.get("group") or name,
+        pattern,
+        value_type,
+        apply,
+        byte_patch
+    )
+
+
+class RuleSet:
+    """编译后的规则集，按规则顺序匹配值名称 (先匹配的规则优先)"""
+
+    def __init__(self, rules, digest=""):
+        """
+        参数:
+            rules: PatchRule 列表
+            digest: 规则定义的摘要 (标识规则集内容)
+        """
+        self.rules = list(rules)
+        self.digest = digest
+        self._by_name = {rule.name: rule for rule in self.rules}
+        # 值名称 -> 规则 (None 表示没有匹配的规则)
+        self._cache = {}
+        self._combined = self._combine(self.rules)
+
+    @staticmethod
+    def _combine(rules):
+        """
+        将各规则的模式合并为一个正则 (与分类器相同: 每条规则一个命名分组，通过 lastgroup 得到规则)
+
+        模式自身使用命名分组或反向引用时无法安全合并，返回None (逐条匹配)。
+        """
+        if not rules or any(_UNSAFE_TO_COMBINE.search(rule.pattern.pattern) for rule in rules):
+            return None
+        alternatives = [
+            f"(?P<_r{index}>(?{'i' if rule.pattern.flags & re.IGNORECASE else '-i'}:{rule.pattern.pattern}))"
+            for index, rule in enumerate(rules)
+        ]
+        try:
+            return re.compile("|".join(alternatives)).match
+        except re.error:
+            return None
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def get(self, name):
+        """按名称获取规则"""
+        return self._by_name.get(name)
+
+    def groups(self):
+        """
+        统计分组
+
+        返回:
+            dict: 分组名称 -> 显示名称 (按规则顺序)
+        """
+        groups = {}
+        for rule in self.rules:
+            groups.setdefault(rule.group, rule.label)
+        return groups
+
+    def match(self, value_name):
+        """
+        获取匹配值名称的第一条规则 (结果按名称缓存)
+
+        返回:
+            PatchRule: 匹配的规则，没有匹配时返回None
+        """
+        cache = self._cache
+        rule = cache.get(value_name, cache)
+        if rule is cache:
+            if self._combined is not None:
+                match = self._combined(value_name)
+                rule = None if match is None else self.rules[int(match.lastgroup[2:])]
+            else:
+                rule = next((rule for rule in self.rules if rule.pattern.match(value_name)), None)
+            if len(cache) >= MATCH_CACHE_SIZE:
+                cache.clear()
+            cache[value_name] = rule
+        return rule
+
+
+def _digest(definitions):
+    """规则定义的摘要"""
+    return hashlib.sha256(json.dumps(definitions, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def compile_rules(definitions, params=None, digest=None):
+    """
+    编译规则定义 (相同定义与参数的编译结果会被缓存)
+
+    参数:
+        definitions: {"rules": [规则定义, ...]}
+        params: 参数 (名称 -> 整数)
+        digest: 规则定义的摘要 (为空时根据定义计算)
+
+    返回:
+        RuleSet: 编译后的规则集
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    digest = digest or _digest(definitions)
+    cache_key = (digest, tuple(sorted(params.items())))
+    rule_set = _compiled_cache.get(cache_key)
+    if rule_set is None:
+        rules = definitions.get("rules") if isinstance(definitions, dict) else None
+        if not isinstance(rules, list):
+            raise PatchRuleError("规则定义缺少 rules 列表")
+        compiled = [compile_rule(definition, params) for definition in rules]
+        names = [rule.name for rule in compiled]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise PatchRuleError(f"规则名称重复: {', '.join(sorted(duplicates))}")
+        rule_set = _compiled_cache[cache_key] = RuleSet(compiled, digest)
+    return rule_set
+
+
+_DEFAULT_DIGEST = _digest(DEFAULT_RULES)
+
+
+def builtin_rules(**params):
+    """
+    内置规则集 (灵敏度、帧率解锁、FOV解锁)
+
+    参数:
+        params: 覆盖默认参数，如 fov=0x80
+    """
+    return compile_rules(DEFAULT_RULES, params, _DEFAULT_DIGEST)
+
+
+def load_rules(path, params=None, include_builtin=True):
+    """
+    从 JSON / TOML 文件加载规则
+
+    规则按文件内容的哈希缓存，内容未变时直接返回已编译的规则集。
+
+    参数:
+        path: 规则文件路径 (.toml 按 TOML 解析，其他按 JSON 解析)
+        params: 参数 (名称 -> 整数)
+        include_builtin: 是否包含内置规则 (文件中同名规则替换内置规则)
+
+    返回:
+        RuleSet: 编译后的规则集
+    """
+    with open(path, "rb") as file:
+        content = file.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if include_builtin:
+        digest = f"{_DEFAULT_DIGEST}+{digest}"
+
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    rule_set = _compiled_cache.get((digest, tuple(sorted(params.items()))))
+    if rule_set is not None:
+        return rule_set
+
+    try:
+        if str(path).lower().endswith(".toml"):
+            if tomllib is None:
+                raise PatchRuleError("解析 TOML 规则文件需要 Python 3.11 及以上版本")
+            definitions = tomllib.loads(content.decode("utf-8"))
+        else:
+            definitions = json.loads(content.decode("utf-8-sig"))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise PatchRuleError(f"规则文件格式错误: {path}: {str(e)}")
+
+    if include_builtin:
+        rules = definitions.get("rules") if isinstance(definitions, dict) else None
+        if not isinstance(rules, list):
+            raise PatchRuleError("规则定义缺少 rules 列表")
+        overrides = {rule.get("name"): rule for rule in rules if isinstance(rule, dict)}
+        merged = [overrides.pop(rule["name"], rule) for rule in DEFAULT_RULES["rules"]]
+        merged.extend(rule for rule in rules if not isinstance(rule, dict) or rule.get("name") in overrides)
+        definitions = {"rules": merged}
+    return compile_rules(definitions, params, digest)
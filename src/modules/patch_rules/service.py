@@ -0,0 +1,169 @@
+"""
+服务层实现
+按编译后的规则读取、比较、修改并写入注册表值 (各修改策略共用)
+"""
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend, REG_BINARY, REG_DWORD
+from src.core.utils.logger import LoggerManager, HexDump
+from .rules import RuleSet, builtin_rules
+from ...core.exceptions.exceptions import (
+    RegistryDataError, RegistryReadError, RegistryWriteError, RegistryPermissionError
+)
+
+
+def map_os_error(e, sub_key, value_name):
+    """将系统错误转换为注册表操作异常"""
+    error_code = e.winerror if hasattr(e, 'winerror') else None
+    if error_code == 5:  # 权限不足
+        return RegistryPermissionError(f"注册表写入权限不足: {str(e)}",
+                                       key_path=sub_key,
+                                       value_name=value_name)
+    elif error_code == 2:  # 文件未找到
+        return RegistryReadError(f"注册表路径不存在: {str(e)}",
+                                 key_path=sub_key,
+                                 value_name=value_name)
+    else:
+        return RegistryWriteError(f"注册表操作失败: {str(e)}",
+                                  key_path=sub_key,
+                                  value_name=value_name)
+
+
+class PatchRuleService:
+    """修改规则服务"""
+
+    def __init__(self, rules: RuleSet = None, backend: RegistryBackend = None):
+        """
+        初始化服务
+
+        参数:
+            rules: 编译后的规则集 (默认为内置规则)
+            backend: 注册表访问后端 (默认从依赖容器获取)
+        """
+        self.rules = rules or builtin_rules()
+        self.backend = backend or DependencyProvider.get(RegistryBackend)
+        self.logger = LoggerManager.get_logger("PatchRules", show_time=False)
+
+    def _read(self, rule, root_key, sub_key, value_name):
+        """读取当前值并检查值类型"""
+        if rule.value_type == REG_BINARY:
+            data = self.backend.read_binary(root_key, sub_key, value_name)
+            if data is None:
+                raise RegistryReadError("无法读取注册表值", key_path=sub_key, value_name=value_name)
+            return data
+        value, value_type = self.backend.query_value(root_key, sub_key, value_name)
+        if value_type != rule.value_type:
+            raise RegistryDataError(f"值类型不符: 期望 {rule.value_type}, 实际 {value_type}",
+                                    key_path=sub_key, value_name=value_name)
+        return value
+
+    def plan(self, rule, root_key, sub_key, value_name, data=None):
+        """
+        按规则计算修改计划 (不写入注册表)
+
+        参数:
+            rule: 编译后的规则 (PatchRule)
+            data: 预先读取的值 (为空时从注册表读取)
+
+        返回:
+            dict: 包含修改前后数据的字典，modified 表示是否需要写入
+                  (二进制值为 original_data / modified_data，DWORD值为 original_value / new_value)
+        """
+        binary = rule.value_type == REG_BINARY
+        original_field, modified_field = ('original_data', 'modified_data') if binary else \
+            ('original_value', 'new_value')
+        result = {
+            'key': f"{root_key}\\{sub_key}\\{value_name}",
+            original_field: None,
+            modified_field: None,
+            'modified': False,
+            'success': False
+        }
+
+        try:
+            # 读取当前值 (已预读时直接使用)
+            current = data if data is not None else self._read(rule, root_key, sub_key, value_name)
+            result[original_field] = current
+            if binary and not isinstance(current, (bytes, bytearray)):
+                raise RegistryDataError(f"值类型不符: 期望二进制数据, 实际 {type(current).__name__}",
+                                        key_path=sub_key, value_name=value_name)
+
+            modified = rule.apply(current)
+            if modified is None:
+                return result
+
+            result[modified_field] = modified
+            result['modified'] = True
+            return result
+
+        except ValueError as e:
+            raise RegistryDataError(str(e), key_path=sub_key, value_name=value_name)
+        except OSError as e:
+            raise map_os_error(e, sub_key, value_name)
+
+    def execute(self, rule, root_key, sub_key, value_name, data=None):
+        """
+        按规则修改注册表值
+
+        参数:
+            rule: 编译后的规则 (PatchRule)
+            data: 预先读取的值 (为空时从注册表读取)
+
+        返回:
+            dict: 包含操作结果和修改前后数据的字典
+        """
+        result = self.plan(rule, root_key, sub_key, value_name, data)
+        if not result['modified']:
+            return result
+
+        try:
+            # 写入新值
+            if rule.value_type == REG_BINARY:
+                if not self.backend.write_binary(root_key, sub_key, value_name, result['modified_data']):
+                    raise RegistryWriteError("注册表写入失败", key_path=sub_key, value_name=value_name)
+            else:
+                self.backend.set_value(root_key, sub_key, value_name, REG_DWORD, result['new_value'])
+        except OSError as e:
+            raise map_os_error(e, sub_key, value_name)
+
+        result['success'] = True
+        return result
+
+    def log_result(self, result, label="规则"):
+        """输出单个键值的处理结果 (十六进制格式化延迟到记录输出时)"""
+        if 'original_data' in result:
+            original, modified = HexDump(result['original_data']), HexDump(result['modified_data'])
+        else:
+            original, modified = result['original_value'], result['new_value']
+        if result['modified']:
+            self.logger.success(
+                "成功修改%s: %s\n"
+                "原始值: %s\n"
+                "新值: %s",
+                label, result['key'], original, modified
+            )
+        else:
+            self.logger.info(
+                "无需修改%s: %s\n"
+                "当前值已为期望值: %s",
+                label, result['key'], original
+            )
+
+
+class RuleGroup:
+    """
+    规则统计分组
+
+    在按规则处理时作为处理报告中的操作键 (name / label 对应 RegistryOperation 的名称与显示名称)，
+    并输出分组内各规则的处理结果。
+    """
+
+    def __init__(self, name, label, service):
+        self.name = name
+        self.label = label
+        self.service = service
+
+    def log_result(self, result):
+        self.service.log_result(result, self.label)
+
+    def __repr__(self):
+        return f"RuleGroup({self.name!r})"
@@ -2,7 +2,7 @@
 服务层实现
 提供高层业务逻辑
 """
-from src.core.utils.logger import LoggerManager
+from src.core.utils.logger import LoggerManager, HexDump
 from .strategy import BaseRegUnlockFOV, DefaultRegUnlockFOV
 from ...core.exceptions.exceptions import RegistryOperationError
 
@@ -20,38 +20,54 @@ class RegUnlockFOVService:
         self.strategy = strategy or DefaultRegUnlockFOV()
         self.logger = LoggerManager.get_logger("RegUnlockFOV", show_time=False)
 
-    def apply_reg_unlock(self, root_key, sub_key, value_name, byte_):
+    def plan_reg_unlock(self, root_key, sub_key, value_name, byte_, data=None):
+        """
+        计算FOV修改计划 (不写入注册表)
+
+        参数:
+            data: 预先读取的二进制数据 (为空时从注册表读取)
+
+        返回:
+            dict: 包含修改前后数据的字典，modified 表示是否需要写入
+        """
+        try:
+            return self.strategy.plan(root_key, sub_key, value_name, byte_, data)
+        except RegistryOperationError as e:
+            self.logger.error(f"FOV设置失败: {str(e)}")
+            raise
+
+    def apply_reg_unlock(self, root_key, sub_key, value_name, byte_, data=None):
         """
         应用FOV修改
 
+        参数:
+            data: 预先读取的二进制数据 (为空时从注册表读取)
+
         返回:
             dict: 包含操作结果和修改前后数据的字典
         """
         try:
-            result = self.strategy.execute(root_key, sub_key, value_name, byte_)
-
-            if result['modified']:
-                # 格式化原始数据
-                orig_hex = ' '.join(f'{b:02X}' for b in result['original_data'])
-                mod_hex = ' '.join(f'{b:02X}' for b in result['modified_data'])
-
-                self.logger.success(
-                    f"成功修改FOV设置: {result['key']}\n"
-                    f"原始值: {orig_hex}\n"
-                    f"新值: {mod_hex}\n"
-                    f"当前FOV: {byte_}"
-                )
-            else:
-                # 格式化数据
-                data_hex = ' '.join(f'{b:02X}' for b in result['original_data'])
-
-                self.logger.info(
-                    f"无需修改FOV设置: {result['key']}\n"
-                    f"当前值已为期望值: {data_hex}"
-                )
-
+            result = self.strategy.execute(root_key, sub_key, value_name, byte_, data)
+            self.log_result(result)
             return result
 
         except RegistryOperationError as e:
             self.logger.error(f"FOV设置失败: {str(e)}")
             raise
+
+    def log_result(self, result):
+        """输出单个键值的处理结果 (十六进制格式化延迟到记录输出时)"""
+        if result['modified']:
+            self.logger.success(
+                "成功修改FOV设置: %s\n"
+                "原始值: %s\n"
+                "新值: %s\n"
+                "当前FOV: %s",
+                result['key'], HexDump(result['original_data']), HexDump(result['modified_data']), result['byte']
+            )
+        else:
+            self.logger.info(
+                "无需修改FOV设置: %s\n"
+                "当前值已为期望值: %s",
+                result['key'], HexDump(result['original_data'])
+            )
@@ -21,29 +21,52 @@ class RegUnlockFPSService:
         self.strategy = strategy or DefaultRegUnlockFPSStrategy()
         self.logger = LoggerManager.get_logger("RegUnlockFPS", show_time=False)
 
-    def apply_reg_unlock(self, root_key, sub_key, value_name):
+    def plan_reg_unlock(self, root_key, sub_key, value_name, value=None):
+        """
+        计算帧率解锁修改计划 (不写入注册表)
+
+        参数:
+            value: 预先读取的DWORD值 (为空时从注册表读取)
+
+        返回:
+            dict: 包含修改前后数据的字典，modified 表示是否需要写入
+        """
+        try:
+            return self.strategy.plan(root_key, sub_key, value_name, value)
+        except RegistryOperationError as e:
+            self.logger.error(f"注册表操作失败: {str(e)}")
+            raise
+
+    def apply_reg_unlock(self, root_key, sub_key, value_name, value=None):
         """
         应用帧率解锁修改
 
+        参数:
+            value: 预先读取的DWORD值 (为空时从注册表读取)
+
         返回:
             dict: 包含操作结果和修改前后数据的字典
         """
         try:
-            result = self.strategy.execute(root_key, sub_key, value_name)
-
-            if result['modified']:
-                self.logger.success(
-                    f"成功修改注册表: {result['key']}\n"
-                    f"原始值: {result['original_value']} → 新值: {result['new_value']}"
-                )
-            else:
-                self.logger.info(
-                    f"无需修改注册表: {result['key']}\n"
-                    f"当前值已为期望值: {result['original_value']}"
-                )
-
+            result = self.strategy.execute(root_key, sub_key, value_name, value)
+            self.log_result(result)
             return result
 
         except RegistryOperationError as e:
             self.logger.error(f"注册表操作失败: {str(e)}")
             raise
+
+    def log_result(self, result):
+        """输出单个键值的处理结果"""
+        if result['modified']:
+            self.logger.success(
+                "成功修改注册表: %s\n"
+                "原始值: %s → 新值: %s",
+                result['key'], result['original_value'], result['new_value']
+            )
+        else:
+            self.logger.info(
+                "无需修改注册表: %s\n"
+                "当前值已为期望值: %s",
+                result['key'], result['original_value']
+            )
@@ -0,0 +1,47 @@
+"""
+RegistrySweep主模块
+提供单次枚举、多操作分派的注册表处理接口
+
+RegistryOperation 及匹配模式可直接导入；服务类在首次访问时才导入，
+避免仅解析命令行参数时加载各策略模块。
+"""
+
+from .operations import (
+    RegistryOperation,
+    SENSITIVITY_PATTERN,
+    FPS_UNLOCK_PATTERN,
+    FOV_UNLOCK_PATTERN,
+)
+
+# 延迟导入的公共名称 -> 所在子模块
+_LAZY_ATTRS = {
+    'RegistrySweepService': '.service',
+    'ClassificationIndex': '.index',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_service():
+    """创建注册表批量处理服务实例"""
+    from .service import RegistrySweepService
+    return RegistrySweepService()
+
+
+# 公共API
+__all__ = [
+    'create_service',
+    'RegistrySweepService',
+    'ClassificationIndex',
+    'RegistryOperation',
+    'SENSITIVITY_PATTERN',
+    'FPS_UNLOCK_PATTERN',
+    'FOV_UNLOCK_PATTERN',
+]
@@ -0,0 +1,89 @@
+"""
+键值名称分类器
+将各操作的匹配模式合并为一个正则，每个操作对应一个命名分组，单次匹配即可得到操作类型
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from .operations import RegistryOperation
+
+# 操作分类模式: 与 operations 中三个模式的并集等价，
+# 分组名即 RegistryOperation 成员名，匹配后通过 lastgroup 直接得到操作类型
+CLASSIFIER_PATTERN = re.compile(
+    r"^CODM_\d+_"
+    r"iMSDK_CN_"
+    r"(?:"
+    r"(?P<SENSITIVITY>(?:PVE|PVP|TD|Br|PVEFiring|PVPFiring|TDFiring|BrFiring)"
+    r"(?:_(?:RotateSensitive|AimRotate|ReddotHolo|Sniper|Free|ACOG|[\dX]+|SkyVehicle|GroundVehicle|Vertical|Ult).*?)?)"
+    r"|(?P<FPS_UNLOCK>EnableFramerateCustomize|FramerateCustomizeValue)"
+    r"|(?P<FOV_UNLOCK>BRWeaponFov|MPWeaponFov)"
+    r")"
+    r"_h\d+$",
+    re.IGNORECASE
+)
+
+# 字段解析模式: 在分类之外提取账号、模式、子项和哈希后缀
+FIELDS_PATTERN = re.compile(
+    r"^CODM_(?P<account>\d+)_"
+    r"iMSDK_CN_"
+    r"(?P<mode>[^_]+)"
+    r"(?:_(?P<scope>.*?))?"
+    r"_h(?P<hash>\d+)$",
+    re.IGNORECASE
+)
+
+# 分类结果: mode 为灵敏度模式或帧率/FOV设置名称，scope 为灵敏度子项 (不含前导下划线)
+Classification = namedtuple("Classification", ["operation", "account", "mode", "scope", "hash"])
+
+# 分类结果缓存容量 (足以覆盖单个账号的全部CODM键值)
+CLASSIFY_CACHE_SIZE = 1 << 17
+
+_OPERATIONS_BY_NAME = {operation.name: operation for operation in RegistryOperation}
+
+# 键值名称 -> 操作类型 (None 表示不属于任何操作)
+_classify_cache = {}
+
+
+def classify(name: str, _match=CLASSIFIER_PATTERN.match, _cache=_classify_cache):
+    """
+    对键值名称分类 (结果按名称缓存)
+
+    返回:
+        RegistryOperation: 操作类型，不属于任何操作时返回None
+    """
+    operation = _cache.get(name, _cache)
+    if operation is _cache:
+        match = _match(name)
+        operation = None if match is None else _OPERATIONS_BY_NAME[match.lastgroup]
+        if len(_cache) >= CLASSIFY_CACHE_SIZE:
+            _cache.clear()
+        _cache[name] = operation
+    return operation
+
+
+@lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
+def parse(name: str):
+    """
+    分类并解析键值名称中的字段
+
+    返回:
+        Classification: 分类结果，不属于任何操作时返回None
+    """
+    operation = classify(name)
+    if operation is None:
+        return None
+    fields = FIELDS_PATTERN.match(name)
+    return Classification(
+        operation,
+        fields.group('account'),
+        fields.group('mode'),
+        fields.group('scope'),
+        fields.group('hash')
+    )
+
+
+def clear_cache():
+    """清空分类结果缓存"""
+    _classify_cache.clear()
+    parse.cache_clear()
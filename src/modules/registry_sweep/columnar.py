@@ -0,0 +1,89 @@
+"""
+列式快照
+将同一操作匹配的 REG_BINARY 值载入按最长值补零的二维 uint8 数组，
+以向量化方式判断哪些值需要修改并修改指定字节，只取出发生变化的行用于写入
+
+依赖 NumPy (可选)，未安装时 columnar_available() 返回False，调用方逐项处理。
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def columnar_available():
+    """是否可以使用列式快照 (已安装 NumPy)"""
+    return np is not None
+
+
+class ColumnarSnapshot:
+    """二进制值的列式快照"""
+
+    def __init__(self, names, values):
+        """
+        构建快照
+
+        参数:
+            names: 值名称列表
+            values: 与名称一一对应的二进制数据 (bytes)
+        """
+        if np is None:
+            raise ImportError("列式快照需要安装 numpy")
+        self.names = list(names)
+        self.originals = list(values)
+        # 值名称 -> 行号
+        self.index = {name: row for row, name in enumerate(self.names)}
+        self.lengths = np.fromiter(map(len, self.originals), dtype=np.int64, count=len(self.originals))
+        width = int(self.lengths.max()) if len(self.originals) else 0
+        # 一次性拼接后整体载入，避免逐行写入数组 (长度不一时先补零)
+        if int(self.lengths.min(initial=width)) == width:
+            buffer = b"".join(self.originals)
+        else:
+            buffer = b"".join(data.ljust(width, b"\0") for data in self.originals)
+        self.data = np.frombuffer(buffer, dtype=np.uint8).reshape(len(self.originals), width).copy()
+
+    def __len__(self):
+        return len(self.names)
+
+    def needs_patch(self, offset, value):
+        """
+        需要修改的行
+
+        返回:
+            numpy.ndarray: 布尔掩码，数据长度足够且 offset 处字节不等于 value 的行为True
+        """
+        if offset >= self.data.shape[1]:
+            return np.zeros(len(self), dtype=bool)
+        return (self.lengths > offset) & (self.data[:, offset] != value)
+
+    def patch_byte(self, offset, value):
+        """
+        将需要修改的行的 offset 处字节改为 value
+
+        返回:
+            numpy.ndarray: 被修改的行号
+        """
+        mask = self.needs_patch(offset, value)
+        self.data[mask, offset] = value
+        return np.flatnonzero(mask)
+
+    def row(self, row):
+        """指定行的当前数据 (去除补零)"""
+        return self.data[row, :self.lengths[row]].tobytes()
+
+    def changed_rows(self, rows):
+        """
+        取出发生变化的行
+
+        返回:
+            dict: 行号 -> 修改后的数据
+        """
+        # 选中的行整体导出为一个 bytes 后再切分，避免逐行转换
+        width = self.data.shape[1]
+        block = self.data[rows].tobytes()
+        rows = rows.tolist()
+        lengths = self.lengths[rows].tolist()
+        return {
+            row: block[i * width:i * width + length]
+            for i, (row, length) in enumerate(zip(rows, lengths))
+        }
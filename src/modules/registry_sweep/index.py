@@ -0,0 +1,153 @@
+"""
+持久化分类索引
+将已分类的CODM键值 (名称 -> 操作类型、上次处理后的值) 保存到 SQLite，
+以注册表路径的低成本指纹 (值数量、最长值名称、最后写入时间) 校验是否仍然有效。
+值以 (值类型, 原始字节) 保存，读取时再转换，任意类型的值都能写入 SQLite
+"""
+import os
+import sqlite3
+
+from src.core.registry.backend import decode_raw_value, encode_raw_value
+from src.core.utils.logger import LoggerManager
+from src.core.utils.paths import user_cache_dir
+from .operations import RegistryOperation
+
+# 索引结构版本 (记录在 PRAGMA user_version 中)，结构变化时重建旧索引
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+DROP TABLE IF EXISTS meta;
+DROP TABLE IF EXISTS entries;
+CREATE TABLE meta (
+    scope TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE TABLE entries (
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    value_type INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (scope, name)
+) WITHOUT ROWID;
+"""
+
+# 读写索引时可能出现的错误: 数据库错误，以及值无法编码/解码
+_INDEX_ERRORS = (sqlite3.Error, OverflowError, ValueError, KeyError)
+
+
+def make_fingerprint(key_info):
+    """
+    由 key_info 生成指纹字符串
+
+    返回:
+        str: 指纹，key_info 为空时返回None
+    """
+    if key_info is None:
+        return None
+    return f"v{SCHEMA_VERSION}:{key_info['values']}:{key_info['max_name_len']}:{key_info['last_write']}"
+
+
+def make_scope(backend, key_path):
+    """索引作用域: 区分不同后端、不同文件中的同一注册表路径"""
+    return f"{backend.name}|{backend.source}|{key_path.lower()}"
+
+
+class ClassificationIndex:
+    """基于 SQLite 的持久化分类索引"""
+
+    def __init__(self, path):
+        """
+        初始化索引
+
+        参数:
+            path: SQLite 文件路径 (首次使用时创建)
+        """
+        self.path = path
+        self.logger = LoggerManager.get_logger("ClassificationIndex", show_time=False)
+        self._conn = None
+
+    @classmethod
+    def default_path(cls):
+        """默认索引文件位置 (用户缓存目录)"""
+        return os.path.join(user_cache_dir(), "classification_index.sqlite3")
+
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.executescript(_SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def load(self, scope, fingerprint):
+        """
+        读取指纹仍然有效的索引
+
+        返回:
+            tuple: (路径下的值总数, [(值名称, RegistryOperation, 值类型, 值)])，索引不存在或已失效时返回None
+        """
+        if fingerprint is None:
+            return None
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT fingerprint, total FROM meta WHERE scope = ?", (scope,)).fetchone()
+            if row is None or row[0] != fingerprint:
+                return None
+            rows = conn.execute(
+                "SELECT name, operation, value_type, data FROM entries WHERE scope = ?", (scope,)
+            ).fetchall()
+            return row[1], [
+                (name, RegistryOperation[operation], value_type, decode_raw_value(value_type, data))
+                for name, operation, value_type, data in rows
+            ]
+        except _INDEX_ERRORS as e:
+            self.logger.warning(f"读取分类索引失败，将重新分类: {str(e)}")
+            return None
+
+    def save(self, scope, fingerprint, total, entries):
+        """
+        保存索引 (整体替换该作用域的旧内容)
+
+        保存失败只输出警告 (此时注册表已经写入，不能因索引影响处理结果)。
+
+        参数:
+            total: 路径下的值总数 (含未分类的值)
+            entries: 可迭代的 (值名称, RegistryOperation, 值类型, 值)
+        """
+        if fingerprint is None:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM entries WHERE scope = ?", (scope,))
+                conn.executemany(
+                    "INSERT INTO entries (scope, name, operation, value_type, data) VALUES (?, ?, ?, ?, ?)",
+                    ((scope, name, operation.name, value_type, encode_raw_value(value_type, data))
+                     for name, operation, value_type, data in entries)
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (scope, fingerprint, total) VALUES (?, ?, ?)",
+                    (scope, fingerprint, total)
+                )
+        except _INDEX_ERRORS as e:
+            self.logger.warning(f"保存分类索引失败: {str(e)}")
+
+    def invalidate(self, scope):
+        """使该作用域的索引失效"""
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM meta WHERE scope = ?", (scope,))
+        except sqlite3.Error as e:
+            self.logger.warning(f"清除分类索引失败: {str(e)}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,54 @@
+"""
+注册表操作定义
+包含操作类型枚举及对应的键名匹配模式
+"""
+import re
+from enum import Enum, auto
+
+# 配置正则表达式模式
+SENSITIVITY_PATTERN = re.compile(
+    r"^CODM_\d+_"
+    r"iMSDK_CN_"
+    r"(PVE|PVP|TD|Br|PVEFiring|PVPFiring|TDFiring|BrFiring)"
+    r"(_(?:RotateSensitive|AimRotate|ReddotHolo|Sniper|Free|ACOG|[\dX]+|SkyVehicle|GroundVehicle|Vertical|Ult).*?)?"
+    r"_h\d+$",
+    re.IGNORECASE
+)
+
+FPS_UNLOCK_PATTERN = re.compile(
+    r"^CODM_\d+_"
+    r"iMSDK_CN_"
+    r"(EnableFramerateCustomize|FramerateCustomizeValue)"
+    r"_h\d+$",
+    re.IGNORECASE
+)
+
+FOV_UNLOCK_PATTERN = re.compile(
+    r"^CODM_\d+_"
+    r"iMSDK_CN_"
+    r"(BRWeaponFov|MPWeaponFov)"
+    r"_h\d+$",
+    re.IGNORECASE
+)
+
+
+class RegistryOperation(Enum):
+    """注册表操作类型枚举"""
+    SENSITIVITY = auto()
+    FPS_UNLOCK = auto()
+    FOV_UNLOCK = auto()
+
+
+# 操作类型 -> 键名匹配模式 (按原有判断顺序排列)
+OPERATION_PATTERNS = {
+    RegistryOperation.SENSITIVITY: SENSITIVITY_PATTERN,
+    RegistryOperation.FPS_UNLOCK: FPS_UNLOCK_PATTERN,
+    RegistryOperation.FOV_UNLOCK: FOV_UNLOCK_PATTERN,
+}
+
+# 操作类型 -> 日志中显示的名称
+OPERATION_LABELS = {
+    RegistryOperation.SENSITIVITY: "灵敏度设置",
+    RegistryOperation.FPS_UNLOCK: "帧率解锁",
+    RegistryOperation.FOV_UNLOCK: "FOV设置",
+}
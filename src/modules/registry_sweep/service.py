@@ -0,0 +1,602 @@
+"""
+服务层实现
+单次枚举注册表键值，先计算修改计划，再批量写入发生变化的值
+"""
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend, RegistryValue, REG_BINARY, REG_DWORD, format_key_path
+from src.core.utils.journal import OperationJournal
+from src.core.utils.logger import LoggerManager, HexDump
+from src.modules.reg_unlock_fps import RegUnlockFPSService
+from src.modules.zero_sensitivity import ZeroSensitivityService
+from src.modules.reg_unlock_fov import RegUnlockFOVService
+from src.modules.patch_rules import PatchRuleService, RuleGroup
+from .classifier import classify
+from .columnar import ColumnarSnapshot, columnar_available
+from .index import ClassificationIndex, make_fingerprint, make_scope
+from .operations import RegistryOperation, OPERATION_LABELS
+from ...core.exceptions.exceptions import RegistryOperationError, RegistryWriteError
+
+
+# 可列式处理的单字节修改: 偏移、期望值、结果字典中键的前缀及附加字段
+BytePatch = namedtuple("BytePatch", ["offset", "value", "key_prefix", "extra"])
+
+
+def _binary_data(value):
+    """快照中的二进制数据 (类型不符时返回None，由策略自行读取)"""
+    return value.data if isinstance(value.data, bytes) else None
+
+
+def _dword_data(value):
+    """快照中的DWORD值 (类型不符时返回None，由策略自行读取)"""
+    return value.data if isinstance(value.data, int) else None
+
+
+def _binary_write(result):
+    return REG_BINARY, result['modified_data']
+
+
+def _dword_write(result):
+    return REG_DWORD, result['new_value']
+
+
+def _rule_write(result):
+    """按规则计算的结果 (二进制值或DWORD值)"""
+    return _binary_write(result) if 'modified_data' in result else _dword_write(result)
+
+
+def _label(operation):
+    """操作在日志中显示的名称 (规则分组使用规则定义中的名称)"""
+    return operation.label if isinstance(operation, RuleGroup) else OPERATION_LABELS[operation]
+
+
+def _original_value(result):
+    """结果字典中的原始值 (二进制策略与DWORD策略字段不同)"""
+    return result['original_data'] if 'original_data' in result else result['original_value']
+
+
+def _diff_call_stats(before, after):
+    """两次API调用统计之差 (仅保留期间有调用的API)"""
+    diff = {}
+    for name, (calls, total_ns) in after.items():
+        prev_calls, prev_ns = before.get(name, (0, 0))
+        if calls > prev_calls:
+            diff[name] = (calls - prev_calls, total_ns - prev_ns)
+    return diff
+
+
+def _format_value(value):
+    """包装值用于日志输出 (二进制数据延迟格式化为十六进制)"""
+    if isinstance(value, (bytes, bytearray)):
+        return HexDump(value)
+    return value
+
+
+class RegistrySweepService:
+    """注册表批量处理服务"""
+
+    def __init__(self, backend: RegistryBackend = None, index: ClassificationIndex = None,
+                 journal: OperationJournal = None, columnar: bool = False):
+        """
+        初始化服务
+
+        参数:
+            backend: 注册表访问后端 (默认从依赖容器获取)
+            index: 持久化分类索引 (为空时每次完整枚举并分类)
+            journal: 结构化操作日志 (为空时不记录)
+            columnar: 以列式快照向量化计算单字节修改 (需要 numpy，未安装时逐项处理)
+        """
+        self.backend = backend or DependencyProvider.get(RegistryBackend)
+        self.index = index
+        self.journal = journal
+        self.logger = LoggerManager.get_logger("RegistrySweep", show_time=False)
+        self.columnar = columnar and columnar_available()
+        if columnar and not self.columnar:
+            self.logger.warning("未安装 numpy，列式处理不可用，改为逐项处理")
+
+    def _build_handlers(self, root_key, sub_key, operations, fov_value):
+        """
+        为本次处理涉及的操作构建处理器
+
+        返回:
+            dict: 操作 -> (服务, 计划函数, 写入项函数, 单字节修改 BytePatch 或None)
+        """
+        key_prefix = f"{root_key}\\{sub_key}\\"
+        handlers = {}
+        if RegistryOperation.SENSITIVITY in operations:
+            sensitivity_service = DependencyProvider.get(ZeroSensitivityService)
+            handlers[RegistryOperation.SENSITIVITY] = (
+                sensitivity_service,
+                lambda value: sensitivity_service.plan_zero_sensitivity(
+                    root_key, sub_key, value.name, _binary_data(value)),
+                _binary_write,
+                self._byte_patch(sensitivity_service.strategy.byte_patch(), key_prefix)
+            )
+        if RegistryOperation.FPS_UNLOCK in operations:
+            fps_service = DependencyProvider.get(RegUnlockFPSService)
+            handlers[RegistryOperation.FPS_UNLOCK] = (
+                fps_service,
+                lambda value: fps_service.plan_reg_unlock(
+                    root_key, sub_key, value.name, _dword_data(value)),
+                _dword_write,
+                None
+            )
+        if RegistryOperation.FOV_UNLOCK in operations:
+            fov_service = DependencyProvider.get(RegUnlockFOVService)
+            handlers[RegistryOperation.FOV_UNLOCK] = (
+                fov_service,
+                lambda value: fov_service.plan_reg_unlock(
+                    root_key, sub_key, value.name, fov_value, _binary_data(value)),
+                _binary_write,
+                self._byte_patch(fov_service.strategy.byte_patch(fov_value), key_prefix, {'byte': fov_value})
+            )
+        return handlers
+
+    def _byte_patch(self, patch, key_prefix, extra=None):
+        """策略提供单字节修改且启用列式处理时返回 BytePatch"""
+        if not self.columnar or patch is None:
+            return None
+        offset, value = patch
+        return BytePatch(offset, value, key_prefix, extra or {})
+
+    def _build_rule_handlers(self, root_key, sub_key, rules):
+        """
+        为规则集的每个统计分组构建处理器
+
+        返回:
+            tuple: (处理器字典 (键为 RuleGroup), 分类函数: 值名称 -> RuleGroup (无匹配规则时为None))
+        """
+        rule_service = PatchRuleService(rules, self.backend)
+        key_prefix = f"{root_key}\\{sub_key}\\"
+        groups = {name: RuleGroup(name, label, rule_service) for name, label in rules.groups().items()}
+
+        def planner(value):
+            rule = rules.match(value.name)
+            # 快照中的值类型与规则一致时直接使用，否则由规则服务读取并检查类型
+            data = value.data if value.value_type == rule.value_type else None
+            return rule_service.plan(rule, root_key, sub_key, value.name, data)
+
+        def classify_rule(name):
+            rule = rules.match(name)
+            return None if rule is None else groups[rule.group]
+
+        handlers = {}
+        for group in groups.values():
+            members = [rule for rule in rules if rule.group == group.name]
+            # 分组只有一条单字节修改规则时可以列式处理
+            patch = members[0].byte_patch if len(members) == 1 else None
+            handlers[group] = (group, planner, _rule_write,
+                               self._byte_patch(patch, key_prefix) if patch is not None else None)
+        return handlers, classify_rule
+
+    def sweep(self, root_key, sub_key, operations, fov_value=0xFF, dry_run=False, workers=1):
+        """
+        单次枚举指定注册表路径，对每个键值按操作类型分派处理
+
+        处理分两个阶段: 先基于快照为所有匹配项计算修改计划 (不写入)，
+        再在同一个写入句柄下批量写入真正发生变化的值。
+
+        参数:
+            root_key: 注册表根键
+            sub_key: 注册表子路径
+            operations: 需要执行的 RegistryOperation 集合
+            fov_value: FOV修改值 (仅 FOV_UNLOCK 使用)
+            dry_run: 仅输出修改计划，不写入注册表
+            workers: 并行写入线程数 (1 为串行写入)
+
+        返回:
+            dict: 处理报告，包含枚举总数、写入数、耗时以及每个操作的计数和耗时
+        """
+        report, _ = self._sweep(root_key, sub_key, operations, fov_value, dry_run, workers)
+        return report
+
+    def sweep_rules(self, root_key, sub_key, rules, dry_run=False, workers=1):
+        """
+        单次枚举指定注册表路径，执行规则集中的所有规则
+
+        每个值只由第一条匹配的规则处理，处理报告按规则分组统计。
+        规则集可能随规则文件变化，因此不使用分类索引。
+
+        参数:
+            rules: 编译后的规则集 (RuleSet)
+            dry_run: 仅输出修改计划，不写入注册表
+            workers: 并行写入线程数 (1 为串行写入)
+
+        返回:
+            dict: 处理报告 (operations 的键为 RuleGroup)
+        """
+        report, _ = self._sweep(root_key, sub_key, (), None, dry_run, workers, rules=rules)
+        return report
+
+    def _new_report(self, key_path, handlers, dry_run, workers):
+        return {
+            'run': os.urandom(6).hex(),
+            'key': key_path,
+            'total': 0,
+            'index': None,
+            'writes': 0,
+            'dry_run': dry_run,
+            'workers': max(1, workers),
+            'elapsed': 0.0,
+            'write_elapsed': 0.0,
+            'operations': {
+                operation: {'matched': 0, 'planned': 0, 'modified': 0, 'failed': 0, 'elapsed': 0.0}
+                for operation in handlers
+            }
+        }
+
+    def _sweep(self, root_key, sub_key, operations, fov_value, dry_run, workers, values=None, rules=None):
+        """
+        在新的依赖作用域中执行一次处理 (参数与返回值见 _sweep_in_scope)
+
+        作用域依赖 (如注册表句柄池) 每次处理一个，处理结束时释放。
+        """
+        with DependencyProvider.scope():
+            return self._sweep_in_scope(root_key, sub_key, operations, fov_value, dry_run, workers, values, rules)
+
+    def _sweep_in_scope(self, root_key, sub_key, operations, fov_value, dry_run, workers, values=None, rules=None):
+        """
+        执行一次处理
+
+        参数:
+            values: 仅处理给定的 RegistryValue 列表 (增量处理，不使用也不更新分类索引)，
+                    为空时处理整个路径
+            rules: 按规则集处理 (忽略 operations / fov_value，不使用分类索引)
+
+        返回:
+            tuple: (处理报告, 写入成功的 {值名称: (值类型, 新值)})
+        """
+        if rules is None:
+            handlers = self._build_handlers(root_key, sub_key, set(operations), fov_value)
+            classify_value = classify
+        else:
+            handlers, classify_value = self._build_rule_handlers(root_key, sub_key, rules)
+        key_path = format_key_path(root_key, sub_key)
+        report = self._new_report(key_path, handlers, dry_run, workers)
+        incremental = values is not None
+        use_index = not incremental and rules is None
+
+        sweep_start = time.perf_counter()
+        calls_before = self.backend.call_stats()
+        scope = make_scope(self.backend, key_path)
+        # 整个处理过程共用一个后端会话 (复用已打开的注册表句柄)
+        with self.backend.session() as pool:
+            indexed = self._load_index(root_key, sub_key, scope) if use_index else None
+            if not incremental:
+                self.logger.info(f"成功打开注册表路径: {key_path}")
+            if indexed is not None:
+                # 热启动: 指纹未变，直接使用索引中的分类结果和值，跳过枚举与分类
+                report['index'] = 'warm'
+                report['total'], entries = indexed
+                classified = [
+                    (operation, RegistryValue(name, value_type, data))
+                    for name, operation, value_type, data in entries
+                ]
+                report['indexed'] = len(classified)
+            else:
+                if values is None:
+                    # 单次枚举读取所有值，策略直接使用预读数据
+                    values = self.backend.snapshot_values(root_key, sub_key)
+                report['total'] = len(values)
+                classified = [
+                    (operation, value)
+                    for value in values
+                    for operation in (classify_value(value.name),)
+                    if operation is not None
+                ]
+
+            plan = self.plan(classified, handlers, report)
+            written = {}
+            if dry_run:
+                self.log_plan(plan, report)
+            else:
+                written = self.apply_plan(root_key, sub_key, plan, report)
+
+            if pool is not None:
+                report['handles'] = {'hits': pool.hits, 'misses': pool.misses}
+
+        if not dry_run:
+            self.backend.flush()
+            if use_index:
+                self._save_index(root_key, sub_key, scope, report['total'], classified, written)
+        if self.journal is not None:
+            self.journal.flush()
+        report['elapsed'] = time.perf_counter() - sweep_start
+        if calls_before is not None:
+            report['calls'] = _diff_call_stats(calls_before, self.backend.call_stats())
+        self.log_report(report)
+        return report, written
+
+    def watch(self, root_key, sub_key, operations, fov_value=0xFF, workers=1,
+              debounce=0.5, poll_interval=1.0, stop_event=None, max_delay=None):
+        """
+        持续监视注册表路径，值发生变化时只重新处理变化的值
+
+        先执行一次完整处理，之后阻塞等待变化通知 (Windows上为 RegNotifyChangeKeyValue，
+        其他后端为轮询)。一段时间内的连续变化在 debounce 秒无新变化后合并为一次增量处理；
+        游戏运行时会持续写入，因此距首次变化超过 max_delay 秒后不再等待静默，直接处理。
+
+        参数:
+            debounce: 合并连续变化的静默时长 (秒)
+            max_delay: 首次变化后最长的等待时长 (秒，默认为 debounce 的5倍)
+            poll_interval: 无原生通知机制时的轮询间隔 (秒)
+            stop_event: threading.Event，设置后退出监视 (为空时直到 Ctrl+C)
+        """
+        if max_delay is None:
+            max_delay = 5 * debounce
+        self._sweep(root_key, sub_key, operations, fov_value, False, workers)
+
+        key_path = format_key_path(root_key, sub_key)
+        self.logger.info(f"正在监视注册表变化: {key_path} (按 Ctrl+C 退出)")
+        # 先订阅再读取快照，避免两者之间的变化被遗漏
+        with self.backend.notifier(root_key, sub_key, poll_interval) as notifier:
+            # 上次处理后的路径内容，用于找出变化的值
+            state = {value.name: (value.value_type, value.data)
+                     for value in self.backend.snapshot_values(root_key, sub_key)}
+            try:
+                while stop_event is None or not stop_event.is_set():
+                    if not notifier.wait(1.0):
+                        continue
+                    # 去抖: 持续有变化时继续等待，直到静默 debounce 秒或距首次变化超过 max_delay 秒
+                    deadline = time.monotonic() + max_delay
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not notifier.wait(min(debounce, remaining)):
+                            break
+
+                    values = self.backend.snapshot_values(root_key, sub_key)
+                    changed = [value for value in values
+                               if state.get(value.name) != (value.value_type, value.data)]
+                    state = {value.name: (value.value_type, value.data) for value in values}
+                    if not changed:
+                        continue
+
+                    self.logger.info(f"检测到 {len(changed)} 项变化，执行增量处理")
+                    _, written = self._sweep(root_key, sub_key, operations, fov_value, False, workers, changed)
+                    # 记录本次写入的值，避免自身写入触发的通知被当作新变化
+                    state.update(written)
+            except KeyboardInterrupt:
+                pass
+        self.logger.info("已停止监视注册表")
+
+    def _load_index(self, root_key, sub_key, scope):
+        """读取仍然有效的分类索引 (未配置索引或已失效时返回None)"""
+        if self.index is None:
+            return None
+        fingerprint = make_fingerprint(self.backend.key_info(root_key, sub_key))
+        return self.index.load(scope, fingerprint)
+
+    def _save_index(self, root_key, sub_key, scope, total, classified, written):
+        """以处理后的值和最新指纹更新分类索引"""
+        if self.index is None:
+            return
+        fingerprint = make_fingerprint(self.backend.key_info(root_key, sub_key))
+        self.index.save(scope, fingerprint, total, (
+            (value.name, operation, *written.get(value.name, (value.value_type, value.data)))
+            for operation, value in classified
+        ))
+
+    def plan(self, classified, handlers, report):
+        """
+        阶段一: 为所有匹配项计算修改计划 (不写入)
+
+        参数:
+            classified: 已分类的 (操作, RegistryValue) 列表
+
+        返回:
+            list: [(操作, 服务, 写入项函数, 值名称, 结果字典, 计划耗时秒数)]
+        """
+        # 列式处理的结果 (按 classified 中的位置)，其余项由策略逐项计算
+        columnar = self._plan_columnar(classified, handlers, report)
+        plan = []
+        for position, (operation, value) in enumerate(classified):
+            entry = columnar.get(position)
+            if entry is not None:
+                plan.append(entry)
+                continue
+            if operation not in handlers:
+                continue
+
+            service, planner, to_write, _ = handlers[operation]
+            stats = report['operations'][operation]
+            stats['matched'] += 1
+            start = time.perf_counter()
+            try:
+                result = planner(value)
+                elapsed = time.perf_counter() - start
+                if result['modified']:
+                    stats['planned'] += 1
+                plan.append((operation, service, to_write, value.name, result, elapsed))
+            except RegistryOperationError as e:
+                elapsed = time.perf_counter() - start
+                stats['failed'] += 1
+                self.logger.error(f"{_label(operation)}失败: {str(e)}")
+                self._journal(report, operation, value.name, 'failed', value.data, duration=elapsed, error=str(e))
+            stats['elapsed'] += elapsed
+        return plan
+
+    def _plan_columnar(self, classified, handlers, report):
+        """
+        以列式快照批量计算单字节修改
+
+        每个操作的匹配值载入一个快照，向量化判断并修改目标字节，只为发生变化的行生成新数据。
+        快照中没有的值 (非二进制、长度不足) 仍交给策略逐项处理。
+
+        返回:
+            dict: classified 中的位置 -> 计划项
+        """
+        if not self.columnar:
+            return {}
+
+        entries = {}
+        for operation, (service, _, to_write, patch) in handlers.items():
+            if patch is None:
+                continue
+            # 按身份比较筛选本操作的值 (避免逐项计算枚举哈希)
+            positions, names, values = [], [], []
+            for position, (value_operation, value) in enumerate(classified):
+                if value_operation is operation:
+                    data = _binary_data(value)
+                    if data is not None and len(data) > patch.offset:
+                        positions.append(position)
+                        names.append(value.name)
+                        values.append(data)
+            if not positions:
+                continue
+
+            stats = report['operations'][operation]
+            start = time.perf_counter()
+            snapshot = ColumnarSnapshot(names, values)
+            changed = snapshot.changed_rows(snapshot.patch_byte(patch.offset, patch.value))
+            results = [
+                {
+                    'key': patch.key_prefix + name,
+                    'original_data': original,
+                    'modified_data': changed.get(row),
+                    'modified': row in changed,
+                    'success': False,
+                    **patch.extra
+                }
+                for row, (name, original) in enumerate(zip(names, values))
+            ]
+            elapsed = time.perf_counter() - start
+            # 批量计算无法区分单项耗时，按匹配项平均分摊
+            share = elapsed / len(names)
+            entries.update(
+                (position, (operation, service, to_write, name, result, share))
+                for position, name, result in zip(positions, names, results)
+            )
+            stats['matched'] += len(names)
+            stats['planned'] += len(changed)
+            stats['elapsed'] += elapsed
+        return entries
+
+    def apply_plan(self, root_key, sub_key, plan, report):
+        """
+        阶段二: 批量写入发生变化的值，并输出每项结果
+
+        返回:
+            dict: 写入成功的 {值名称: (值类型, 新值)}
+        """
+        writes = [
+            (name, *to_write(result))
+            for _, _, to_write, name, result, _ in plan
+            if result['modified']
+        ]
+
+        failures = {}
+        write_share = 0.0
+        if writes:
+            start = time.perf_counter()
+            failures = dict(self.write_values(root_key, sub_key, writes, report['workers']))
+            report['write_elapsed'] = time.perf_counter() - start
+            # 批量写入无法区分单项耗时，按写入项平均分摊
+            write_share = report['write_elapsed'] / len(writes)
+        report['writes'] = len(writes) - len(failures)
+
+        for operation, service, to_write, name, result, elapsed in plan:
+            stats = report['operations'][operation]
+            if name in failures:
+                stats['failed'] += 1
+                error = RegistryWriteError(f"注册表写入失败: {str(failures[name])}",
+                                           key_path=sub_key,
+                                           value_name=name)
+                self.logger.error(f"{_label(operation)}失败: {str(error)}")
+                self._journal(report, operation, name, 'failed', _original_value(result),
+                              duration=elapsed + write_share, error=str(failures[name]))
+                continue
+
+            if result['modified']:
+                result['success'] = True
+                stats['modified'] += 1
+                self._journal(report, operation, name, 'modified', _original_value(result),
+                              to_write(result)[1], elapsed + write_share)
+            else:
+                self._journal(report, operation, name, 'unchanged', _original_value(result), duration=elapsed)
+            service.log_result(result)
+
+        return {name: (value_type, value) for name, value_type, value in writes if name not in failures}
+
+    def write_values(self, root_key, sub_key, writes, workers=1):
+        """
+        写入修改项，workers 大于1时分片到线程池并行写入
+
+        各线程共用当前后端会话 (注册表句柄可跨线程使用，ctypes调用期间释放GIL)，
+        逐项结果日志仍由调用方在写入完成后按计划顺序输出，避免多行日志交错。
+
+        返回:
+            list: 写入失败的 (值名称, OSError) 列表
+        """
+        workers = min(workers, len(writes))
+        if workers <= 1:
+            return self.backend.write_values(root_key, sub_key, writes)
+
+        chunks = [writes[i::workers] for i in range(workers)]
+        failures = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="RegistryWrite") as executor:
+            futures = [
+                executor.submit(self.backend.write_values, root_key, sub_key, chunk)
+                for chunk in chunks
+            ]
+            for future in futures:
+                failures.extend(future.result())
+        return failures
+
+    def log_plan(self, plan, report):
+        """输出修改计划 (dry-run)"""
+        for operation, _, to_write, name, result, elapsed in plan:
+            if not result['modified']:
+                self._journal(report, operation, name, 'unchanged', _original_value(result), duration=elapsed)
+                continue
+            _, new_value = to_write(result)
+            self._journal(report, operation, name, 'planned', _original_value(result), new_value, elapsed)
+            self.logger.info(
+                "[计划] %s: %s\n"
+                "原始值: %s\n"
+                "新值: %s",
+                _label(operation), name, _format_value(_original_value(result)), _format_value(new_value)
+            )
+
+    def _journal(self, report, operation, name, status, before, after=None, duration=None, error=None):
+        """写入单个键值的结构化记录 (未配置操作日志时忽略)"""
+        if self.journal is None:
+            return
+        self.journal.record(
+            report['run'], self.backend.name, f"{report['key']}\\{name}", operation.name, status,
+            before, after, None if duration is None else round(duration * 1e6), error
+        )
+
+    def log_report(self, report):
+        """输出处理报告摘要"""
+        for operation, stats in report['operations'].items():
+            if report['dry_run']:
+                summary = f"计划修改 {stats['planned']} 项 (未写入)"
+            else:
+                summary = f"修改 {stats['modified']} 项"
+            self.logger.info(
+                f"{{color:yellow}}{_label(operation)}{{/color}}: "
+                f"匹配 {stats['matched']} 项, {summary}, "
+                f"失败 {stats['failed']} 项, 耗时 {stats['elapsed'] * 1000:.1f} ms"
+            )
+        if report['index'] == 'warm':
+            self.logger.info(f"分类索引有效，已跳过枚举与分类 (索引中已分类 {report['indexed']} 项)")
+        if 'handles' in report:
+            self.logger.debug(
+                f"注册表句柄复用: 命中 {report['handles']['hits']} 次, 打开 {report['handles']['misses']} 次"
+            )
+        for name, (calls, total_ns) in report.get('calls', {}).items():
+            self.logger.debug(
+                f"{name}: {calls} 次, 平均 {total_ns / calls / 1000:.1f} µs, 合计 {total_ns / 1e6:.1f} ms"
+            )
+        if report['workers'] > 1 and not report['dry_run']:
+            self.logger.debug(f"并行写入线程数: {report['workers']}")
+        # 热启动时值总数来自索引记录，本次没有枚举
+        counted = "共" if report['index'] == 'warm' else "共枚举"
+        self.logger.info(
+            f"注册表处理完成: {counted} {report['total']} 项, 写入 {report['writes']} 项 "
+            f"(写入耗时 {report['write_elapsed'] * 1000:.1f} ms), 总耗时 {report['elapsed'] * 1000:.1f} ms"
+        )
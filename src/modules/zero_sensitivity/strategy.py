@@ -2,72 +2,67 @@
 处理策略实现
 包含具体的注册表修改策略
 """
-
-from src.core.utils.registry_utils import read_reg_binary_value, write_reg_binary_value
-from ...core.exceptions.exceptions import RegistryReadError, RegistryWriteError, RegistryPermissionError
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend
+from src.modules.patch_rules import PatchRuleService, builtin_rules
 
 
 class BaseZeroSensitivityStrategy:
     """零灵敏度策略基类"""
 
-    def execute(self, root_key, sub_key, value_name):
+    def plan(self, root_key, sub_key, value_name, data=None):
+        """
+        计算修改计划 (不写入注册表)
+
+        参数:
+            data: 预先读取的二进制数据 (为空时从注册表读取)
+
+        返回:
+            dict: 包含修改前后数据的字典，modified 表示是否需要写入
+        """
+        raise NotImplementedError("子类必须实现此方法")
+
+    def execute(self, root_key, sub_key, value_name, data=None):
         """
         执行注册表修改操作
 
+        参数:
+            data: 预先读取的二进制数据 (为空时从注册表读取)
+
         返回:
             dict: 包含操作结果和修改前后数据的字典
         """
         raise NotImplementedError("子类必须实现此方法")
 
+    def byte_patch(self):
+        """
+        策略等价的单字节修改，供列式批量处理使用
+
+        返回:
+            tuple: (字节偏移, 期望值)，策略无法表示为单字节修改时返回None (逐项处理)
+        """
+        return None
+
 
 class DefaultZeroSensitivityStrategy(BaseZeroSensitivityStrategy):
-    """默认零灵敏度修改策略"""
-
-    def execute(self, root_key, sub_key, value_name):
-        result = {
-            'key': f"{root_key}\\{sub_key}\\{value_name}",
-            'original_data': None,
-            'modified_data': None,
-            'modified': False,
-            'success': False
-        }
-
-        try:
-            # 读取当前值
-            raw_data = read_reg_binary_value(root_key, sub_key, value_name)
-            if raw_data is None:
-                raise RegistryReadError("无法读取注册表值", key_path=sub_key, value_name=value_name)
-
-            result['original_data'] = raw_data
-
-            # 检查是否需要修改（第一个字节是否为0x01）
-            if raw_data[0] == 0x01:
-                result['modified'] = False
-                return result
-
-            # 修改第一个字节为0x01
-            modified_data = bytes([0x01]) + raw_data[1:]
-            result['modified_data'] = modified_data
-
-            # 写入新值
-            if not write_reg_binary_value(root_key, sub_key, value_name, modified_data):
-                raise RegistryWriteError("注册表写入失败", key_path=sub_key, value_name=value_name)
-
-            result['modified'] = True
-            result['success'] = True
-            return result
-
-        except OSError as e:
-            error_code = e.winerror if hasattr(e, 'winerror') else None
-            if error_code == 5:  # 权限不足
-                raise RegistryPermissionError(f"注册表写入权限不足: {str(e)}",
-                                              key_path=sub_key,
-                                              value_name=value_name)
-            elif error_code == 2:  # 文件未找到
-                raise RegistryReadError(f"注册表路径不存在: {str(e)}",
-                                        key_path=sub_key,
-                                        value_name=value_name)
-            else:
-                raise RegistryWriteError(f"注册表操作失败: {str(e)}",
-                                         key_path=sub_key,
-                                         value_name=value_name)
+    """默认零灵敏度修改策略 (内置规则 SENSITIVITY: 第一个字节改为0x01)"""
+
+    def __init__(self, backend: RegistryBackend = None):
+        """
+        初始化策略
+
+        参数:
+            backend: 注册表访问后端 (默认从依赖容器获取)
+        """
+        self.backend = backend or DependencyProvider.get(RegistryBackend)
+        self.patcher = PatchRuleService(builtin_rules(), self.backend)
+        self.rule = self.patcher.rules.get("SENSITIVITY")
+
+    def plan(self, root_key, sub_key, value_name, data=None):
+        return self.patcher.plan(self.rule, root_key, sub_key, value_name, data)
+
+    def byte_patch(self):
+        return self.rule.byte_patch
+
+    def execute(self, root_key, sub_key, value_name, data=None):
+        return self.patcher.execute(self.rule, root_key, sub_key, value_name, data)
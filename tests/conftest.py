@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 将项目根目录添加到系统路径 (与 scripts/bench_utils.py 相同)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,49 @@
+"""
+依赖注入容器测试
+"""
+import pytest
+
+from src.bootstrap import register_dependencies
+from src.core.di.container import DependencyContainer, DependencyError
+from src.core.di.provider import DependencyProvider
+from src.core.utils.registry_utils import RegistryHandlePool
+
+
+@pytest.fixture(autouse=True)
+def container():
+    register_dependencies(use_index=False)
+    yield
+    DependencyContainer.reset()
+
+
+def test_handle_pool_is_scoped():
+    assert not DependencyProvider.in_scope()
+    with pytest.raises(DependencyError):
+        DependencyProvider.get(RegistryHandlePool)
+
+    with DependencyProvider.scope():
+        assert DependencyProvider.in_scope()
+        pool = DependencyProvider.get(RegistryHandlePool)
+        assert DependencyProvider.get(RegistryHandlePool) is pool
+    with DependencyProvider.scope():
+        assert DependencyProvider.get(RegistryHandlePool) is not pool
+    assert not DependencyProvider.in_scope()
+
+
+def test_scope_closes_instances_in_reverse_order():
+    closed = []
+
+    class Resource:
+        def __init__(self, name):
+            self.name = name
+
+        def close(self):
+            closed.append(self.name)
+
+    DependencyProvider.register_scoped("first", lambda: Resource("first"))
+    DependencyProvider.register_scoped("second", lambda: Resource("second"))
+    with DependencyProvider.scope():
+        DependencyProvider.get("first")
+        DependencyProvider.get("second")
+        assert closed == []
+    assert closed == ["second", "first"]
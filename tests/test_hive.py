@@ -0,0 +1,127 @@
+"""
+regf 配置单元原地修改测试
+"""
+import struct
+
+import pytest
+
+from src.core.registry.backend import REG_BINARY, REG_DWORD
+from src.core.registry.hive import (
+    BASE_BLOCK_SIZE, Hive, HiveFormatError, _CHECKSUM, _SEQUENCE_PRIMARY, _SEQUENCE_SECONDARY, base_block_checksum,
+)
+
+HBIN_HEADER_SIZE = 0x20
+ORIGINAL = bytes(range(12))
+
+
+def _cell(payload):
+    """已分配单元: 负数大小 + 数据 (按8字节对齐)"""
+    size = (len(payload) + 4 + 7) & ~7
+    return struct.pack("<i", -size) + payload + bytes(size - 4 - len(payload))
+
+
+def build_hive(sequence=1):
+    """只有根键的配置单元，根键下有二进制值 Data 与内联的DWORD值 Fps"""
+    # 各单元的相对偏移 (相对数据区开头，包含 hbin 头)
+    nk_offset = HBIN_HEADER_SIZE
+    name = b"ROOT"
+    nk_size = len(_cell(b"\0" * 0x4C + name))
+    list_offset = nk_offset + nk_size
+    data_offset = list_offset + len(_cell(bytes(8)))
+    data_vk_offset = data_offset + len(_cell(ORIGINAL))
+    fps_vk_offset = data_vk_offset + len(_cell(bytes(0x14) + b"Data"))
+
+    nk = struct.pack("<2sHQ15IHH", b"nk", 0x2C, 0,
+                     0, 0xFFFFFFFF, 0, 0, 0xFFFFFFFF, 0xFFFFFFFF, 2, list_offset,
+                     0xFFFFFFFF, 0xFFFFFFFF, 0, 0, 8, 12, 0, len(name), 0) + name
+    cells = (_cell(nk)
+             + _cell(struct.pack("<II", data_vk_offset, fps_vk_offset))
+             + _cell(ORIGINAL)
+             + _cell(struct.pack("<2sHIIIHH", b"vk", 4, len(ORIGINAL), data_offset, REG_BINARY, 1, 0) + b"Data")
+             + _cell(struct.pack("<2sHIIIHH", b"vk", 3, 0x80000004, 60, REG_DWORD, 1, 0) + b"Fps"))
+    hbin = struct.pack("<4sII", b"hbin", 0, 4096).ljust(HBIN_HEADER_SIZE, b"\0")
+    hbin += cells
+    # 剩余空间为一个空闲单元
+    hbin += struct.pack("<i", 4096 - len(hbin)) + bytes(4096 - len(hbin) - 4)
+
+    base = bytearray(BASE_BLOCK_SIZE)
+    struct.pack_into("<4sIIQIIIIII", base, 0, b"regf", sequence, sequence, 0, 1, 5, 0, 1, nk_offset, len(hbin))
+    struct.pack_into("<I", base, _CHECKSUM, base_block_checksum(base))
+    return bytes(base) + hbin
+
+
+def header(path):
+    with open(path, "rb") as file:
+        block = file.read(BASE_BLOCK_SIZE)
+    primary, secondary = struct.unpack_from("<II", block, _SEQUENCE_PRIMARY)
+    assert struct.unpack_from("<I", block, _CHECKSUM)[0] == base_block_checksum(block)
+    return primary, secondary
+
+
+@pytest.fixture
+def hive_path(tmp_path):
+    path = tmp_path / "NTUSER.DAT"
+    path.write_bytes(build_hive(sequence=7))
+    return path
+
+
+def test_read(hive_path):
+    with Hive(hive_path) as hive:
+        root = hive.open_key("")
+        assert list(hive.values(root)) == ["Data", "Fps"]
+        assert hive.read_data(hive.get_value(root, "data")) == ORIGINAL
+        assert hive.read_data(hive.get_value(root, "Fps")) == struct.pack("<I", 60)
+
+
+def test_write_follows_sequence_protocol(hive_path):
+    patched = b"\x01" + ORIGINAL[1:]
+    hive = Hive(hive_path, writable=True)
+    try:
+        root = hive.open_key("")
+        hive.write_data(root, hive.get_value(root, "Data"), patched)
+        # 覆盖数据前已递增主序列号并写回基本块 (校验和有效)
+        assert header(hive_path) == (8, 7)
+        hive.write_data(root, hive.get_value(root, "Fps"), struct.pack("<I", 120))
+        assert header(hive_path) == (8, 7)
+
+        hive.flush()
+        assert header(hive_path) == (8, 8)
+        assert hive.sequence == (8, 8)
+    finally:
+        hive.close()
+
+    with Hive(hive_path) as hive:
+        root = hive.open_key("")
+        assert not hive.pending_log
+        assert hive.read_data(hive.get_value(root, "Data")) == patched
+        assert hive.read_data(hive.get_value(root, "Fps")) == struct.pack("<I", 120)
+
+
+def test_interrupted_write_leaves_pending_log(hive_path):
+    hive = Hive(hive_path, writable=True)
+    root = hive.open_key("")
+    hive.write_data(root, hive.get_value(root, "Data"), bytes(12))
+    # 未提交即关闭 (模拟写入中断)
+    hive.close()
+
+    with Hive(hive_path, writable=True) as hive:
+        assert hive.pending_log
+        root = hive.open_key("")
+        with pytest.raises(OSError):
+            hive.write_data(root, hive.get_value(root, "Data"), ORIGINAL)
+
+
+def test_size_change_rejected(hive_path):
+    with Hive(hive_path, writable=True) as hive:
+        root = hive.open_key("")
+        with pytest.raises(OSError):
+            hive.write_data(root, hive.get_value(root, "Data"), bytes(8))
+    assert header(hive_path) == (7, 7)
+
+
+def test_corrupt_checksum(hive_path):
+    data = bytearray(hive_path.read_bytes())
+    data[_CHECKSUM] ^= 0xFF
+    hive_path.write_bytes(bytes(data))
+    with pytest.raises(HiveFormatError):
+        Hive(hive_path)
@@ -0,0 +1,54 @@
+"""
+Shell Link (.lnk) 文件生成测试
+"""
+import struct
+
+from src.modules.game_shortcut.lnk import (
+    HEADER_SIZE, LINK_CLSID, SW_SHOWMAXIMIZED, build_shell_link, read_shell_link,
+)
+
+# build_shell_link(r"C:\Games\codm.exe", arguments="-fps 120", working_directory=r"C:\Games")
+EXPECTED = bytes.fromhex(
+    "4c0000000114020000000000c000000000000046b20000002000000000000000"
+    "0000000000000000000000000000000000000000000000000000000001000000"
+    "0000000000000000000000006e00000024000000010000002400000035000000"
+    "0000000047000000480000006c00000011000000030000000000000010000000"
+    "00433a5c47616d65735c636f646d2e657865000043003a005c00470061006d00"
+    "650073005c0063006f0064006d002e0065007800650000000000080043003a00"
+    "5c00470061006d006500730008002d0066007000730020003100320030000000"
+    "0000"
+)
+
+
+def test_header():
+    data = build_shell_link(r"C:\Games\codm.exe")
+    assert struct.unpack_from("<I", data)[0] == HEADER_SIZE == 0x4C
+    assert data[4:20] == LINK_CLSID
+    assert LINK_CLSID == bytes.fromhex("0114020000000000c000000000000046")
+
+
+def test_pinned_bytes():
+    data = build_shell_link(r"C:\Games\codm.exe", arguments="-fps 120", working_directory=r"C:\Games")
+    assert data == EXPECTED
+
+
+def test_round_trip_non_ascii_target():
+    target = r"D:\游戏\使命召唤\codm.exe"
+    data = build_shell_link(target, arguments="--mode pvp", working_directory=r"D:\游戏",
+                            icon_location=target, icon_index=2, description="使命召唤手游",
+                            show_command=SW_SHOWMAXIMIZED)
+    assert read_shell_link(data) == {
+        'target_path': target,
+        'show_command': SW_SHOWMAXIMIZED,
+        'icon_index': 2,
+        'description': "使命召唤手游",
+        'relative_path': "",
+        'working_directory': r"D:\游戏",
+        'arguments': "--mode pvp",
+        'icon_location': target,
+    }
+
+    # LinkInfo 中的 ANSI 路径以 ? 代替非ASCII字符
+    (local_offset,) = struct.unpack_from("<I", data, HEADER_SIZE + 0x10)
+    start = HEADER_SIZE + local_offset
+    assert data[start:data.index(b"\0", start)] == rb"D:\??\????\codm.exe"
@@ -0,0 +1,26 @@
+"""
+异步日志测试
+"""
+from src.core.utils.logger import LoggerManager
+
+
+def test_shutdown_detaches_loggers_before_stopping_listener():
+    logger = LoggerManager.get_logger("TestAsync", show_time=False)
+    LoggerManager.enable_async()
+    sink = LoggerManager._sink
+    assert logger.handlers == [sink.handler]
+
+    handlers_at_close = []
+    close = sink.close
+
+    def recording_close():
+        handlers_at_close.extend(logger.handlers)
+        close()
+    sink.close = recording_close
+
+    LoggerManager.shutdown()
+    assert handlers_at_close and sink.handler not in handlers_at_close
+    assert not sink.listener._thread
+    assert logger.handlers == handlers_at_close
+    # 关闭后同步输出
+    logger.info("shutdown")
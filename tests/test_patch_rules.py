@@ -0,0 +1,107 @@
+"""
+声明式修改规则测试
+"""
+import pytest
+
+from src.core.exceptions.exceptions import PatchRuleError, RegistryDataError
+from src.core.registry.backend import HKEY_CURRENT_USER, REG_BINARY, REG_DWORD, REG_SZ
+from src.core.registry.memory_backend import MemoryRegistryBackend
+from src.modules.patch_rules import PatchRuleService
+from src.modules.patch_rules.rules import builtin_rules, compile_rule
+
+SUB_KEY = r"SOFTWARE\Tencent\Call-of-Duty"
+
+
+def binary_rule(*program):
+    return {"name": "TEST", "pattern": "^CODM_", "type": "binary", "program": list(program)}
+
+
+def dword_rule(value):
+    return {"name": "TEST", "pattern": "^CODM_", "type": "dword", "program": [{"op": "set_dword", "value": value}]}
+
+
+def test_compile_binary_rule():
+    rule = compile_rule(binary_rule({"op": "set_byte", "offset": 6, "value": "$fov"}), {"fov": 0xFF})
+    assert rule.value_type == REG_BINARY
+    assert rule.byte_patch == (6, 0xFF)
+    assert rule.apply(bytes(8)) == bytes(6) + b"\xff\x00"
+    assert rule.apply(bytes(6) + b"\xff\x00") is None
+    with pytest.raises(ValueError):
+        rule.apply(bytes(6))
+
+
+def test_compile_dword_rule():
+    rule = compile_rule(dword_rule(0xFFFFFFFF), {})
+    assert rule.value_type == REG_DWORD
+    assert rule.apply(0) == 0xFFFFFFFF
+    assert rule.apply(0xFFFFFFFF) is None
+
+
+@pytest.mark.parametrize("value", [-1, 0x100, "$big", True, "1"])
+def test_byte_value_out_of_bounds(value):
+    with pytest.raises(PatchRuleError):
+        compile_rule(binary_rule({"op": "set_byte", "offset": 0, "value": value}), {"big": 0x1FF})
+
+
+@pytest.mark.parametrize("offset", [-1, None, 1.5, True])
+def test_invalid_offset(offset):
+    with pytest.raises(PatchRuleError):
+        compile_rule(binary_rule({"op": "set_byte", "offset": offset, "value": 1}), {})
+
+
+@pytest.mark.parametrize("value", [-1, 0x100000000])
+def test_dword_value_out_of_bounds(value):
+    with pytest.raises(PatchRuleError):
+        compile_rule(dword_rule(value), {})
+
+
+@pytest.mark.parametrize("definition", [
+    [],
+    {"pattern": "^CODM_", "type": "binary", "program": [{"op": "set_byte", "offset": 0, "value": 1}]},
+    {**dword_rule(1), "type": "qword"},
+    {**dword_rule(1), "program": []},
+    {**dword_rule(1), "program": [{"op": "set_byte", "offset": 0, "value": 1}]},
+    {**dword_rule(1), "pattern": "("},
+])
+def test_invalid_definition(definition):
+    with pytest.raises(PatchRuleError):
+        compile_rule(definition, {})
+
+
+def test_missing_parameter():
+    with pytest.raises(PatchRuleError, match=r"\$fov"):
+        compile_rule(binary_rule({"op": "set_byte", "offset": 6, "value": "$fov"}), {})
+
+
+@pytest.mark.parametrize("name, rule", [
+    ("CODM_1000_iMSDK_CN_EnableFramerateCustomize_h123", "FPS_ENABLE"),
+    ("CODM_1000_iMSDK_CN_FramerateCustomizeValue_h123", "FPS_VALUE"),
+    # 前缀与哈希后缀不区分大小写
+    ("codm_1000_imsdk_cn_EnableFramerateCustomize_H123", "FPS_ENABLE"),
+    # 设置名称区分大小写 (与原帧率策略一致)
+    ("CODM_1000_iMSDK_CN_enableframeratecustomize_h123", None),
+    ("CODM_1000_iMSDK_CN_FRAMERATECUSTOMIZEVALUE_h123", None),
+    ("CODM_1000_iMSDK_CN_EnableFramerateCustomize_h123_x", None),
+    ("CODM_1000_iMSDK_CN_SoundVolume_h123", None),
+])
+def test_builtin_fps_rules_match(name, rule):
+    matched = builtin_rules().match(name)
+    assert (matched and matched.name) == rule
+
+
+def test_builtin_fps_rules_only_patch_dwords():
+    backend = MemoryRegistryBackend()
+    values = backend.create_key(HKEY_CURRENT_USER, SUB_KEY)
+    values["CODM_1000_iMSDK_CN_FramerateCustomizeValue_h1"] = (REG_DWORD, 60)
+    values["CODM_1000_iMSDK_CN_FramerateCustomizeValue_h2"] = (REG_SZ, "60")
+    rules = builtin_rules()
+    service = PatchRuleService(rules, backend)
+
+    name = "CODM_1000_iMSDK_CN_FramerateCustomizeValue_h1"
+    result = service.execute(rules.match(name), HKEY_CURRENT_USER, SUB_KEY, name)
+    assert result['modified'] and backend.query_value(HKEY_CURRENT_USER, SUB_KEY, name) == (0, REG_DWORD)
+
+    name = "CODM_1000_iMSDK_CN_FramerateCustomizeValue_h2"
+    with pytest.raises(RegistryDataError):
+        service.execute(rules.match(name), HKEY_CURRENT_USER, SUB_KEY, name)
+    assert backend.query_value(HKEY_CURRENT_USER, SUB_KEY, name) == ("60", REG_SZ)
@@ -0,0 +1,92 @@
+"""
+.reg 导出文件读写测试
+"""
+import pytest
+
+from src.core.registry.backend import (
+    HKEY_CURRENT_USER, REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD, REG_MULTI_SZ, REG_QWORD,
+)
+from src.core.registry.regfile import (
+    RegEntry, RegFileFormatError, format_value, iter_reg_file, iter_reg_lines, write_reg_file,
+)
+
+SUB_KEY = r"SOFTWARE\Tencent\Call-of-Duty"
+
+ENTRIES = [
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, None, None, None),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, "", REG_SZ, "默认值"),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, 'Quote"And\\Slash', REG_SZ, 'C:\\Games\\"CODM"'),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, "CODM_1000_iMSDK_CN_PVP_h1", REG_BINARY, bytes(range(256))),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, "Empty", REG_BINARY, b""),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, "EnableFramerateCustomize", REG_DWORD, 0xFFFFFFFF),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, "Big", REG_QWORD, 2 ** 64 - 1),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, "Servers", REG_MULTI_SZ, ["cn", "global\\1"]),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY, "Path", REG_EXPAND_SZ, "%LOCALAPPDATA%\\CODM"),
+    RegEntry(HKEY_CURRENT_USER, SUB_KEY + r"\Empty Key", None, None, None),
+]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "export.reg"
+    write_reg_file(path, ENTRIES)
+
+    raw = path.read_bytes()
+    assert raw.startswith(b"\xff\xfe")
+    text = raw[2:].decode("utf-16-le")
+    # 长二进制值按行宽拆分为续行
+    assert all(len(line) <= 80 for line in text.split("\r\n"))
+    assert text.count("\\\r\n") > 1
+
+    assert list(iter_reg_file(path)) == ENTRIES
+
+
+def test_copy_is_identical(tmp_path):
+    path, copy_path = tmp_path / "export.reg", tmp_path / "copy.reg"
+    write_reg_file(path, ENTRIES)
+    write_reg_file(copy_path, iter_reg_file(path))
+    assert copy_path.read_bytes() == path.read_bytes()
+
+
+def test_hex_continuations_and_escapes():
+    lines = [
+        "Windows Registry Editor Version 5.00",
+        "",
+        r"[HKEY_CURRENT_USER\SOFTWARE\Tencent\Call-of-Duty]",
+        r'"Name \"quoted\""="C:\\Games\\CODM"',
+        '"Data"=hex:00,01,02,\\',
+        "  03,04,\\",
+        "  05",
+        '"Wide"=hex(2):25,00,41,00,\\',
+        "  00,00",
+        "; 注释",
+        r"[-HKEY_CURRENT_USER\SOFTWARE\Removed]",
+        '"Ignored"=hex:00,\\',
+        "  01",
+        '"Deleted"=-',
+        "@=dword:0000001f",
+    ]
+    assert list(iter_reg_lines(lines)) == [
+        RegEntry(HKEY_CURRENT_USER, SUB_KEY, None, None, None),
+        RegEntry(HKEY_CURRENT_USER, SUB_KEY, 'Name "quoted"', REG_SZ, "C:\\Games\\CODM"),
+        RegEntry(HKEY_CURRENT_USER, SUB_KEY, "Data", REG_BINARY, bytes(range(6))),
+        RegEntry(HKEY_CURRENT_USER, SUB_KEY, "Wide", REG_EXPAND_SZ, "%A"),
+    ]
+
+
+def test_format_value_wraps_long_hex():
+    text = format_value("Data", REG_BINARY, bytes(40))
+    lines = text.split("\n")
+    assert lines[0].startswith('"Data"=hex:') and lines[0].endswith(",\\")
+    assert all(line.startswith("  ") for line in lines[1:])
+    assert list(iter_reg_lines([f"[HKEY_CURRENT_USER\\{SUB_KEY}]", *lines]))[1].value == bytes(40)
+
+
+@pytest.mark.parametrize("lines, line_number", [
+    (["[HKEY_CURRENT_USER\\SOFTWARE"], 1),
+    (["[HKEY_CURRENT_USER\\SOFTWARE]", '"Name"dword:1'], 2),
+    (["[HKEY_CURRENT_USER\\SOFTWARE]", '"Name"=hex:00,\\', "  zz"], 3),
+])
+def test_format_errors_report_line(lines, line_number):
+    with pytest.raises(RegFileFormatError) as info:
+        list(iter_reg_lines(lines))
+    assert info.value.line_number == line_number
@@ -0,0 +1,29 @@
+"""
+注册表工具函数测试 (不调用 Windows API)
+"""
+from array import array
+
+import pytest
+
+from src.core.utils.registry_utils import _data_pointer
+
+
+@pytest.mark.parametrize("data", [
+    b"\x01\x02\x03",
+    bytearray(b"\x01\x02\x03"),
+    memoryview(b"\x01\x02\x03"),
+    memoryview(array("I", [1, 0xFFFFFFFF, 3])),
+    memoryview(bytearray(range(8)))[::2],
+])
+def test_data_pointer_size_is_byte_count(data):
+    pointer, size = _data_pointer(data)
+    expected = memoryview(data).tobytes()
+    assert size == len(expected)
+    assert bytes(pointer) == expected
+
+
+def test_data_pointer_shares_writable_buffer():
+    data = bytearray(4)
+    pointer, _ = _data_pointer(data)
+    data[0] = 0xFF
+    assert pointer[0] == 0xFF
@@ -0,0 +1,107 @@
+"""
+--watch 增量处理测试 (内存后端，轮询通知)
+"""
+import threading
+import time
+
+import pytest
+
+from src.bootstrap import register_dependencies
+from src.core.di.container import DependencyContainer
+from src.core.di.provider import DependencyProvider
+from src.core.registry.backend import RegistryBackend, HKEY_CURRENT_USER, REG_BINARY, REG_DWORD
+from src.core.registry.memory_backend import MemoryRegistryBackend
+from src.modules.registry_sweep import RegistrySweepService, RegistryOperation
+
+SUB_KEY = r"SOFTWARE\Tencent\Call-of-Duty"
+PVP = "CODM_1000_iMSDK_CN_PVP_h1"
+BR = "CODM_1000_iMSDK_CN_Br_Sniper_h2"
+VOLUME = "CODM_1000_iMSDK_CN_SoundVolume_h3"
+
+
+@pytest.fixture
+def backend():
+    backend = MemoryRegistryBackend()
+    values = backend.create_key(HKEY_CURRENT_USER, SUB_KEY)
+    values[PVP] = (REG_BINARY, bytes(12))
+    values[BR] = (REG_BINARY, bytes(12))
+    values[VOLUME] = (REG_DWORD, 50)
+    register_dependencies(use_index=False)
+    DependencyProvider.register_instance(RegistryBackend, backend)
+    yield backend
+    DependencyContainer.reset()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_watch_reprocesses_only_changed_values(backend):
+    service = RegistrySweepService(backend)
+    sweeps = []
+    sweep = service._sweep
+
+    def recording_sweep(*args):
+        report, written = sweep(*args)
+        sweeps.append((args[6] if len(args) > 6 else None, written))
+        return report, written
+    service._sweep = recording_sweep
+
+    stop = threading.Event()
+    watcher = threading.Thread(target=service.watch, args=(HKEY_CURRENT_USER, SUB_KEY, {RegistryOperation.SENSITIVITY}),
+                               kwargs={'debounce': 0.05, 'poll_interval': 0.01, 'stop_event': stop})
+    watcher.start()
+    try:
+        # 首次完整处理
+        assert wait_until(lambda: len(sweeps) == 1)
+        assert sweeps[0][0] is None
+        assert set(sweeps[0][1]) == {PVP, BR}
+        assert backend.query_value(HKEY_CURRENT_USER, SUB_KEY, PVP)[0][0] == 0x01
+
+        # 游戏改回灵敏度，同时修改无关的值
+        backend.set_value(HKEY_CURRENT_USER, SUB_KEY, PVP, REG_BINARY, bytes(12))
+        backend.set_value(HKEY_CURRENT_USER, SUB_KEY, VOLUME, REG_DWORD, 80)
+        assert wait_until(lambda: len(sweeps) == 2)
+        changed, written = sweeps[1]
+        assert sorted(value.name for value in changed) == [PVP, VOLUME]
+        assert set(written) == {PVP}
+        assert backend.query_value(HKEY_CURRENT_USER, SUB_KEY, PVP)[0][0] == 0x01
+
+        # 自身写入不会再次触发处理
+        time.sleep(0.3)
+        assert len(sweeps) == 2
+    finally:
+        stop.set()
+        watcher.join(5.0)
+    assert not watcher.is_alive()
+
+
+def test_watch_runs_despite_continuous_writes(backend):
+    service = RegistrySweepService(backend)
+    stop = threading.Event()
+    watcher = threading.Thread(target=service.watch, args=(HKEY_CURRENT_USER, SUB_KEY, {RegistryOperation.SENSITIVITY}),
+                               kwargs={'debounce': 0.1, 'poll_interval': 0.01, 'stop_event': stop, 'max_delay': 0.3})
+    watcher.start()
+    try:
+        assert wait_until(lambda: backend.query_value(HKEY_CURRENT_USER, SUB_KEY, PVP)[0][0] == 0x01)
+        backend.set_value(HKEY_CURRENT_USER, SUB_KEY, PVP, REG_BINARY, bytes(12))
+
+        # 游戏运行时持续写入，始终达不到 debounce 的静默时长
+        deadline = time.monotonic() + 3.0
+        volume = 0
+        while time.monotonic() < deadline:
+            volume += 1
+            backend.set_value(HKEY_CURRENT_USER, SUB_KEY, VOLUME, REG_DWORD, volume)
+            if backend.query_value(HKEY_CURRENT_USER, SUB_KEY, PVP)[0][0] == 0x01:
+                break
+            time.sleep(0.02)
+        assert backend.query_value(HKEY_CURRENT_USER, SUB_KEY, PVP)[0][0] == 0x01
+    finally:
+        stop.set()
+        watcher.join(5.0)
+    assert not watcher.is_alive()